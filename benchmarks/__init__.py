@@ -0,0 +1 @@
+"""Benchmarks for the Glossary Checker, run with python -m benchmarks.<name>."""
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Generate synthetic .docx documents of a controlled size.
+  Created: 18/10/2026
+
+Usage: python -m benchmarks.corpus [--paragraphs N] [--tables N] ... OUTDIR
+
+The documents are written directly as OOXML, so python-docx is not needed,
+and are repeatable for the same seed.
+"""
+from __future__ import (
+    print_function,
+)
+
+import os
+import random
+import string
+import zipfile
+import argparse
+from xml.sax.saxutils import escape
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+    "</Relationships>"
+)
+DOCUMENT_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    "<w:body>"
+)
+DOCUMENT_END = "</w:body></w:document>"
+
+WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or "
+    "his from at which but have an they you were her she there been one all "
+    "would their has will if can more when who so about out up into some "
+    "pressure valve system control signal measurement temperature sensor "
+    "output input range module interface operator maintenance procedure "
+    "document section figure table reference specification requirement "
+    "calibration accuracy flow housing assembly supply cable connection "
+    "display alarm limit shutdown startup software hardware protocol"
+).split()
+
+
+def make_acronyms(count, rnd):
+    """Make a list of distinct, upper case, acronyms."""
+    acronyms = set()
+    while len(acronyms) < count:
+        acronyms.add(
+            "".join(
+                rnd.choice(string.ascii_uppercase) for dummy in range(rnd.randint(2, 5))
+            )
+        )
+    return sorted(acronyms)
+
+
+def make_sentence(rnd, words, acronyms, density):
+    """Make a sentence with acronyms making up density of the words."""
+    sentence = [
+        rnd.choice(acronyms)
+        if acronyms and rnd.random() < density
+        else rnd.choice(words)
+        for dummy in range(rnd.randint(6, 20))
+    ]
+    sentence[0] = sentence[0].capitalize() if sentence[0].islower() else sentence[0]
+    return " ".join(sentence) + "."
+
+
+def paragraph_xml(text):
+    """A paragraph with a single run."""
+    return '<w:p><w:r><w:t xml:space="preserve">%s</w:t></w:r></w:p>' % escape(text)
+
+
+def table_xml(rows):
+    """A table from a list of rows of cell texts."""
+    return (
+        "<w:tbl>"
+        + "".join(
+            "<w:tr>"
+            + "".join("<w:tc>%s</w:tc>" % paragraph_xml(cell) for cell in row)
+            + "</w:tr>"
+            for row in rows
+        )
+        + "</w:tbl>"
+    )
+
+
+def make_document(
+    path,
+    paragraphs=100,
+    tables=2,
+    rows=10,
+    columns=3,
+    glossary=True,
+    density=0.05,
+    acronyms=50,
+    seed=0,
+):
+    """
+    Write a synthetic .docx.
+
+    Params:
+        paragraphs: Number of paragraphs of 1-4 sentences.
+        tables: Number of tables, (not including any glossary).
+        rows, columns: Size of the tables.
+        glossary: Include a glossary table of the acronyms used.
+        density: Proportion of the words that are acronyms.
+        acronyms: Number of distinct acronyms.
+        seed: Random seed, the same values give the same document.
+    """
+    rnd = random.Random(seed)
+    acronym_list = make_acronyms(acronyms, rnd)
+    body = []
+    if glossary:
+        body.append(
+            table_xml(
+                [["Abbreviation", "Meaning"]]
+                + [
+                    [acronym, " ".join(rnd.choice(WORDS) for dummy in range(3))]
+                    for acronym in acronym_list
+                ]
+            )
+        )
+    table_every = max(paragraphs // (tables + 1), 1)
+    tables_left = tables
+    for para_no in range(paragraphs):
+        body.append(
+            paragraph_xml(
+                " ".join(
+                    make_sentence(rnd, WORDS, acronym_list, density)
+                    for dummy in range(rnd.randint(1, 4))
+                )
+            )
+        )
+        if tables_left and (para_no + 1) % table_every == 0:
+            tables_left -= 1
+            body.append(
+                table_xml(
+                    [
+                        [
+                            " ".join(
+                                rnd.choice(acronym_list)
+                                if rnd.random() < density
+                                else rnd.choice(WORDS)
+                                for dummy in range(rnd.randint(1, 6))
+                            )
+                            for dummy in range(columns)
+                        ]
+                        for dummy in range(rows)
+                    ]
+                )
+            )
+    document = DOCUMENT_START + "".join(body) + DOCUMENT_END
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", CONTENT_TYPES)
+        package.writestr("_rels/.rels", RELS)
+        package.writestr("word/document.xml", document)
+
+
+def make_corpus(outdir, count=10, seed=0, **kwargs):
+    """Write count documents to outdir, returning the paths."""
+    if not os.path.isdir(outdir):
+        os.makedirs(outdir)
+    paths = []
+    for doc_no in range(count):
+        path = os.path.join(outdir, "synthetic_%03d.docx" % doc_no)
+        make_document(path, seed=seed + doc_no, **kwargs)
+        paths.append(path)
+    return paths
+
+
+def main():
+    """Generate a corpus from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("outdir")
+    parser.add_argument("--count", type=int, default=10)
+    parser.add_argument("--paragraphs", type=int, default=100)
+    parser.add_argument("--tables", type=int, default=2)
+    parser.add_argument("--rows", type=int, default=10)
+    parser.add_argument("--columns", type=int, default=3)
+    parser.add_argument("--no-glossary", action="store_false", dest="glossary")
+    parser.add_argument("--density", type=float, default=0.05)
+    parser.add_argument("--acronyms", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    ops = vars(parser.parse_args())
+    paths = make_corpus(ops.pop("outdir"), **ops)
+    print("Wrote", len(paths), "documents")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Time each stage of the checking pipeline on a synthetic corpus.
+  Created: 18/10/2026
+
+Usage: python -m benchmarks.pipeline [--count N] [--paragraphs N] ...
+           [--seed N] [--baseline FILE] [--save-baseline] [--tolerance FRACTION]
+
+Times the stages of both extraction paths, (python-docx & xml tree), and
+get_candidates_from_list for every combination of the candidate options,
+reporting the throughput & the peak RSS. The times per document are
+compared to the baseline & any stage that is slower by more than the
+tolerance, (default 0.5 so 50% slower), and by at least MIN_SLOWER_MS per
+document, so that the noise in the shortest stages is ignored, is a
+failure. A missing baseline, or one made with a different corpus, is also
+a failure.
+
+benchmarks/baseline.json is for the default corpus, seed 0, on the
+reference machine. Timings depend on the machine so on a different one,
+(or in CI), first save a baseline from the commit to compare against with
+--save-baseline, or widen the tolerance.
+"""
+from __future__ import (
+    print_function,
+)
+
+import io
+import os
+import sys
+import json
+import time
+import zipfile
+import argparse
+import itertools
+import contextlib
+import tempfile
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from benchmarks import corpus
+from gloss_check import text_utls
+from gloss_check import docx2utils
+from gloss_check import xmltree_utils
+from gloss_check import lazy_utils
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TOLERANCE = 0.5
+MIN_SLOWER_MS = 0.5
+# Candidate option combinations, (chars_only, upper_only, inc_camel).
+CANDIDATE_COMBOS = list(itertools.product([False, True], repeat=3))
+
+
+def peak_rss_mb():
+    """The peak resident set size of this process in MB, None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # Bytes rather than KB
+        peak /= 1024
+    return peak / 1024.0
+
+
+def make_options(lang="NONE", chars_only=False, upper_only=False, inc_camel=False):
+    """The options used by the stages."""
+    return argparse.Namespace(
+        lang=lang,
+        min_acc=2,
+        chars_only=chars_only,
+        upper_only=upper_only,
+        inc_camel=inc_camel,
+        table_gloss=True,
+        etok=False,
+        no_cache=True,
+        exclude_pattern=None,
+        include_pattern=None,
+        oneper=False,
+    )
+
+
+class StageTimer(object):
+    """Accumulate the time spent in named stages."""
+
+    def __init__(self):
+        """Initialise with no stages."""
+        self.seconds = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time the body of a with statement as the named stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = (
+                self.seconds.get(name, 0.0) + time.perf_counter() - start
+            )
+
+
+def time_docx(path, timer, options):
+    """Time the python-docx extraction stages, returns the words & glossary."""
+    with timer.stage("docx.parse"):
+        model = docx2utils.get_docx_model(path)
+    with timer.stage("docx.tokenize"):
+        words = text_utls.tokenize("\n".join(model.paragraphs), options)
+    with timer.stage("docx.clean"):
+        text_utls.clean_wordlist(words, options.min_acc)
+    with timer.stage("docx.table_gloss"):
+        docx2utils.docx_get_table_gloss(model, options=options)
+    with timer.stage("docx.total"):
+        dummy, words, doc_gloss = docx2utils.get_docx2_wordlist(path, options)
+    return words, doc_gloss
+
+
+def time_xmltree(path, timer, options):
+    """Time the xml tree extraction stages, returns the words."""
+    with timer.stage("xml.parse"):
+        with zipfile.ZipFile(path) as document:
+            with document.open("word/document.xml") as xml_content:
+                texts = [
+                    text
+                    for text, dummy, dummy_box in xmltree_utils.iter_docx_paragraphs(
+                        xml_content
+                    )
+                ]
+    with timer.stage("xml.split"):
+        words = set()
+        for text in texts:
+            words.update(text.split())
+    with timer.stage("xml.clean"):
+        text_utls.clean_wordlist(words, options.min_acc)
+    with timer.stage("xml.total"):
+        dummy, words, dummy_gloss = xmltree_utils.get_docx_tree_wordlist(path, options)
+    return words
+
+
+def count_words(path):
+    """The number of words in the paragraphs & tables of a document."""
+    with zipfile.ZipFile(path) as document:
+        with document.open("word/document.xml") as xml_content:
+            return sum(
+                len(text.split())
+                for text, dummy, dummy_box in xmltree_utils.iter_docx_paragraphs(
+                    xml_content
+                )
+            )
+
+
+def time_candidates(words, doc_gloss, timer, lang):
+    """Time get_candidates_from_list with each combination of options."""
+    for chars_only, upper_only, inc_camel in CANDIDATE_COMBOS:
+        options = make_options(lang, chars_only, upper_only, inc_camel)
+        name = "candidates[chars=%d,upper=%d,camel=%d]" % (
+            chars_only,
+            upper_only,
+            inc_camel,
+        )
+        with timer.stage(name):
+            text_utls.get_candidates_from_list(
+                words, extern_gloss=None, doc_gloss=doc_gloss, options=options
+            )
+
+
+def run(paths, repeat=3, lang="NONE"):
+    """
+    Time the stages over the documents, the fastest of repeat runs.
+
+    Returns a dictionary of the results.
+    """
+    options = make_options(lang)
+    words_total = sum(count_words(path) for path in paths)
+    has_docx = lazy_utils.get_docx() is not None
+    best = {}
+    for dummy in range(repeat):
+        timer = StageTimer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for path in paths:
+                words = time_xmltree(path, timer, options)
+                doc_gloss = []
+                if has_docx:
+                    words, doc_gloss = time_docx(path, timer, options)
+                time_candidates(words, doc_gloss, timer, lang)
+        for name, seconds in timer.seconds.items():
+            best[name] = min(seconds, best.get(name, seconds))
+    docs = len(paths)
+    return {
+        "docs": docs,
+        "words": words_total,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": {
+            name: {
+                "seconds_per_doc": seconds / docs,
+                "docs_per_s": docs / seconds if seconds else None,
+                "words_per_s": words_total / seconds if seconds else None,
+            }
+            for name, seconds in best.items()
+        },
+    }
+
+
+def report(results):
+    """Print the results."""
+    print(
+        "%d documents, %d words, peak RSS %s MB"
+        % (
+            results["docs"],
+            results["words"],
+            "%.1f" % results["peak_rss_mb"] if results["peak_rss_mb"] else "?",
+        )
+    )
+    print("%-40s %12s %10s %12s" % ("Stage", "ms/doc", "docs/s", "words/s"))
+    for name, stage in sorted(results["stages"].items()):
+        print(
+            "%-40s %12.3f %10.1f %12.0f"
+            % (
+                name,
+                stage["seconds_per_doc"] * 1000.0,
+                stage["docs_per_s"] or 0.0,
+                stage["words_per_s"] or 0.0,
+            )
+        )
+
+
+def compare(results, baseline, tolerance):
+    """Compare the results to a baseline, returns the stages that are slower."""
+    if baseline.get("corpus") != results.get("corpus"):
+        print("DIFFERENT CORPUS: baseline %s" % baseline.get("corpus"))
+        return ["corpus"]
+    slower = []
+    for name, stage in sorted(results["stages"].items()):
+        base = baseline.get("stages", {}).get(name)
+        if not base:
+            continue
+        ratio = stage["seconds_per_doc"] / base["seconds_per_doc"]
+        slower_ms = (stage["seconds_per_doc"] - base["seconds_per_doc"]) * 1000.0
+        if ratio > 1.0 + tolerance and slower_ms >= MIN_SLOWER_MS:
+            print("SLOWER: %s %.0f%% of baseline" % (name, ratio * 100.0))
+            slower.append(name)
+    return slower
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--paragraphs", type=int, default=200)
+    parser.add_argument("--tables", type=int, default=4)
+    parser.add_argument("--rows", type=int, default=20)
+    parser.add_argument("--no-glossary", action="store_false", dest="glossary")
+    parser.add_argument("--density", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--lang", default="NONE")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    ops = parser.parse_args()
+
+    corpus_params = {
+        "count": ops.count,
+        "paragraphs": ops.paragraphs,
+        "tables": ops.tables,
+        "rows": ops.rows,
+        "glossary": ops.glossary,
+        "density": ops.density,
+        "lang": ops.lang,
+        "seed": ops.seed,
+    }
+    with tempfile.TemporaryDirectory(prefix="gloss_check_bench_") as tempdir:
+        paths = corpus.make_corpus(
+            tempdir,
+            count=ops.count,
+            paragraphs=ops.paragraphs,
+            tables=ops.tables,
+            rows=ops.rows,
+            glossary=ops.glossary,
+            density=ops.density,
+            seed=ops.seed,
+        )
+        results = run(paths, ops.repeat, ops.lang)
+    results["corpus"] = corpus_params
+    report(results)
+    if ops.save_baseline:
+        with open(ops.baseline, "wt") as outfile:
+            json.dump(results, outfile, indent=2, sort_keys=True)
+        print("Saved baseline to", ops.baseline)
+    elif not os.path.exists(ops.baseline):
+        sys.exit(
+            "FAIL! No baseline at %s, use --save-baseline to make one" % ops.baseline
+        )
+    else:
+        with open(ops.baseline, "rt") as infile:
+            slower = compare(results, json.load(infile), ops.tolerance)
+        if slower:
+            sys.exit("FAIL! %s not within the baseline" % ", ".join(slower))
+        print("All stages within %.0f%% of the baseline" % (ops.tolerance * 100.0))
+
+
+if __name__ == "__main__":
+    main()
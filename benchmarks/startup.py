@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Measure the command line start up time against a budget.
+  Created: 18/10/2026
+
+Usage: python -m benchmarks.startup [--runs N] [--import-budget MS] ...
+
+Exits with a failure if any median time is over budget or if any of the
+optional heavy packages are imported when the command line starts.
+"""
+from __future__ import (
+    print_function,
+)
+
+import sys
+import time
+import json
+import argparse
+import statistics
+import subprocess
+
+# Budgets in milliseconds for the median of the runs.
+IMPORT_BUDGET_MS = 150
+VERSION_BUDGET_MS = 600
+HELP_BUDGET_MS = 500
+# Packages that must only be imported when they are needed.
+LAZY_MODULES = [
+    "wx",
+    "enchant",
+    "docx",
+    "textract",
+    "win32com",
+    "http.server",
+    "urllib.request",
+]
+
+
+def import_time_ms():
+    """Time to import the command line entry point from -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import gloss_check.__main__"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in proc.stderr.splitlines():
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == "gloss_check.__main__":
+            return int(fields[1]) / 1000.0
+    raise RuntimeError("gloss_check.__main__ not found in -X importtime output")
+
+
+def run_time_ms(*cl_args):
+    """Wall time to run gloss_check with the arguments."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "gloss_check"] + list(cl_args),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return (time.perf_counter() - start) * 1000.0
+
+
+def eager_modules():
+    """Get any of LAZY_MODULES that are imported by the entry point."""
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, json, gloss_check.__main__; "
+            "print(json.dumps(sorted(sys.modules)))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    loaded = json.loads(proc.stdout.splitlines()[-1])
+    return [name for name in LAZY_MODULES if name in loaded]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--version-budget", type=float, default=VERSION_BUDGET_MS)
+    parser.add_argument("--help-budget", type=float, default=HELP_BUDGET_MS)
+    ops = parser.parse_args()
+
+    # First run warms the language & file caches.
+    run_time_ms("--version")
+    timings = [
+        ("import", ops.import_budget, import_time_ms),
+        ("--version", ops.version_budget, lambda: run_time_ms("--version")),
+        ("--help", ops.help_budget, lambda: run_time_ms("--help")),
+    ]
+    failures = []
+    for name, budget, timer in timings:
+        median = statistics.median([timer() for dummy in range(ops.runs)])
+        status = "OK" if median <= budget else "OVER BUDGET"
+        print("%-10s %8.1f ms (budget %6.1f ms) %s" % (name, median, budget, status))
+        if median > budget:
+            failures.append(name)
+    eager = eager_modules()
+    if eager:
+        print("Imported at start up:", ", ".join(eager))
+        failures.append("lazy imports")
+    if failures:
+        sys.exit("FAIL! " + ", ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
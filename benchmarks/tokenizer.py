@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Compare the tokenizers for speed & agreement.
+  Created: 18/10/2026
+
+Usage: python -m benchmarks.tokenizer [--paragraphs N] [--repeat N] [--lang LANG]
+
+Times splitting synthetic paragraphs into words by:
+
+    split      - the old str.split then strip of each word
+    fast       - the token_utils split path
+    offsets    - the token_utils regular expression with offsets
+    enchant    - the cached enchant tokenizer for the language
+    uncached   - fetching the enchant tokenizer for every paragraph
+
+and reports how far the fast path agrees with enchant, as the fraction of
+the enchant words, (with repeats), that it also finds & vice versa.
+"""
+from __future__ import (
+    print_function,
+)
+
+import time
+import random
+import argparse
+import collections
+
+from benchmarks import corpus
+from gloss_check import token_utils
+from gloss_check import lazy_utils
+
+# Typographic punctuation that normalization should deal with.
+DECORATIONS = [
+    ("“", "”"),
+    ("‘", "’"),
+    ("(", ")"),
+    ("", ","),
+    ("", ";"),
+    ("", ":"),
+]
+
+
+def make_paragraphs(count, seed=0):
+    """Make paragraphs of synthetic text with typographic punctuation."""
+    rnd = random.Random(seed)
+    acronyms = corpus.make_acronyms(50, rnd)
+    paragraphs = []
+    for dummy in range(count):
+        words = corpus.make_sentence(rnd, corpus.WORDS, acronyms, 0.05).split()
+        for index in range(len(words)):
+            if rnd.random() < 0.1:
+                start, end = rnd.choice(DECORATIONS)
+                words[index] = start + words[index] + end
+            elif rnd.random() < 0.05:
+                words[index] = words[index] + "’s"
+        paragraphs.append(" ".join(words[:2]) + " " + " ".join(words[2:]))
+    return paragraphs
+
+
+def split_strip(text):
+    """The words as found before the tokenizer engine."""
+    words = [word.strip("“”,'\"‘ ’./:;()[]{}") for word in text.split()]
+    return [word for word in words if word]
+
+
+def uncached(lang):
+    """Tokenize by fetching the enchant tokenizer for every paragraph."""
+
+    def tokenize(text):
+        """Get the words from the text."""
+        tokzr = lazy_utils.get_etock().get_tokenizer(lang)
+        return [word for word, dummy in tokzr(text)]
+
+    return tokenize
+
+
+def get_methods(lang):
+    """Get the tokenizers to time by name."""
+    methods = collections.OrderedDict(
+        [
+            ("split", split_strip),
+            ("fast", token_utils.get_words),
+            ("offsets", lambda text: list(token_utils.iter_tokens(text))),
+        ]
+    )
+    if token_utils.get_tokenizer(lang) is not None:
+        methods["enchant"] = lambda text: token_utils.get_words(text, lang)
+        methods["uncached"] = uncached(lang)
+    return methods
+
+
+def time_method(method, paragraphs, repeat):
+    """Time a method over all the paragraphs, the best of repeat runs."""
+    best = None
+    for dummy in range(repeat):
+        start = time.perf_counter()
+        words = 0
+        for text in paragraphs:
+            words += len(method(text))
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best, words
+
+
+def agreement(paragraphs, lang):
+    """Get the fractions of the enchant & fast words that the other finds."""
+    fast = collections.Counter()
+    enchant = collections.Counter()
+    for text in paragraphs:
+        fast.update(token_utils.get_words(text))
+        enchant.update(token_utils.get_words(text, lang))
+    common = sum((fast & enchant).values())
+    return common / max(sum(enchant.values()), 1), common / max(sum(fast.values()), 1)
+
+
+def main():
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paragraphs", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--lang", default="en_GB")
+    ops = parser.parse_args()
+
+    paragraphs = make_paragraphs(ops.paragraphs)
+    methods = get_methods(ops.lang)
+    print("%-10s %10s %14s" % ("Tokenizer", "Seconds", "Words/s"))
+    for name, method in methods.items():
+        seconds, words = time_method(method, paragraphs, ops.repeat)
+        print("%-10s %10.4f %14.0f" % (name, seconds, words / seconds))
+    if "enchant" in methods:
+        enchant_found, fast_found = agreement(paragraphs, ops.lang)
+        print(
+            "Fast path finds %.1f%% of the enchant words, enchant finds %.1f%% "
+            "of the fast path words" % (enchant_found * 100.0, fast_found * 100.0)
+        )
+    else:
+        print("No enchant tokenizer for %s, agreement not measured" % ops.lang)
+
+
+if __name__ == "__main__":
+    main()
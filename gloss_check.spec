@@ -7,7 +7,7 @@ a = Analysis(['gloss_check.py'],
              pathex=['D:\\Users\\212303160\\GitWorking\\Gloss-Check'],
              binaries=[],
              datas=[('C:\\Python35-32\\Lib\\site-packages\\enchant\\tokenize', 'enchant\\tokenize')],
-             hiddenimports=[],
+             hiddenimports=['enchant', 'enchant.tokenize', 'docx', 'win_unicode_console', 'gc_gui', 'gc_server'],
              hookspath=[],
              runtime_hooks=[],
              excludes=[],
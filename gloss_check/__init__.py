@@ -1,10 +1,26 @@
 __ALL__ = [
     "args",
-    "doc2docx",
+    "cache_utils",
+    "converters",
+    "doc97utils",
+    "doc_source",
+    "doc_walker",
     "docx2utils",
+    "file_watcher",
+    "gc_client",
+    "gc_server",
+    "gloss_index",
+    "gloss_loaders",
+    "inline_defs",
+    "lazy_utils",
+    "output_formats",
+    "position_index",
+    "profile_utils",
+    "shared_gloss",
     "gloss_utils",
     "gloss_check",
     "text_utls",
+    "token_utils",
     "version_info",
     "xmltree_utils",
 ]
@@ -6,26 +6,27 @@
   Created: 17/04/2017
 """
 import os
+import sys
+import time
 import argparse
+import re
 import json
-import copy
+import importlib.util
 
 import appdirs
 
 try:
-    import enchant
+    import cache_utils
+    import lazy_utils
 except ImportError:
-    enchant = None
-try:
-    from enchant import tokenize as etock
-
-    # import enchant.tokenize as etock
-except ImportError:
-    etock = None
+    from gloss_check import cache_utils
+    from gloss_check import lazy_utils
 
 CONFIG_DIR = appdirs.user_config_dir(appname="Gloss_Check", appauthor="GE")
 CL_CFG_NAME = os.path.join(CONFIG_DIR, "config.json")
 GUI_CFG_NAME = os.path.join(CONFIG_DIR, "gui_config.json")
+LANG_CACHE_NAME = os.path.join(cache_utils.BASE_CACHE_DIR, "languages.json")
+LANG_CACHE_AGE = 24 * 60 * 60  # Recheck the installed dictionaries daily
 
 ARG_LIST = [
     (
@@ -94,6 +95,15 @@ ARG_LIST = [
             "help": "Search each document for possible glossary table.",
         },
     ),
+    (
+        ["-D", "-d", "--inline_defs"],
+        {
+            "action": "store_true",
+            "lable": "Inline &Definitions",
+            "savecfg": True,
+            "help": "Treat abbreviations defined in the text, as Long Form (ABBR) or ABBR (Long Form), as glossary entries.",
+        },
+    ),
     (
         ["-gu", "-GU", "--glossary-unused"],
         {
@@ -115,38 +125,94 @@ ARG_LIST = [
     ),
 ]
 
-LANGS = ["NONE"]
-# See if we have a dictionary available
-if enchant is not None:
-    LANGS.extend(enchant.list_languages())
-
 # Optional Args - depends on which packages are present.
-if len(LANGS) > 1:  # Add the language option if we have a dictionary available
-    ARG_LIST.insert(
-        0,
-        (
-            ["-L", "-l", "--lang"],
-            {
-                "action": "store",
-                "choices": LANGS,
-                "default": "en_GB",
-                "lable": "&Language",
-                "savecfg": True,
-                "help": "Language code to spell check against",
-            },
-        ),
-    )
-if etock is not None:
-    ARG_LIST.append(
-        (
-            ["-e", "-E", "--etok"],
-            {
-                "action": "store_false",
-                "savecfg": True,
-                "help": "Enchant Tokanization (Often better BUT can give odd results)",
-            },
-        ),
-    )
+LANG_ARG = (
+    ["-L", "-l", "--lang"],
+    {
+        "action": "store",
+        "choices": None,  # Filled in from get_langs()
+        "default": "en_GB",
+        "lable": "&Language",
+        "savecfg": True,
+        "help": "Language code to spell check against",
+    },
+)
+ETOK_ARG = (
+    ["-e", "-E", "--etok"],
+    {
+        "action": "store_false",
+        "savecfg": True,
+        "help": "Enchant Tokanization (Often better BUT can give odd results)",
+    },
+)
+LIST_LANGS_ARG = (
+    ["-LL", "-ll", "--list-langs"],
+    {
+        "action": "store_true",
+        "savecfg": False,
+        "help": "List the available Language codes & exit",
+    },
+)
+
+# The enchant languages & tokenizer availability once found.
+_ENCHANT_INFO = {}
+
+
+def enchant_key():
+    """Identify the installed enchant so a change refreshes the languages."""
+    spec = importlib.util.find_spec("enchant")
+    if spec is None:
+        return None
+    try:
+        installed = os.path.getmtime(spec.origin)
+    except (OSError, TypeError):
+        installed = None
+    env = sorted([(k, v) for k, v in os.environ.items() if "ENCHANT" in k.upper()])
+    return json.dumps([spec.origin, installed, env])
+
+
+def get_enchant_info(refresh=False):
+    """
+    Get the available enchant languages and tokenizer availability.
+
+    Importing enchant & listing the languages is slow so the result is
+    cached on disk, keyed by the installed package, and rechecked daily.
+    """
+    if _ENCHANT_INFO and not refresh:
+        return _ENCHANT_INFO
+    key = enchant_key()
+    info = {"key": key, "time": time.time(), "langs": [], "etok": False}
+    if key is not None:
+        cached = {}
+        if not refresh and os.path.exists(LANG_CACHE_NAME):
+            try:
+                with open(LANG_CACHE_NAME, "rt") as infile:
+                    cached = json.load(infile)
+            except (OSError, ValueError):
+                cached = {}
+        if (
+            cached.get("key") == key
+            and time.time() - cached.get("time", 0) < LANG_CACHE_AGE
+        ):
+            info = cached
+        elif lazy_utils.get_enchant() is not None:
+            info["langs"] = lazy_utils.get_enchant().list_languages()
+            info["etok"] = lazy_utils.get_etock() is not None
+            try:
+                if not os.path.exists(cache_utils.BASE_CACHE_DIR):
+                    os.makedirs(cache_utils.BASE_CACHE_DIR, exist_ok=True)
+                with open(LANG_CACHE_NAME, "wt") as outfile:
+                    json.dump(info, outfile)
+            except OSError:
+                pass
+    _ENCHANT_INFO.clear()
+    _ENCHANT_INFO.update(info)
+    return _ENCHANT_INFO
+
+
+def get_langs():
+    """Get the language codes that can be spell checked against, plus NONE."""
+    return ["NONE"] + get_enchant_info()["langs"]
 
 
 def limited_int(val: int) -> int:
@@ -159,6 +225,28 @@ def limited_int(val: int) -> int:
     return x
 
 
+def job_count(val: str) -> int:
+    """Number of worker processes, 0 for one per CPU."""
+    try:
+        x = int(val)
+    except ValueError:
+        x = -1
+    if x < 0:
+        raise argparse.ArgumentTypeError(
+            f"Number of jobs must be a whole number, 0 for all CPUs, not {val}"
+        )
+    return x
+
+
+def regex(val: str) -> str:
+    """A valid regular expression."""
+    try:
+        re.compile(val)
+    except re.error as err:
+        raise argparse.ArgumentTypeError(f"Invalid regular expression {val}: {err}")
+    return val
+
+
 CL_ARGS = [  # Items that only apply to the command line version.
     (
         ["-G", "-g", "--glossary"],
@@ -166,7 +254,7 @@ CL_ARGS = [  # Items that only apply to the command line version.
             "action": "append",
             "type": argparse.FileType("r"),
             "savecfg": False,
-            "help": "An existing glossary to ignore",
+            "help": "An existing glossary to ignore, the terms are read from .json keys, the first column of .txt/.tsv, .csv or .docx tables, otherwise all words.",
         },
     ),
     (
@@ -191,6 +279,196 @@ CL_ARGS = [  # Items that only apply to the command line version.
             "help": "Give a fail result if this number, or more, defined items are not found. 0 disables",
         },
     ),
+    (
+        ["-X", "--exclude-pattern"],
+        {
+            "type": regex,
+            "action": "append",
+            "dest": "exclude_pattern",
+            "savecfg": False,
+            "help": "Exclude candidates matching this regular expression, e.g. part numbers or units.",
+        },
+    ),
+    (
+        ["-I", "--include-pattern"],
+        {
+            "type": regex,
+            "action": "append",
+            "dest": "include_pattern",
+            "savecfg": False,
+            "help": "Only include candidates that match one of these regular expressions.",
+        },
+    ),
+    (
+        ["-R", "--recursive"],
+        {
+            "action": "store_true",
+            "savecfg": False,
+            "help": "Search directories, and ** in wildcards, recursively for documents, skipping those matched by .glossignore files.",
+        },
+    ),
+    (
+        ["--include-files"],
+        {
+            "action": "append",
+            "dest": "include_files",
+            "metavar": "GLOB",
+            "savecfg": False,
+            "help": "With --recursive only check files matching this, (default *.docx & *.doc).",
+        },
+    ),
+    (
+        ["--exclude-files"],
+        {
+            "action": "append",
+            "dest": "exclude_files",
+            "metavar": "GLOB",
+            "savecfg": False,
+            "help": "With --recursive skip files & directories matching this.",
+        },
+    ),
+    (
+        ["--exclude-parts"],
+        {
+            "action": "append",
+            "dest": "exclude_parts",
+            "choices": [
+                "headers",
+                "footers",
+                "footnotes",
+                "endnotes",
+                "comments",
+                "textboxes",
+            ],
+            "savecfg": True,
+            "help": "Do not check the text in this part of .docx documents, (default check all parts).",
+        },
+    ),
+    (
+        ["--rule-stats"],
+        {
+            "action": "store_true",
+            "dest": "rule_stats",
+            "savecfg": False,
+            "help": "Show the number of words rejected by each candidate rule.",
+        },
+    ),
+    (
+        ["-j", "--jobs"],
+        {
+            "type": job_count,
+            "action": "store",
+            "dest": "jobs",
+            "default": 1,
+            "savecfg": True,
+            "help": "Number of worker processes to check documents with, 0 uses all CPUs.",
+        },
+    ),
+    (
+        ["--no-cache"],
+        {
+            "action": "store_true",
+            "dest": "no_cache",
+            "savecfg": True,
+            "help": "Do not use or update the cache of previously extracted documents.",
+        },
+    ),
+    (
+        ["--clear-cache"],
+        {
+            "action": "store_true",
+            "dest": "clear_cache",
+            "savecfg": False,
+            "help": "Clear the cache of previously extracted documents.",
+        },
+    ),
+    (
+        ["-W", "--watch"],
+        {
+            "action": "store_true",
+            "savecfg": False,
+            "help": "Keep watching the documents & re-check any that change, Ctrl-C to stop.",
+        },
+    ),
+    (
+        ["--serve"],
+        {
+            "action": "store_true",
+            "savecfg": False,
+            "help": "Run as a daemon, keeping dictionaries & glossaries loaded, for later checks to use.",
+        },
+    ),
+    (
+        ["--port"],
+        {
+            "type": int,
+            "action": "store",
+            "default": 47017,
+            "savecfg": True,
+            "help": "Localhost port for the daemon.",
+        },
+    ),
+    (
+        ["--no-daemon"],
+        {
+            "action": "store_true",
+            "dest": "no_daemon",
+            "savecfg": False,
+            "help": "Always check locally even if a daemon is running.",
+        },
+    ),
+    (
+        ["--format"],
+        {
+            "action": "store",
+            "choices": ["text", "ndjson", "json", "csv", "junit"],
+            "default": "text",
+            "savecfg": False,
+            "help": "Output format, other than text a record is written to stdout for each document & messages go to stderr.",
+        },
+    ),
+    (
+        ["--profile"],
+        {
+            "action": "store",
+            "nargs": "?",
+            "const": "gloss_check_profile.json",
+            "metavar": "REPORT",
+            "savecfg": False,
+            "help": "Time each stage of the checks & write a report, .csv or .json, (default gloss_check_profile.json).",
+        },
+    ),
+    (
+        ["--kwic"],
+        {
+            "action": "store",
+            "nargs": "?",
+            "const": "gloss_check_kwic.html",
+            "metavar": "REPORT",
+            "savecfg": False,
+            "help": "Write a keyword in context report of where each candidate is used, .html or .json, (default gloss_check_kwic.html).",
+        },
+    ),
+    (
+        ["--profile-cprofile"],
+        {
+            "action": "store",
+            "dest": "profile_cprofile",
+            "metavar": "STATS_FILE",
+            "savecfg": False,
+            "help": "With --profile also dump cProfile stats of the main process to STATS_FILE.",
+        },
+    ),
+    (
+        ["--converter"],
+        {
+            "action": "store",
+            "choices": ["auto", "word", "soffice", "fake"],
+            "default": "auto",
+            "savecfg": True,
+            "help": "How to convert documents that can't be read directly, (pre Word 97 .doc files), auto picks Word on Windows or LibreOffice if installed.",
+        },
+    ),
     (
         ["-v", "--version"],
         {
@@ -213,23 +491,12 @@ CL_ARGS = [  # Items that only apply to the command line version.
         {
             "nargs": "*",
             "savecfg": False,
-            "help": "Word document(s) to check, (Wildcards OK).",
+            "help": "Word document(s) to check, (Wildcards OK), .zip bundles of "
+            "documents or - to read one from stdin.",
         },
     ),
 ]
 
-if len(LANGS) > 1:
-    CL_ARGS.append(
-        (
-            ["-LL", "-ll", "--list-langs"],
-            {
-                "action": "store_true",
-                "savecfg": False,
-                "help": "List the available Language codes & exit",
-            },
-        )
-    )
-
 GUI_ARGS = [
     (
         ["--Auto-Update"],
@@ -295,13 +562,24 @@ def read_config_dict(gui=False):
 
 def get_option_list(gui=False, remove_specials=True):
     """Get the options list for command line or gui."""
-    optlist = []
-    optlist.extend(copy.deepcopy(ARG_LIST))  # Start with the base set of Arguments
+    langs = get_langs()
+    baselist = []
+    if len(langs) > 1:  # Add the language option if we have a dictionary available
+        baselist.append(LANG_ARG)
+    baselist.extend(ARG_LIST)  # Start with the base set of Arguments
+    if get_enchant_info()["etok"]:
+        baselist.append(ETOK_ARG)
     if gui:
-        optlist.extend(copy.deepcopy(GUI_ARGS))
+        baselist.extend(GUI_ARGS)
     else:
-        optlist.extend(copy.deepcopy(CL_ARGS))
+        baselist.extend(CL_ARGS)
+        if len(langs) > 1:
+            baselist.append(LIST_LANGS_ARG)
+    # Only the details dictionaries are changed so a shallow copy is enough.
+    optlist = [(list(optnames), dict(details)) for optnames, details in baselist]
     for optnames, details in optlist:
+        if "choices" in details and details["choices"] is None:
+            details["choices"] = langs
         assert isinstance(details, dict)
         names = [n[2:] for n in optnames if n.startswith("--")]
         if len(names):
@@ -322,14 +600,24 @@ def get_option_list(gui=False, remove_specials=True):
     return optlist
 
 
+def reset_requested():
+    """
+    Check if --reset-config, or an abbreviation of it, is on the command line
+    without parsing all of the options.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--reset-config", action="store_true")
+    known, dummy = parser.parse_known_args(sys.argv[1:])
+    return known.reset_config
+
+
 def get_cl_parser(description, gui=False, loadcfg=True):
     """Get an argument parser."""
     parser = argparse.ArgumentParser(description=description)
     optlist = get_option_list(gui)
     for argp, argv in optlist:
         parser.add_argument(*argp, **argv)
-    selected = parser.parse_args()
-    if loadcfg and selected.reset_config:
+    if loadcfg and reset_requested():
         default_config(gui)
     if loadcfg:
         parser.set_defaults(**read_config_dict())
@@ -0,0 +1,386 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Persistent caches of extracted words & spelling verdicts.
+  Created: 18/10/2026
+"""
+from __future__ import (
+    print_function,
+)
+
+import os
+import sys
+import json
+import pickle
+import hashlib
+import tempfile
+import contextlib
+
+import appdirs
+
+try:
+    import profile_utils
+    import doc_source
+    import position_index
+except ImportError:
+    from gloss_check import profile_utils
+    from gloss_check import doc_source
+    from gloss_check import position_index
+
+BASE_CACHE_DIR = appdirs.user_cache_dir(appname="Gloss_Check", appauthor="GE")
+CACHE_DIR = os.path.join(BASE_CACHE_DIR, "extract")
+SPELL_DIR = os.path.join(BASE_CACHE_DIR, "spell")
+GLOSS_DIR = os.path.join(BASE_CACHE_DIR, "glossary")
+# Bump this whenever the extractors change what they return.
+EXTRACTOR_VERSION = 9
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+GLOSS_MAX_BYTES = 64 * 1024 * 1024
+# Spelling verdict files past this size are compacted to the latest verdicts.
+SPELL_MAX_BYTES = 8 * 1024 * 1024
+SPELL_MAX_WORDS = 500000
+# Bump this whenever the glossary loaders change what they return.
+GLOSSARY_VERSION = 1
+# Options that change the words & document glossary that are extracted.
+KEY_OPTIONS = [
+    "min_acc",
+    "table_gloss",
+    "inline_defs",
+    "etok",
+    "lang",
+    "chars_only",
+    "upper_only",
+    "inc_camel",
+    "exclude_parts",
+    "exclude_pattern",
+    "include_pattern",
+]
+
+
+def file_hash(path, blocksize=1024 * 1024):
+    """Get the sha256 hash of the contents of a file or other document."""
+    if doc_source.is_virtual(path):
+        return doc_source.content_hash(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as infile:
+        for block in iter(lambda: infile.read(blocksize), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(content_hash, method, options, dictionary=None):
+    """
+    Get the cache key for a document hash, extraction method, options &
+    spelling dictionary, as the document glossary tables are spell checked.
+    """
+    key_parts = [
+        str(EXTRACTOR_VERSION),
+        content_hash,
+        f"{method.__module__}.{method.__name__}",
+        repr(dictionary),
+    ]
+    key_parts.extend([repr(getattr(options, name, None)) for name in KEY_OPTIONS])
+    return hashlib.sha256("|".join(key_parts).encode("utf-8")).hexdigest()
+
+
+def cache_enabled(options):
+    """Check if the cache is enabled by the options."""
+    return not getattr(options, "no_cache", False)
+
+
+def cache_load(key, index=None):
+    """
+    Load a cached result & the messages printed while extracting it, returns
+    None if not present, unreadable or incomplete, or if a position index is
+    being built and it wasn't stored with the result.
+    """
+    filename = os.path.join(CACHE_DIR, key + ".json")
+    try:
+        with open(filename, "rt", encoding="utf-8") as infile:
+            entry = json.load(infile)
+        os.utime(filename)  # Mark as recently used for eviction
+    except (OSError, ValueError):
+        return None
+    try:
+        result = entry["success"], entry["words"], entry["doc_gloss"]
+        messages = entry["messages"]
+        if index is not None:
+            index.load(entry["index"])
+    except (KeyError, TypeError):  # Incomplete or from an older version
+        return None
+    return result, messages
+
+
+def cache_store(key, result, index=None, messages=""):
+    """
+    Store a result, the messages printed while extracting it and any
+    position index in the cache, failures to write are ignored.
+    """
+    success, words, doc_gloss = result
+    entry = {
+        "success": success,
+        "words": words,
+        "doc_gloss": doc_gloss,
+        "messages": messages,
+    }
+    if index is not None:
+        entry["index"] = index.to_dict()
+    try:
+        if not os.path.exists(CACHE_DIR):
+            os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temporary file then rename so workers can share the cache
+        handle, tempname = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(handle, "wt", encoding="utf-8") as outfile:
+            json.dump(entry, outfile, ensure_ascii=False)
+        os.replace(tempname, os.path.join(CACHE_DIR, key + ".json"))
+    except OSError as err:
+        print("Unable to write to cache:", err)
+
+
+def extract_key(method, path, options):
+    """Get the cache key for extracting the words from path with method."""
+    try:
+        from text_utls import dictionary_version
+    except ImportError:
+        from gloss_check.text_utls import dictionary_version
+    return cache_key(file_hash(path), method, options, dictionary_version(options))
+
+
+def is_cached(method, path, options):
+    """Check if there is a cached result for extracting path with method."""
+    if not cache_enabled(options):
+        return False
+    try:
+        key = extract_key(method, path, options)
+    except OSError:
+        return False
+    return os.path.exists(os.path.join(CACHE_DIR, key + ".json"))
+
+
+class TeeOutput(object):
+    """Write to a stream while keeping a copy of everything written."""
+
+    def __init__(self, stream):
+        """Initialise with the stream to write to."""
+        self.stream = stream
+        self.parts = []
+
+    def write(self, text):
+        """Write text to the stream & keep a copy."""
+        self.parts.append(text)
+        return self.stream.write(text)
+
+    def flush(self):
+        """Flush the stream."""
+        self.stream.flush()
+
+    def getvalue(self):
+        """Get everything written so far."""
+        return "".join(self.parts)
+
+
+def cached_extract(method, path, options):
+    """
+    Call method(path, options) unless there is a cached result for the
+    contents of path with the same options, the messages that method
+    printed are stored with the result and printed again on a cache hit.
+    """
+    if not cache_enabled(options):
+        return method(path, options)
+    try:
+        key = extract_key(method, path, options)
+    except OSError:
+        return method(path, options)
+    index = position_index.current()
+    cached = cache_load(key, index)
+    profile_utils.count("cache misses" if cached is None else "cache hits")
+    if cached is not None:
+        result, messages = cached
+        print(messages, end="")
+        return result
+    output = TeeOutput(sys.stdout)
+    with contextlib.redirect_stdout(output):
+        result = method(path, options)
+    if result[0]:
+        cache_store(key, result, index, output.getvalue())
+    return result
+
+
+def prune_dir(cache_dir, max_bytes):
+    """Remove the least recently used files in cache_dir until under max_bytes."""
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    total = 0
+    with os.scandir(cache_dir) as scan:
+        for entry in scan:
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+    for dummy_mtime, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def prune_cache(max_bytes=CACHE_MAX_BYTES, gloss_max_bytes=GLOSS_MAX_BYTES):
+    """
+    Remove the least recently used extracted & compiled glossary entries
+    until under their limits and compact any spelling verdict files that
+    have grown too large.
+    """
+    prune_dir(CACHE_DIR, max_bytes)
+    prune_dir(GLOSS_DIR, gloss_max_bytes)
+    prune_verdicts()
+
+
+def spell_cache_path(lang, dict_version):
+    """Get the path of the spelling verdicts file for a dictionary version."""
+    safe_name = "".join([c if c.isalnum() else "_" for c in f"{lang}-{dict_version}"])
+    return os.path.join(SPELL_DIR, safe_name + ".tsv")
+
+
+def load_verdicts(path, max_words=None):
+    """
+    Load the persisted spelling verdicts as a dictionary of word: bool,
+    stopping once max_words have been read.
+    """
+    verdicts = {}
+    try:
+        with open(path, "rt", encoding="utf-8") as infile:
+            for line in infile:
+                word, sep, verdict = line.rstrip("\n").rpartition("\t")
+                if sep:
+                    verdicts[word] = verdict == "1"
+                    if max_words is not None and len(verdicts) >= max_words:
+                        break
+    except OSError:
+        pass
+    return verdicts
+
+
+def compact_verdicts(path, max_words=SPELL_MAX_WORDS):
+    """
+    Rewrite a spelling verdicts file without the repeats that the workers
+    append, keeping the latest max_words verdicts.
+    """
+    verdicts = {}
+    try:
+        with open(path, "rt", encoding="utf-8") as infile:
+            for line in infile:
+                word, sep, verdict = line.rstrip("\n").rpartition("\t")
+                if sep:
+                    verdicts.pop(word, None)  # Keep in order of the latest
+                    verdicts[word] = verdict
+        lines = ["%s\t%s\n" % item for item in verdicts.items()][-max_words:]
+        handle, tempname = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(handle, "wt", encoding="utf-8") as outfile:
+            outfile.write("".join(lines))
+        os.replace(tempname, path)
+    except OSError as err:
+        print("Unable to compact spelling cache:", err)
+
+
+def prune_verdicts(max_bytes=SPELL_MAX_BYTES):
+    """Compact the spelling verdict files that are larger than max_bytes."""
+    if not os.path.isdir(SPELL_DIR):
+        return
+    with os.scandir(SPELL_DIR) as scan:
+        large = [
+            entry.path
+            for entry in scan
+            if entry.name.endswith(".tsv")
+            and entry.is_file()
+            and entry.stat().st_size > max_bytes
+        ]
+    for path in large:
+        compact_verdicts(path)
+
+
+def append_verdicts(path, verdicts):
+    """
+    Append new spelling verdicts to a file with a single write, so that
+    workers can add to the same file.
+    """
+    lines = [
+        "%s\t%d\n" % (word, verdict)
+        for word, verdict in verdicts.items()
+        if not any([c.isspace() for c in word])
+    ]
+    try:
+        if not os.path.exists(SPELL_DIR):
+            os.makedirs(SPELL_DIR, exist_ok=True)
+        with open(path, "at", encoding="utf-8") as outfile:
+            outfile.write("".join(lines))
+    except OSError as err:
+        print("Unable to write to spelling cache:", err)
+
+
+def glossary_cache_path(path, variant):
+    """
+    Get the path of the compiled form of a glossary file, keyed by its path,
+    modification time & size and the variant of the loader, None if the
+    glossary can't be read.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = "|".join(
+        [
+            str(GLOSSARY_VERSION),
+            os.path.abspath(path),
+            str(stat.st_mtime_ns),
+            str(stat.st_size),
+            repr(variant),
+        ]
+    )
+    return os.path.join(
+        GLOSS_DIR, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".pickle"
+    )
+
+
+def load_glossary(cache_path):
+    """Load a compiled glossary, None if not present or unreadable."""
+    try:
+        with open(cache_path, "rb") as infile:
+            entries = pickle.load(infile)
+        os.utime(cache_path)  # Mark as recently used for eviction
+        return entries
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        return None
+
+
+def store_glossary(cache_path, entries):
+    """Store a compiled glossary, failures to write are ignored."""
+    try:
+        if not os.path.exists(GLOSS_DIR):
+            os.makedirs(GLOSS_DIR, exist_ok=True)
+        handle, tempname = tempfile.mkstemp(dir=GLOSS_DIR, suffix=".tmp")
+        with os.fdopen(handle, "wb") as outfile:
+            pickle.dump(entries, outfile, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tempname, cache_path)
+    except OSError as err:
+        print("Unable to write to glossary cache:", err)
+
+
+def clear_cache():
+    """Remove all of the cached entries."""
+    removed = 0
+    for cache_dir in [CACHE_DIR, SPELL_DIR, GLOSS_DIR]:
+        if os.path.isdir(cache_dir):
+            with os.scandir(cache_dir) as scan:
+                for entry in scan:
+                    if entry.is_file():
+                        os.remove(entry.path)
+                        removed += 1
+    print("Cleared %d cached entries from %s" % (removed, BASE_CACHE_DIR))
+
+
+if __name__ == "__main__":
+    print(CACHE_DIR)
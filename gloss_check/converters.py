@@ -0,0 +1,503 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Pooled conversion of documents to .docx.
+  Created: 18/10/2026
+
+Converters are started once, by a long lived worker thread that owns them,
+and then convert any number of documents, each in its own temporary
+directory, returning the .docx contents as bytes. Documents that are queued
+together are given to the converter as a batch, prefetch() queues the
+documents of a run together before any are needed. The available converters
+are:
+
+    word    - Microsoft Word through COM, (Windows only).
+    soffice - A headless LibreOffice listener driven through UNO, or if the
+              uno module is not available one soffice call for each batch.
+    fake    - Returns the document unchanged, for testing.
+"""
+from __future__ import (
+    print_function,
+)
+
+import os
+import abc
+import sys
+import time
+import queue
+import atexit
+import shutil
+import tempfile
+import threading
+import subprocess
+import concurrent.futures
+
+try:
+    import profile_utils
+    import lazy_utils
+except ImportError:
+    from gloss_check import profile_utils
+    from gloss_check import lazy_utils
+
+CONVERT_TIMEOUT = 120  # Seconds
+LISTENER_TIMEOUT = 60  # Seconds for LibreOffice to start listening
+BATCH_MAX = 32  # Most queued documents to give a converter at once
+
+
+class ConversionError(Exception):
+    """A document could not be converted."""
+
+
+class Converter(abc.ABC):
+    """Base class for the converters."""
+
+    @abc.abstractmethod
+    def convert(self, path):
+        """Convert the document at path returning the .docx contents."""
+
+    def convert_batch(self, paths):
+        """
+        Convert several documents, returning for each the .docx contents or
+        the ConversionError that stopped it being converted.
+        """
+        results = []
+        for path in paths:
+            try:
+                results.append(self.convert(path))
+            except ConversionError as err:
+                results.append(err)
+            except Exception as err:  # COM & converter specific errors
+                results.append(ConversionError(str(err)))
+        return results
+
+    def close(self):
+        """Release anything held by the converter."""
+
+
+class WordConverter(Converter):
+    """Convert with a private, hidden, instance of Word."""
+
+    def __init__(self):
+        """Start Word, raises ConversionError if unavailable."""
+        try:  # Only import when needed as this starts the COM machinery
+            import pythoncom
+            import win32com.client
+        except ImportError:
+            raise ConversionError("Word COM interface not available")
+        self.pythoncom = pythoncom
+        pythoncom.CoInitialize()  # COM objects belong to the thread
+        print("Starting Word to convert .doc files to .docx")
+        self.word = win32com.client.DispatchEx("Word.Application")
+        self.word.Visible = False
+        self.word.DisplayAlerts = 0
+
+    def convert(self, path):
+        """Convert the document at path returning the .docx contents."""
+        with tempfile.TemporaryDirectory(prefix="gloss_check_") as tempdir:
+            outpath = os.path.join(tempdir, "converted.docx")
+            document = self.word.Documents.Open(
+                os.path.abspath(path),
+                ConfirmConversions=False,
+                ReadOnly=True,
+                AddToRecentFiles=False,
+            )
+            try:
+                document.SaveAs(outpath, FileFormat=12)
+            finally:
+                document.Close(False)
+            with open(outpath, "rb") as infile:
+                return infile.read()
+
+    def close(self):
+        """Quit Word."""
+        self.word.Quit()
+        self.pythoncom.CoUninitialize()
+
+
+class SOfficeConverter(Converter):
+    """
+    Convert with LibreOffice in headless mode.
+
+    A profile directory is created once for the converter so that each
+    conversion does not pay for creating one & so that converters can run
+    at the same time. If the uno module is available a single LibreOffice
+    listener is started for the converter & every document is converted by
+    it, otherwise each batch of documents is converted by one soffice call.
+    """
+
+    def __init__(self):
+        """Find LibreOffice, raises ConversionError if unavailable."""
+        self.soffice = shutil.which("soffice") or shutil.which("libreoffice")
+        if self.soffice is None:
+            raise ConversionError("LibreOffice not found")
+        self.profile = tempfile.mkdtemp(prefix="gloss_check_profile_")
+        self.process = None
+        self.desktop = None
+        self.uno = lazy_utils.optional_import("uno")
+        if self.uno is not None:
+            try:
+                self.start_listener()
+            except (OSError, ConversionError) as err:
+                print("Converting with a soffice call per batch:", err)
+                self.stop_listener()
+
+    def base_args(self):
+        """Get the soffice command line with the converter's profile."""
+        return [
+            self.soffice,
+            "-env:UserInstallation=file:///%s"
+            % self.profile.replace(os.sep, "/").lstrip("/"),
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--norestore",
+        ]
+
+    def start_listener(self):
+        """Start LibreOffice listening on a pipe & connect to it through UNO."""
+        pipe = "gloss_check_%d_%d" % (os.getpid(), id(self))
+        connection = "pipe,name=%s;urp;StarOffice.ComponentContext" % pipe
+        self.process = subprocess.Popen(
+            self.base_args() + ["--accept=%s" % connection],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        local = self.uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local
+        )
+        deadline = time.monotonic() + LISTENER_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve("uno:%s" % connection)
+                break
+            except Exception as err:  # NoConnectException until it is up
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    raise ConversionError("LibreOffice did not start: %s" % err)
+                time.sleep(0.25)
+        self.desktop = context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", context
+        )
+
+    def stop_listener(self):
+        """Stop LibreOffice if it was started as a listener."""
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:  # The bridge goes as LibreOffice exits
+                pass
+            self.desktop = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+
+    def prop(self, name, value):
+        """Get a UNO PropertyValue."""
+        return self.uno.createUnoStruct(
+            "com.sun.star.beans.PropertyValue", name, 0, value, 0
+        )
+
+    def convert(self, path):
+        """Convert the document at path returning the .docx contents."""
+        result = self.convert_batch([path])[0]
+        if isinstance(result, ConversionError):
+            raise result
+        return result
+
+    def convert_batch(self, paths):
+        """Convert documents with the listener, or one soffice call per batch."""
+        if self.desktop is None:
+            return self.run_batch(paths)
+        return [self.listener_convert(path) for path in paths]
+
+    def listener_convert(self, path):
+        """Convert a document with the listener, returning bytes or the error."""
+        with tempfile.TemporaryDirectory(prefix="gloss_check_") as tempdir:
+            outpath = os.path.join(tempdir, "converted.docx")
+            try:
+                document = self.desktop.loadComponentFromURL(
+                    self.uno.systemPathToFileUrl(os.path.abspath(path)),
+                    "_blank",
+                    0,
+                    (self.prop("Hidden", True), self.prop("ReadOnly", True)),
+                )
+                if document is None:
+                    return ConversionError("LibreOffice could not open %s" % path)
+                try:
+                    document.storeToURL(
+                        self.uno.systemPathToFileUrl(outpath),
+                        (self.prop("FilterName", "MS Word 2007 XML"),),
+                    )
+                finally:
+                    document.close(True)
+                with open(outpath, "rb") as infile:
+                    return infile.read()
+            except Exception as err:  # UNO exceptions are not exported
+                return ConversionError(str(err))
+
+    def run_batch(self, paths):
+        """
+        Convert documents with a soffice call for each group that have
+        different names, as the output is named after the input.
+        """
+        results = {}
+        pending = list(paths)
+        while pending:
+            group = {}
+            for path in pending:
+                group.setdefault(os.path.splitext(os.path.basename(path))[0], path)
+            pending = [path for path in pending if path not in group.values()]
+            results.update(self.run_group(group))
+        return [results[path] for path in paths]
+
+    def run_group(self, group):
+        """Convert documents, by output name, with a single soffice call."""
+        with tempfile.TemporaryDirectory(prefix="gloss_check_") as tempdir:
+            try:
+                subprocess.run(
+                    self.base_args()
+                    + ["--convert-to", "docx", "--outdir", tempdir]
+                    + [os.path.abspath(path) for path in group.values()],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=CONVERT_TIMEOUT * len(group),
+                    check=False,  # Any that failed have no output
+                )
+            except (OSError, subprocess.SubprocessError) as err:
+                return {path: ConversionError(str(err)) for path in group.values()}
+            results = {}
+            for stem, path in group.items():
+                try:
+                    with open(os.path.join(tempdir, stem + ".docx"), "rb") as infile:
+                        results[path] = infile.read()
+                except OSError:
+                    results[path] = ConversionError(
+                        "LibreOffice did not convert %s" % path
+                    )
+            return results
+
+    def close(self):
+        """Stop any listener & remove the profile."""
+        self.stop_listener()
+        shutil.rmtree(self.profile, ignore_errors=True)
+
+
+class FakeConverter(Converter):
+    """
+    Converter for tests, returns the document, or fixed data, unchanged.
+
+    Counts the converters started, the batches & the conversions done so
+    that the pooling can be checked.
+    """
+
+    started = 0
+    batches = 0
+    conversions = 0
+
+    def __init__(self, data=None):
+        """Initialise, with the data to return for every document."""
+        self.data = data
+        FakeConverter.started += 1
+
+    def convert(self, path):
+        """Return the data or the contents of the document."""
+        FakeConverter.conversions += 1
+        if self.data is not None:
+            return self.data
+        with open(path, "rb") as infile:
+            return infile.read()
+
+    def convert_batch(self, paths):
+        """Convert the documents, counting the batch."""
+        FakeConverter.batches += 1
+        return super().convert_batch(paths)
+
+
+CONVERTERS = {
+    "word": WordConverter,
+    "soffice": SOfficeConverter,
+    "fake": FakeConverter,
+}
+
+
+class ConverterPool(object):
+    """
+    Pool of long lived worker threads, each owning a converter that is
+    started by the first conversion it does & closed when the pool is.
+    """
+
+    def __init__(self, factory, size=1):
+        """Initialise with a callable to make a converter & the number of workers."""
+        self.factory = factory
+        self.size = size
+        self.jobs = queue.Queue()
+        self.workers = []
+        self.lock = threading.Lock()
+
+    def next_batch(self):
+        """
+        Wait for a job then take up to BATCH_MAX of those queued, None once
+        told to stop.
+        """
+        job = self.jobs.get()
+        if job is None:
+            return None
+        batch = [job]
+        while len(batch) < BATCH_MAX:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:  # Stop after this batch
+                self.jobs.put(None)
+                break
+            batch.append(job)
+        return batch
+
+    def work(self):
+        """Convert the batches of documents from the job queue until told to stop."""
+        converter = None
+        try:
+            while True:
+                batch = self.next_batch()
+                if batch is None:
+                    break
+                batch = [
+                    (future, path)
+                    for future, path in batch
+                    if future.set_running_or_notify_cancel()
+                ]
+                if not batch:
+                    continue
+                try:
+                    if converter is None:
+                        converter = self.factory()
+                    results = converter.convert_batch([path for dummy, path in batch])
+                except Exception as err:
+                    # COM & converter specific errors are passed to the caller
+                    if not isinstance(err, ConversionError):
+                        err = ConversionError(str(err))
+                    results = [err] * len(batch)
+                for (future, dummy), result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        finally:
+            if converter is not None:
+                converter.close()
+
+    def start_workers(self):
+        """Start the workers, up to the pool size."""
+        with self.lock:
+            while len(self.workers) < self.size:
+                worker = threading.Thread(target=self.work, daemon=True)
+                worker.start()
+                self.workers.append(worker)
+
+    def submit(self, path):
+        """Queue a document for conversion, returns a Future for the bytes."""
+        return self.submit_many([path])[0]
+
+    def submit_many(self, paths):
+        """
+        Queue documents for conversion together, so that they are converted
+        in batches, returns a Future for the bytes of each.
+        """
+        futures = []
+        for path in paths:
+            future = concurrent.futures.Future()
+            self.jobs.put((future, path))
+            futures.append(future)
+        self.start_workers()
+        return futures
+
+    def convert(self, path):
+        """Convert a document, returning the .docx contents as bytes."""
+        return self.submit(path).result()
+
+    def close(self):
+        """Stop the workers, closing their converters."""
+        with self.lock:
+            workers = self.workers
+            self.workers = []
+        for dummy in workers:
+            self.jobs.put(None)
+        for worker in workers:
+            worker.join()
+
+
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+# Futures for the documents queued by prefetch, by absolute path.
+_PREFETCHED = {}
+
+
+def get_converter_name(options):
+    """Get the name of the converter to use, or None if there isn't one."""
+    name = getattr(options, "converter", "auto") or "auto"
+    if name != "auto":
+        return name
+    if sys.platform == "win32":
+        return "word"
+    if shutil.which("soffice") or shutil.which("libreoffice"):
+        return "soffice"
+    return None
+
+
+def get_pool(name):
+    """Get the, shared, pool for a converter name."""
+    with _POOLS_LOCK:
+        if name not in _POOLS:
+            _POOLS[name] = ConverterPool(CONVERTERS[name])
+        return _POOLS[name]
+
+
+@atexit.register
+def close_pools():
+    """Close all of the converter pools."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+        _PREFETCHED.clear()
+    for pool in pools:
+        pool.close()
+
+
+def prefetch(paths, options):
+    """
+    Queue documents for conversion together, so that the converter selected
+    by the options gets them in batches, for convert_to_docx to collect.
+    """
+    name = get_converter_name(options)
+    if name is None or not paths:
+        return
+    futures = get_pool(name).submit_many(paths)
+    with _POOLS_LOCK:
+        _PREFETCHED.update(zip([os.path.abspath(path) for path in paths], futures))
+
+
+def convert_to_docx(path, options):
+    """
+    Convert a document to .docx with the converter selected by the options,
+    or collect its prefetched conversion, returns the contents as bytes or
+    raises ConversionError.
+    """
+    with _POOLS_LOCK:
+        future = _PREFETCHED.pop(os.path.abspath(path), None)
+    if future is None:
+        name = get_converter_name(options)
+        if name is None:
+            raise ConversionError("No converter available")
+        future = get_pool(name).submit(path)
+    with profile_utils.stage("convert"):
+        return future.result()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,554 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Read the text of Word 97-2003 .doc files without Word.
+  Created: 18/10/2026
+
+A .doc file is an OLE2 compound file, (a FAT file system in a file), whose
+WordDocument stream starts with the File Information Block, (FIB). The FIB
+gives the location of the piece table, in the 0Table or 1Table stream, that
+maps character positions to runs of 8 bit, (cp1252), or UTF-16 text in the
+WordDocument stream. See [MS-CFB] & [MS-DOC] for the details.
+
+Only the main document text is read, as for .docx files, the paragraphs end
+with \\r and table cells and rows with \\x07. Which paragraphs are in tables,
+and which end table rows, is given by the paragraph properties, (PAPX), in
+the PapxFkp pages of the WordDocument stream, found through the PlcBtePapx.
+"""
+from __future__ import (
+    print_function,
+)
+
+import re
+import sys
+import struct
+import bisect
+
+try:
+    import docx2utils
+    import profile_utils
+    import doc_source
+except ImportError:
+    from gloss_check import docx2utils
+    from gloss_check import profile_utils
+    from gloss_check import doc_source
+
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+MAX_REGSECT = 0xFFFFFFFA
+NOSTREAM = 0xFFFFFFFF
+STREAM_OBJECT = 2
+ROOT_OBJECT = 5
+DIR_ENTRY_SIZE = 128
+
+WORD_IDENT = 0xA5EC
+MIN_NFIB = 0xC0  # Earlier versions are Word 6/95 with a different FIB
+F_ENCRYPTED = 0x0100
+F_WHICH_TBL_STM = 0x0200
+FC_CLX_INDEX = 33  # Index of fcClx/lcbClx in FibRgFcLcb97
+FC_PLCF_BTE_PAPX_INDEX = 13  # Index of fcPlcfBtePapx/lcbPlcfBtePapx
+CCP_TEXT_INDEX = 3  # Index of ccpText in FibRgLw97
+F_COMPRESSED = 0x40000000
+FKP_SIZE = 512
+BX_PAP_SIZE = 13
+PN_MASK = 0x3FFFFF
+
+# Paragraph property modifiers, (sprms), that place paragraphs in tables
+SPRM_PF_IN_TABLE = 0x2416
+SPRM_PF_TTP = 0x2417
+SPRM_P_ITAP = 0x6649
+# Variable length sprms with a different length field
+SPRM_T_DEF_TABLE = 0xD608
+SPRM_P_CHG_TABS = 0xC615
+# Operand sizes by the spra, (top 3 bits), of a sprm, 6 is variable length
+SPRA_SIZES = {0: 1, 1: 1, 2: 2, 3: 4, 4: 2, 5: 2, 7: 3}
+
+CELL_MARK = "\x07"
+FIELD_MARKS_RE = re.compile("([\x13\x14\x15])")
+MARKS_RE = re.compile("([\r\x07])")
+# Special characters, line/page/column breaks become new lines, non-breaking
+# hyphens plain ones & anchors for pictures, notes etc. are dropped.
+SPECIAL_CHARS = {
+    0x01: None,
+    0x02: None,
+    0x05: None,
+    0x08: None,
+    0x0B: "\n",
+    0x0C: "\n",
+    0x0E: "\n",
+    0x1E: "-",
+    0x1F: None,
+}
+
+
+class DocFormatError(ValueError):
+    """The file is not a Word 97 or later document that can be read."""
+
+
+def read_source(source):
+    """Get the bytes of a document supplied as a path, bytes or file object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    if hasattr(source, "read"):
+        return source.read()
+    with open(source, "rb") as infile:
+        return infile.read()
+
+
+class CompoundFile(object):
+    """Minimal read only OLE2 compound file, enough to get streams by name."""
+
+    def __init__(self, data):
+        """Initialise from the bytes of the file."""
+        if len(data) < 512 or data[:8] != OLE_MAGIC:
+            raise DocFormatError("Not an OLE2 compound file")
+        self.data = data
+        major_version = struct.unpack_from("<H", data, 0x1A)[0]
+        sector_shift, mini_shift = struct.unpack_from("<HH", data, 0x1E)
+        if sector_shift not in (9, 12) or mini_shift != 6:
+            raise DocFormatError("Unsupported sector size")
+        self.sector_size = 1 << sector_shift
+        self.mini_size = 1 << mini_shift
+        (
+            num_fat,
+            first_dir,
+            dummy_transaction,
+            self.mini_cutoff,
+            first_minifat,
+            dummy_num_minifat,
+            first_difat,
+            num_difat,
+        ) = struct.unpack_from("<IIIIIIII", data, 0x2C)
+        self.large_sizes = major_version >= 4
+        # The first 109 FAT sectors are in the header & the rest in the DIFAT
+        fat_sectors = list(struct.unpack_from("<109I", data, 0x4C))
+        difat_sector = first_difat
+        for dummy in range(num_difat):
+            if difat_sector >= MAX_REGSECT:
+                break
+            entries = self.unpack_sector(difat_sector)
+            fat_sectors.extend(entries[:-1])
+            difat_sector = entries[-1]
+        self.fat = []
+        for sector in fat_sectors[:num_fat]:
+            if sector < MAX_REGSECT:
+                self.fat.extend(self.unpack_sector(sector))
+        self.minifat = []
+        if first_minifat < MAX_REGSECT:
+            minifat_data = self.read_chain(first_minifat)
+            self.minifat = struct.unpack(
+                "<%dI" % (len(minifat_data) // 4), minifat_data
+            )
+        self.entries = self.read_directory(self.read_chain(first_dir))
+        self.root = self.entries[0]
+        if self.root["type"] != ROOT_OBJECT:
+            raise DocFormatError("No root entry in compound file")
+        self.ministream = None
+
+    def sector(self, number):
+        """Get the bytes of a sector."""
+        start = (number + 1) * self.sector_size
+        if number >= MAX_REGSECT or start + self.sector_size > len(self.data):
+            raise DocFormatError("Sector %d is outside of the file" % number)
+        return self.data[start : start + self.sector_size]
+
+    def unpack_sector(self, number):
+        """Get a sector as a list of 32 bit numbers."""
+        return list(
+            struct.unpack("<%dI" % (self.sector_size // 4), self.sector(number))
+        )
+
+    @staticmethod
+    def chain(start, fat):
+        """Get the list of sectors in a chain, from the start & allocation table."""
+        sectors = []
+        sector = start
+        while sector < MAX_REGSECT:
+            if sector >= len(fat) or len(sectors) > len(fat):
+                raise DocFormatError("Broken sector chain")
+            sectors.append(sector)
+            sector = fat[sector]
+        return sectors
+
+    def read_chain(self, start, size=None):
+        """Read a chain of sectors."""
+        data = b"".join([self.sector(sec) for sec in self.chain(start, self.fat)])
+        return data if size is None else data[:size]
+
+    def read_mini_chain(self, start, size):
+        """Read a chain of mini sectors from the mini stream."""
+        if self.ministream is None:
+            self.ministream = self.read_chain(self.root["start"], self.root["size"])
+        data = b"".join(
+            [
+                self.ministream[sec * self.mini_size : (sec + 1) * self.mini_size]
+                for sec in self.chain(start, self.minifat)
+            ]
+        )
+        return data[:size]
+
+    def read_directory(self, data):
+        """Parse the directory entries."""
+        entries = []
+        for offset in range(0, len(data) - DIR_ENTRY_SIZE + 1, DIR_ENTRY_SIZE):
+            name_len, obj_type = struct.unpack_from("<HB", data, offset + 64)
+            left, right, child = struct.unpack_from("<III", data, offset + 68)
+            start, size = struct.unpack_from("<IQ", data, offset + 116)
+            if not self.large_sizes:  # High part of the size may be garbage
+                size &= 0xFFFFFFFF
+            entries.append(
+                {
+                    "name": data[offset : offset + max(name_len - 2, 0)].decode(
+                        "utf-16-le", errors="replace"
+                    ),
+                    "type": obj_type,
+                    "left": left,
+                    "right": right,
+                    "child": child,
+                    "start": start,
+                    "size": size,
+                }
+            )
+        return entries
+
+    def root_streams(self):
+        """Get the streams in the root storage as a dictionary by name."""
+        streams = {}
+        seen = set()
+        todo = [self.root["child"]]
+        while todo:
+            index = todo.pop()
+            if index == NOSTREAM or index >= len(self.entries) or index in seen:
+                continue
+            seen.add(index)
+            entry = self.entries[index]
+            if entry["type"] == STREAM_OBJECT:
+                streams[entry["name"].lower()] = entry
+            todo.extend([entry["left"], entry["right"]])
+        return streams
+
+    def open_stream(self, name):
+        """Get the bytes of a stream in the root storage."""
+        entry = self.root_streams().get(name.lower())
+        if entry is None:
+            raise DocFormatError("No %s stream" % name)
+        if entry["size"] < self.mini_cutoff:
+            return self.read_mini_chain(entry["start"], entry["size"])
+        return self.read_chain(entry["start"], entry["size"])
+
+
+def get_pieces(clx):
+    """Get the piece table, (cp_start, cp_end, fc, compressed), from a Clx."""
+    pos = 0
+    while pos < len(clx) and clx[pos] == 1:  # Skip any property modifiers, Prc
+        pos += 3 + struct.unpack_from("<H", clx, pos + 1)[0]
+    if pos + 5 > len(clx) or clx[pos] != 2:
+        raise DocFormatError("No piece table")
+    lcb = struct.unpack_from("<I", clx, pos + 1)[0]
+    plc = clx[pos + 5 : pos + 5 + lcb]
+    count = (len(plc) - 4) // 12
+    cps = struct.unpack_from("<%dI" % (count + 1), plc, 0)
+    pieces = []
+    for index in range(count):
+        fc_value = struct.unpack_from("<I", plc, (count + 1) * 4 + index * 8 + 2)[0]
+        pieces.append(
+            (
+                cps[index],
+                cps[index + 1],
+                fc_value & ~F_COMPRESSED,
+                bool(fc_value & F_COMPRESSED),
+            )
+        )
+    return pieces
+
+
+def iter_sprms(grpprl):
+    """Yield the (sprm, operand) property modifiers in a grpprl."""
+    pos = 0
+    while pos + 2 <= len(grpprl):
+        sprm = struct.unpack_from("<H", grpprl, pos)[0]
+        pos += 2
+        spra = sprm >> 13
+        if spra != 6:
+            size = SPRA_SIZES[spra]
+        elif sprm == SPRM_T_DEF_TABLE:
+            size = 1 + struct.unpack_from("<H", grpprl, pos)[0]
+        elif sprm == SPRM_P_CHG_TABS and grpprl[pos] == 255:
+            return  # Complex tab changes, nothing we need follows
+        else:
+            size = 1 + grpprl[pos]
+        yield sprm, grpprl[pos : pos + size]
+        pos += size
+
+
+def table_props(grpprl):
+    """Get if a paragraph is in a table & if it ends a table row from its sprms."""
+    in_table = row_end = False
+    for sprm, operand in iter_sprms(grpprl):
+        if sprm == SPRM_PF_IN_TABLE:
+            in_table = operand[0] != 0
+        elif sprm == SPRM_PF_TTP:
+            row_end = operand[0] != 0
+        elif sprm == SPRM_P_ITAP:
+            in_table = struct.unpack("<i", operand)[0] > 0
+    return in_table, row_end
+
+
+def read_papx_fkp(page):
+    """Get the (fc_start, fc_end, grpprl) of each paragraph in a PapxFkp."""
+    crun = page[FKP_SIZE - 1]
+    fcs = struct.unpack_from("<%dI" % (crun + 1), page, 0)
+    runs = []
+    for index in range(crun):
+        offset = 2 * page[(crun + 1) * 4 + index * BX_PAP_SIZE]
+        grpprl = b""
+        if offset:  # Otherwise the paragraph has the default properties
+            if page[offset]:
+                start, size = offset + 1, 2 * page[offset] - 1
+            else:
+                start, size = offset + 2, 2 * page[offset + 1]
+            grpprl = page[start + 2 : start + size]  # After the style, istd
+        runs.append((fcs[index], fcs[index + 1], grpprl))
+    return runs
+
+
+class WordDocument(object):
+    """The text & paragraph properties of the main document of a .doc file."""
+
+    def __init__(self, ole):
+        """Initialise from the streams of a compound file."""
+        self.word = ole.open_stream("WordDocument")
+        word = self.word
+        if len(word) < 0x22:
+            raise DocFormatError("WordDocument stream too short")
+        ident, nfib = struct.unpack_from("<HH", word, 0)
+        flags = struct.unpack_from("<H", word, 0x0A)[0]
+        if ident != WORD_IDENT:
+            raise DocFormatError("Not a Word document")
+        if nfib < MIN_NFIB:
+            raise DocFormatError("Word 6/95 format document")
+        if flags & F_ENCRYPTED:
+            raise DocFormatError("Encrypted document")
+        self.table = ole.open_stream("1Table" if flags & F_WHICH_TBL_STM else "0Table")
+        # The variable length parts of the FIB each start with their length
+        pos = 32
+        csw = struct.unpack_from("<H", word, pos)[0]
+        pos += 2 + csw * 2
+        cslw = struct.unpack_from("<H", word, pos)[0]
+        rglw = pos + 2
+        pos += 2 + cslw * 4
+        cb_rg_fc_lcb = struct.unpack_from("<H", word, pos)[0]
+        if cslw <= CCP_TEXT_INDEX or cb_rg_fc_lcb <= FC_CLX_INDEX:
+            raise DocFormatError("Unexpected FIB layout")
+        self.rg_fc_lcb = pos + 2
+        self.ccp_text = struct.unpack_from("<i", word, rglw + CCP_TEXT_INDEX * 4)[0]
+        self.pieces = get_pieces(self.fib_data(FC_CLX_INDEX))
+        self.runs = None
+        self.run_starts = None
+
+    def fib_data(self, index):
+        """Get the data in the table stream given by an fc/lcb pair of the FIB."""
+        fc_value, lcb = struct.unpack_from("<II", self.word, self.rg_fc_lcb + index * 8)
+        return self.table[fc_value : fc_value + lcb]
+
+    def text(self):
+        """Get the raw main document text."""
+        texts = []
+        for cp_start, cp_end, fc_start, compressed in self.pieces:
+            cp_end = min(cp_end, self.ccp_text)
+            if cp_start >= cp_end:
+                continue
+            start = self.fc_of_cp(cp_start)
+            if compressed:
+                texts.append(
+                    self.word[start : start + cp_end - cp_start].decode(
+                        "cp1252", "replace"
+                    )
+                )
+            else:
+                texts.append(
+                    self.word[start : start + 2 * (cp_end - cp_start)].decode(
+                        "utf-16-le", "replace"
+                    )
+                )
+        return "".join(texts)
+
+    def fc_of_cp(self, cp_value):
+        """Get the offset in the WordDocument stream of a character position."""
+        for cp_start, cp_end, fc_start, compressed in self.pieces:
+            if cp_start <= cp_value < cp_end:
+                if compressed:
+                    return fc_start // 2 + cp_value - cp_start
+                return fc_start + 2 * (cp_value - cp_start)
+        return None
+
+    def read_runs(self):
+        """Read the paragraph runs from all of the PapxFkp pages, in order."""
+        plc = self.fib_data(FC_PLCF_BTE_PAPX_INDEX)
+        count = (len(plc) - 4) // 8
+        runs = []
+        for number in range(count):
+            page_number = struct.unpack_from("<I", plc, (count + 1) * 4 + number * 4)
+            start = (page_number[0] & PN_MASK) * FKP_SIZE
+            page = self.word[start : start + FKP_SIZE]
+            if len(page) < FKP_SIZE:
+                raise DocFormatError("Paragraph properties outside of the file")
+            runs.extend(read_papx_fkp(page))
+        runs.sort()
+        self.runs = runs
+        self.run_starts = [run[0] for run in runs]
+
+    def table_props(self, cp_value):
+        """
+        Get if the paragraph ending at a character position is in a table &
+        if it ends a table row.
+        """
+        if self.runs is None:
+            self.read_runs()
+        fc_value = self.fc_of_cp(cp_value)
+        if fc_value is None:
+            return False, False
+        index = bisect.bisect_right(self.run_starts, fc_value) - 1
+        if index < 0 or fc_value >= self.runs[index][1]:
+            return False, False
+        return table_props(self.runs[index][2])
+
+
+def read_document(source):
+    """
+    Get the WordDocument for a Word 97 or later .doc file, supplied as a
+    path, bytes or file object.
+    """
+    return WordDocument(CompoundFile(read_source(source)))
+
+
+def is_readable(source):
+    """Check if a .doc file can be read directly, otherwise it needs converting."""
+    try:
+        read_document(source)
+    except (DocFormatError, struct.error, IndexError, OSError):
+        return False
+    return True
+
+
+def get_doc_text(source):
+    """
+    Get the raw main document text of a Word 97 or later .doc file, supplied
+    as a path, bytes or file object.
+
+    Reads past the end of a truncated header, FIB or table raise
+    DocFormatError so that the caller can fall back to a converter.
+    """
+    try:
+        return read_document(source).text()
+    except (struct.error, IndexError) as err:
+        raise DocFormatError("Truncated or corrupt document: %s" % err)
+
+
+def strip_fields(text, in_code=None):
+    """
+    Remove field codes, keeping the field results, and special characters.
+
+    in_code is a list, for each open field, of if we are still in its code,
+    so that text can be stripped a paragraph at a time.
+    """
+    kept = []
+    if in_code is None:
+        in_code = []
+    for part in FIELD_MARKS_RE.split(text):
+        if part == "\x13":
+            in_code.append(True)
+        elif part == "\x14":
+            if in_code:
+                in_code[-1] = False
+        elif part == "\x15":
+            if in_code:
+                in_code.pop()
+        elif not any(in_code):
+            kept.append(part)
+    return "".join(kept).translate(SPECIAL_CHARS)
+
+
+def rows_to_columns(rows):
+    """Convert the rows of a table to a list of columns as in a DocModel."""
+    columns = []
+    for row_no, row in enumerate(rows):
+        for col_no, cell in enumerate(row):
+            if col_no >= len(columns):  # Ragged tables may gain columns
+                columns.append([""] * row_no)
+            columns[col_no].append(cell)
+        for column in columns[len(row) :]:
+            column.append("")
+    return columns
+
+
+def get_doc97_model(source):
+    """
+    Get a DocModel for a .doc file.
+
+    The paragraphs in tables, and those that end table rows, are found from
+    their properties. A cell ends with \\x07, the text of its paragraphs is
+    joined by new lines, as for .docx, and the row with an extra \\x07 in a
+    paragraph of its own. Nested tables are included in the text of their
+    cells and paragraph property changes in the piece table of documents
+    that were fast saved are ignored.
+    """
+    try:
+        document = read_document(source)
+        text = document.text()
+        paragraphs = []
+        tables = []
+        rows = []
+        row = []
+        cell = []
+        in_code = []
+        cp_value = 0
+        parts = MARKS_RE.split(text)
+        for piece, mark in zip(parts[0::2], parts[1::2] + [None]):
+            cp_value += len(piece)
+            in_table, row_end = (False, False)
+            if mark is not None:
+                in_table, row_end = document.table_props(cp_value)
+                cp_value += 1
+            piece = strip_fields(piece, in_code)
+            if row_end:
+                rows.append(row)
+                row = []
+                cell = []
+            elif in_table:
+                cell.append(piece)
+                if mark == CELL_MARK:
+                    row.append("\n".join(cell))
+                    cell = []
+            else:  # A paragraph, so any table has ended
+                if row:  # Without its row end
+                    rows.append(row)
+                    row = []
+                if rows:
+                    tables.append(rows_to_columns(rows))
+                    rows = []
+                paragraphs.append(piece)
+        if row:
+            rows.append(row)
+        if rows:
+            tables.append(rows_to_columns(rows))
+    except (struct.error, IndexError) as err:
+        raise DocFormatError("Truncated or corrupt document: %s" % err)
+    return docx2utils.DocModel(paragraphs, tables)
+
+
+def get_doc97_wordlist(path, options):
+    """
+    Read a .doc file directly to get the word list.
+    """
+    if not doc_source.doc_extension(path) == ".doc":
+        return False, [], []
+    with profile_utils.stage("parse"):
+        model = get_doc97_model(doc_source.open_source(path))
+    return docx2utils.get_model_wordlist(model, options)
+
+
+if __name__ == "__main__":
+    for NAME in sys.argv[1:]:
+        print(NAME)
+        print(get_doc97_model(NAME))
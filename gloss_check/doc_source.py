@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Documents that are not files, members of .zip bundles & stdin.
+  Created: 18/10/2026
+
+Documents are named by strings throughout the checker, as well as paths
+these can be:
+
+    bundle.zip!folder/report.docx - a member of a .zip archive
+    -                             - the bytes read from stdin
+
+The extractors read these from memory with open_source() rather than
+extracting them to disk.
+"""
+from __future__ import (
+    print_function,
+)
+
+import io
+import os
+import re
+import sys
+import fnmatch
+import hashlib
+import zipfile
+import tempfile
+import contextlib
+
+STDIN_NAME = "-"
+MEMBER_RE = re.compile(r"^(.*?\.zip)!(.+)$", re.IGNORECASE)
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+ZIP_MAGIC = b"PK\x03\x04"
+
+_STDIN = {}
+# The most recently read member, as its bytes are often needed twice, to
+# hash them for the cache & then to extract the words.
+_LAST_READ = {}
+
+
+def split_member(name):
+    """Split an archive member name into (archive, member), None if not one."""
+    match = MEMBER_RE.match(name)
+    if match is None:
+        return None
+    return match.group(1), match.group(2)
+
+
+def is_virtual(name):
+    """Check if a document is a member of an archive or stdin."""
+    return name == STDIN_NAME or split_member(name) is not None
+
+
+def is_archive(path):
+    """Check if a file is a .zip bundle of documents."""
+    return path.lower().endswith(".zip") and os.path.isfile(path)
+
+
+def archive_members(path, include):
+    """Get the names of the documents in an archive that match include."""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            members = archive.namelist()
+    except (OSError, zipfile.BadZipFile) as err:
+        print("Unable to read archive %s: %s" % (path, err))
+        return []
+    return [
+        "%s!%s" % (path, member)
+        for member in members
+        if not member.endswith("/")
+        and not member.startswith("__MACOSX/")
+        and any(fnmatch.fnmatch(member.rsplit("/", 1)[-1], pat) for pat in include)
+    ]
+
+
+def has_member(name):
+    """Check if an archive member name is the name of a member in its archive."""
+    archive_path, member = split_member(name)
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            archive.getinfo(member)
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return False
+    return True
+
+
+def set_stdin(data):
+    """Set the stdin bytes, for worker processes that can't read stdin."""
+    _STDIN[STDIN_NAME] = data
+
+
+def get_stdin():
+    """Get the bytes from stdin, only read once."""
+    if STDIN_NAME not in _STDIN:
+        _STDIN[STDIN_NAME] = sys.stdin.buffer.read()
+    return _STDIN[STDIN_NAME]
+
+
+def read_bytes(name):
+    """Get the contents of a document."""
+    if name == STDIN_NAME:
+        return get_stdin()
+    if _LAST_READ.get("name") == name:
+        return _LAST_READ["data"]
+    parts = split_member(name)
+    if parts is None:
+        with open(name, "rb") as infile:
+            return infile.read()
+    archive_path, member = parts
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            data = archive.read(member)
+    except (KeyError, zipfile.BadZipFile) as err:
+        raise OSError("Unable to read %s: %s" % (name, err))
+    _LAST_READ.update(name=name, data=data)
+    return data
+
+
+def open_source(name):
+    """Get something the extractors can read, the path or a file object."""
+    if is_virtual(name):
+        return io.BytesIO(read_bytes(name))
+    return name
+
+
+def doc_extension(name):
+    """Get the lower case extension of a document, stdin is sniffed."""
+    if name == STDIN_NAME:
+        header = get_stdin()[:8]
+        if header == OLE_MAGIC:
+            return ".doc"
+        if header.startswith(ZIP_MAGIC):
+            return ".docx"
+        return ""
+    return os.path.splitext(name)[-1].lower()
+
+
+def content_hash(name):
+    """Get the sha256 hash of the contents of a document that isn't a file."""
+    return hashlib.sha256(read_bytes(name)).hexdigest()
+
+
+def real_path(name):
+    """Get the file that holds a document, None for stdin."""
+    if name == STDIN_NAME:
+        return None
+    parts = split_member(name)
+    return name if parts is None else parts[0]
+
+
+@contextlib.contextmanager
+def local_copy(name):
+    """Get a path to a document, writing a temporary copy if it isn't a file."""
+    if not is_virtual(name):
+        yield name
+        return
+    with tempfile.TemporaryDirectory(prefix="gloss_check_") as tempdir:
+        path = os.path.join(tempdir, "document" + doc_extension(name))
+        with open(path, "wb") as outfile:
+            outfile.write(read_bytes(name))
+        yield path
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Find the documents to check, walking directory trees lazily.
+  Created: 18/10/2026
+
+Directories are walked with os.scandir, yielding each document as it is
+found, so that checking can start before the walk finishes. A .glossignore
+file in any directory gives glob patterns, one per line, for files &
+directories to skip below that directory:
+
+    # Comment
+    *_draft.docx    - matched against the name
+    archive/        - a trailing / only matches directories
+    old/*.doc       - patterns with a / are matched against the path
+                      relative to the directory of the .glossignore
+    !keep.docx      - a leading ! includes again something ignored earlier
+
+Files & directories are only visited once, however they are reached, by
+tracking their device & inode, so symbolic link loops are safe.
+"""
+from __future__ import (
+    print_function,
+)
+
+import os
+import sys
+import glob
+import fnmatch
+
+try:
+    import doc_source
+except ImportError:
+    from gloss_check import doc_source
+
+IGNORE_FILE = ".glossignore"
+DOC_INCLUDE = ["*.docx", "*.doc"]
+DEFAULT_INCLUDE = DOC_INCLUDE + ["*.zip"]
+
+
+def read_ignore_file(dirpath):
+    """Read the ignore rules, (pattern, negate, dir_only), from a directory."""
+    rules = []
+    try:
+        with open(os.path.join(dirpath, IGNORE_FILE), "rt", encoding="utf-8") as infile:
+            lines = infile.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return rules
+    for line in lines:
+        pattern = line.strip()
+        if not pattern or pattern.startswith("#"):
+            continue
+        negate = pattern.startswith("!")
+        pattern = pattern.lstrip("!")
+        dir_only = pattern.endswith("/")
+        rules.append((pattern.strip("/"), negate, dir_only))
+    return rules
+
+
+def is_ignored(path, is_dir, ignore_rules):
+    """
+    Check a path against the ignore rules that apply to it, a list of
+    (base directory, rules), the last rule that matches decides.
+    """
+    ignored = False
+    for base, rules in ignore_rules:
+        relpath = os.path.relpath(path, base).replace(os.sep, "/")
+        name = os.path.basename(path)
+        for pattern, negate, dir_only in rules:
+            if dir_only and not is_dir:
+                continue
+            target = relpath if "/" in pattern else name
+            if fnmatch.fnmatch(target, pattern):
+                ignored = not negate
+    return ignored
+
+
+def file_id(path, entry=None):
+    """The identity of a file, following links, None if it can't be read."""
+    try:
+        stat = entry.stat() if entry is not None else os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino)
+
+
+def matches(name, patterns):
+    """Check if a name matches any of the glob patterns."""
+    return any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+
+
+def walk_docs(top, include=None, exclude=None, seen=None):
+    """
+    Yield the documents below a directory, in name order, as they are found.
+
+    Params:
+        include: Glob patterns for the file names to yield.
+        exclude: Glob patterns for file & directory names to skip.
+        seen: Set of the identities of the files & directories already
+            visited, shared between walks to avoid duplicates.
+    """
+    include = include or DEFAULT_INCLUDE
+    exclude = exclude or []
+    seen = set() if seen is None else seen
+    top_id = file_id(top)
+    if top_id is None or top_id in seen:
+        return
+    seen.add(top_id)
+    # Stack of (directory, ignore rules that apply to it).
+    todo = [(top, [])]
+    while todo:
+        dirpath, ignore_rules = todo.pop()
+        rules = read_ignore_file(dirpath)
+        if rules:
+            ignore_rules = ignore_rules + [(dirpath, rules)]
+        try:
+            with os.scandir(dirpath) as scan:
+                entries = sorted(scan, key=lambda entry: entry.name)
+        except OSError as err:
+            print("Unable to read directory:", err)
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.name == IGNORE_FILE or matches(entry.name, exclude):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_ignored(entry.path, is_dir, ignore_rules):
+                continue
+            if not is_dir and not matches(entry.name, include):
+                continue
+            entry_id = file_id(entry.path, entry)
+            if entry_id is None or entry_id in seen:
+                continue
+            seen.add(entry_id)
+            if is_dir:
+                subdirs.append((entry.path, ignore_rules))
+            else:
+                yield entry.path
+        todo.extend(reversed(subdirs))  # So that they are popped in order
+
+
+def iter_files(arg, recursive=False, include=None, exclude=None, seen=None):
+    """
+    Yield the files for a command line argument, a file, directory or
+    wildcard, skipping any already in seen.
+    """
+    if os.path.isfile(arg):
+        names = [arg]
+    else:
+        names = sorted(glob.iglob(arg, recursive=recursive))
+    for name in names:
+        if os.path.isdir(name):
+            if recursive:
+                for path in walk_docs(name, include, exclude, seen):
+                    yield path
+        elif os.path.isfile(name):
+            name_id = file_id(name)
+            if name_id is None:
+                yield name
+            elif name_id not in seen:
+                seen.add(name_id)
+                yield name
+
+
+def iter_arg_docs(arg, recursive=False, include=None, exclude=None, seen=None):
+    """
+    Yield the documents for a command line argument, as iter_files but with
+    .zip bundles replaced by the documents in them, bundle.zip!member for a
+    single member & - for stdin.
+    """
+    seen = set() if seen is None else seen
+    if arg == doc_source.STDIN_NAME:
+        yield arg
+        return
+    parts = doc_source.split_member(arg)
+    if parts is not None and not os.path.exists(arg):
+        if doc_source.is_archive(parts[0]) and doc_source.has_member(arg):
+            yield arg
+        return
+    member_include = [
+        pattern
+        for pattern in include or DOC_INCLUDE
+        if not pattern.lower().endswith(".zip")
+    ]
+    for path in iter_files(arg, recursive, include, exclude, seen):
+        if doc_source.is_archive(path):
+            for name in doc_source.archive_members(path, member_include):
+                yield name
+        else:
+            yield path
+
+
+if __name__ == "__main__":
+    for NAME in iter_arg_docs(sys.argv[1], recursive=True):
+        print(NAME)
@@ -9,47 +9,167 @@ from __future__ import (
     print_function,
 )
 
-import os
-
-try:
-    import docx
-except ImportError:
-    docx = None
+import io
+import collections
+from collections import namedtuple
 
 try:
     import text_utls
+    import lazy_utils
+    import profile_utils
+    import doc_source
+    import xmltree_utils
+    import position_index
+    import inline_defs
 except ImportError:
     from gloss_check import text_utls
+    from gloss_check import lazy_utils
+    from gloss_check import profile_utils
+    from gloss_check import doc_source
+    from gloss_check import xmltree_utils
+    from gloss_check import position_index
+    from gloss_check import inline_defs
+
+# Lightweight model of a document, the paragraph texts and for each table a
+# list of columns each of which is a list of the cell texts, plus the
+# paragraph texts of the other parts, headers, footers, etc., by part name.
+DocModel = namedtuple("DocModel", ["paragraphs", "tables", "parts"], defaults=[None])
+
+
+def get_part_texts(document, parts):
+    """
+    Get the paragraph texts of the wanted parts of a python-docx document,
+    read from the parts already loaded with its package.
+    """
+    texts = collections.defaultdict(list)
+    if xmltree_utils.TEXTBOXES in parts:  # python-docx skips the text boxes
+        for box in document.element.body.iter(xmltree_utils.TXBX):
+            if next(box.iterancestors(xmltree_utils.FALLBACK), None) is None:
+                texts[xmltree_utils.TEXTBOXES].extend(
+                    [
+                        xmltree_utils.para_text(para)
+                        for para in box.iter(xmltree_utils.PARA)
+                    ]
+                )
+    members = {
+        str(part.partname).lstrip("/"): part
+        for part in document.part.package.iter_parts()
+    }
+    for part, name in xmltree_utils.find_parts(members, parts):
+        for text, dummy, in_textbox in xmltree_utils.iter_docx_paragraphs(
+            io.BytesIO(members[name].blob)
+        ):
+            if in_textbox:
+                if xmltree_utils.TEXTBOXES in parts:
+                    texts[xmltree_utils.TEXTBOXES].append(text)
+            else:
+                texts[part].append(text)
+    return dict(texts)
+
+
+def get_docx_model(path_or_docx, parts=()):
+    """
+    Parse a document, supplied as a path or docx, into a DocModel once,
+    including the texts of the named parts, see xmltree_utils.PART_NAMES.
+    """
+    if isinstance(path_or_docx, DocModel):
+        return path_or_docx
+    docx = lazy_utils.get_docx()
+    with profile_utils.stage("parse"):
+        if isinstance(path_or_docx, docx.document.Document):
+            document = path_or_docx
+        else:
+            document = docx.Document(path_or_docx)
+        model = DocModel(
+            [p.text for p in document.paragraphs],
+            [
+                xmltree_utils.get_table_grid(table)
+                for table in document.element.body.iterchildren(xmltree_utils.TABLE)
+            ],
+            get_part_texts(document, parts),
+        )
+    profile_utils.count("paragraphs", len(model.paragraphs))
+    profile_utils.count("tables", len(model.tables))
+    return model
 
 
 def get_docx2_wordlist(path, options):
     """
     Use docx to get the word list.
     """
-    if not os.path.splitext(path)[-1].lower() == ".docx":
-        return False, []
-    document = docx.Document(path)
-    assert isinstance(document, docx.document.Document)
+    if not doc_source.doc_extension(path) == ".docx":
+        return False, [], []
+    model = get_docx_model(
+        doc_source.open_source(path), xmltree_utils.enabled_parts(options)
+    )
+    return get_model_wordlist(model, options)
+
+
+def tokenize_texts(texts, options, part, labels=None, definitions=None):
+    """
+    Tokenize the texts joined by newlines, adding them to the position
+    index, if indexing, as the blocks of part with labels and any inline
+    definitions found in the tokens to definitions if not None.
+    """
+    text = "\n".join(texts)
+    index = position_index.current()
+    if index is None and definitions is None:
+        return text_utls.tokenize(text, options)
+    tokens = text_utls.tokenize_offsets(text, options)
+    if index is not None:
+        index.add_texts(part, texts, tokens, labels)
+    if definitions is not None:
+        with profile_utils.stage("inline definitions"):
+            inline_defs.add_definitions(definitions, text, tokens)
+    return [word for word, dummy in tokens]
+
+
+def get_model_wordlist(model, options):
+    """
+    Get the word list & possible glossary entries from a DocModel.
+    """
     ignore_col1 = []
     poss_entries = []
     wordlist = set()
-    texts = [p.text for p in document.paragraphs]
+    texts = model.paragraphs
+    part_words = collections.Counter()
+    definitions = None
+    if getattr(options, "inline_defs", False):
+        definitions = collections.OrderedDict()
     if texts:
-        text = "\n".join(texts)
-        wordlist.update(text_utls.tokenize(text, options))
-    cwordlist = text_utls.clean_wordlist(wordlist, options.min_acc)
+        words = tokenize_texts(
+            texts, options, xmltree_utils.BODY, definitions=definitions
+        )
+        wordlist.update(words)
+        part_words[xmltree_utils.BODY] = len(words)
+    cwordlist = set(text_utls.clean_wordlist(wordlist, options.min_acc))
 
     if options.table_gloss:
-        poss_entries, ignore_col1 = docx_get_table_gloss(path, options=options)
+        with profile_utils.stage("table glossary"):
+            poss_entries, ignore_col1 = docx_get_table_gloss(model, options=options)
     # Get the table text from non-glossary tables
-    non_gloss = [x for x in range(len(document.tables)) if x not in ignore_col1]
-    for word in get_docx_table_text(document, non_gloss, options=options):
-        if word not in cwordlist:
-            cwordlist.append(word)
+    non_gloss = [x for x in range(len(model.tables)) if x not in ignore_col1]
+    cwordlist.update(
+        get_docx_table_text(model, non_gloss, options=options, definitions=definitions)
+    )
     # Then from the other colums of tables
-    for word in get_docx_table_text(document, ignore_col1, excl_col=0, options=options):
-        if word not in cwordlist:
-            cwordlist.append(word)
+    cwordlist.update(
+        get_docx_table_text(
+            model, ignore_col1, excl_col=0, options=options, definitions=definitions
+        )
+    )
+    # And the other parts, after the tables to keep the body together
+    wordlist = set()
+    for part, part_texts in (model.parts or {}).items():
+        words = tokenize_texts(part_texts, options, part, definitions=definitions)
+        wordlist.update(words)
+        part_words[part] += len(words)
+    xmltree_utils.count_part_words(part_words)
+    cwordlist.update(text_utls.clean_wordlist(wordlist, options.min_acc))
+
+    if definitions is not None:
+        inline_defs.show_definitions(definitions)
+        poss_entries.extend(definitions)
 
     return (
         len(cwordlist) > 0,
@@ -69,8 +189,8 @@ def docx_get_table_gloss(path_or_docx, whitelist=None, options=None):
     for tab_index, table in enumerate(tables):
         coltxt = []
         add_msg = None
-        for cell in table.columns[0].cells:
-            coltxt.extend(text_utls.tokenize(cell.text, options))
+        for cell_text in table[0] if table else []:
+            coltxt.extend(text_utls.tokenize(cell_text, options))
         words = list(set(coltxt))
         candidates = text_utls.get_candidates_from_list(
             words, extern_gloss=whitelist, options=options
@@ -82,7 +202,7 @@ def docx_get_table_gloss(path_or_docx, whitelist=None, options=None):
             if coltxt[0].lower().split()[0] in [
                 "abbreviation",
                 "term",
-                "abbrev.",
+                "abbrev",
                 "entry",
             ]:
                 add_msg = "Table %d header keywords %d possible items of %d"
@@ -99,13 +219,14 @@ def docx_get_table_gloss(path_or_docx, whitelist=None, options=None):
 
 
 def docx_table_text_valid_args(path_or_docx, tabno=None, colno=None, excl_col=None):
-    """Deal with possible arguments."""
+    """
+    Deal with possible arguments.
+
+    The tables are returned from the DocModel as lists of column texts.
+    """
     col_nums = None
     ignore = []
-    if isinstance(path_or_docx, docx.document.Document):
-        doc = path_or_docx
-    else:
-        doc = docx.Document(path_or_docx)
+    doc = get_docx_model(path_or_docx)
     if tabno is None:
         tables = doc.tables
     elif isinstance(tabno, int):
@@ -137,30 +258,41 @@ def docx_table_text_valid_args(path_or_docx, tabno=None, colno=None, excl_col=No
 
 
 def get_docx_table_text(
-    path_or_docx, tabno=None, colno=None, excl_col=None, options=None
+    path_or_docx, tabno=None, colno=None, excl_col=None, options=None, definitions=None
 ):
     """
-    Get the text from tables in a document supplied as a path or docx.
+    Get the text from tables in a document supplied as a path, docx or DocModel.
     If tabno is None then all tables, if it is a simple number then that one and
     if it is a list those.
     The same for the columns specified by colno.
+    Any inline definitions in the cells are added to definitions if not None.
     """
     texts = []
+    labels = []  # table:row:column of each cell for the position index
     (tables, col_nums, ignore_cols) = docx_table_text_valid_args(
         path_or_docx, tabno, colno, excl_col
     )
-    for table in tables:
+    if isinstance(tabno, int):
+        table_nos = [tabno]
+    else:
+        table_nos = range(len(tables)) if tabno is None else tabno
+    for table_no, table in zip(table_nos, tables):
         if colno is None:
-            col_nums = range(len(table.columns))
+            col_nums = range(len(table))
         for col_number in col_nums:
             if col_number not in ignore_cols:
-                texts.extend([cell.text for cell in table.columns[col_number].cells])
+                texts.extend(table[col_number])
+                labels.extend(
+                    "%d:%d:%d" % (table_no, row_no, col_number)
+                    for row_no in range(len(table[col_number]))
+                )
     # if close_after:
     # doc.close()
     wordlist = set()
     if texts:
-        text = "\n".join(texts)
-        wordlist.update(text_utls.tokenize(text, options))
+        wordlist.update(
+            tokenize_texts(texts, options, xmltree_utils.BODY, labels, definitions)
+        )
     cwordlist = text_utls.clean_wordlist(wordlist, options.min_acc)
     return cwordlist
 
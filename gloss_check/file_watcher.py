@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Watch documents for changes to their contents.
+  Created: 18/10/2026
+
+Uses inotify on Linux, watching the directories so that editors that save
+by renaming a temporary file are seen, and polls the file stats elsewhere.
+Bursts of events are debounced and a change is only reported if the
+contents hash has changed.
+"""
+from __future__ import (
+    print_function,
+)
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+try:
+    import cache_utils
+except ImportError:
+    from gloss_check import cache_utils
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+IN_EVENT = struct.Struct("iIII")
+
+
+def content_hash(filename):
+    """Hash of the contents of a file, None if it can't be read."""
+    try:
+        return cache_utils.file_hash(filename)
+    except OSError:
+        return None
+
+
+class PollBackend(object):
+    """Report files whose size or modification time has changed."""
+
+    def __init__(self, filenames, interval=2.0):
+        """Initialise with the files to watch & how often to check them."""
+        self.interval = interval
+        self.last_check = time.monotonic()
+        self.stamps = {name: self.stamp(name) for name in filenames}
+
+    @staticmethod
+    def stamp(filename):
+        """The modification time & size of a file."""
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def changed(self):
+        """Get the files that have changed since the last check."""
+        now = time.monotonic()
+        if now - self.last_check < self.interval:
+            return []
+        self.last_check = now
+        changed = []
+        for name, old_stamp in self.stamps.items():
+            new_stamp = self.stamp(name)
+            if new_stamp != old_stamp:
+                self.stamps[name] = new_stamp
+                changed.append(name)
+        return changed
+
+    def wait(self, timeout=None):
+        """Wait until there may be changes."""
+        if timeout is None or timeout > self.interval:
+            timeout = self.interval
+        time.sleep(timeout)
+
+    def close(self):
+        """Nothing to release."""
+
+
+class InotifyBackend(object):
+    """Report files that inotify says have been written to."""
+
+    def __init__(self, filenames):
+        """Initialise, raises OSError if inotify is not available."""
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "No inotify")
+        self.libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watched = {os.path.abspath(name): name for name in filenames}
+        self.dirs = {}
+        mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        for dirname in {os.path.dirname(path) for path in self.watched}:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(dirname), mask)
+            if wd < 0:
+                err = ctypes.get_errno()
+                self.close()
+                raise OSError(err, "inotify_add_watch failed for %s" % dirname)
+            self.dirs[wd] = dirname
+
+    def changed(self):
+        """Get the watched files that have had events."""
+        changed = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, dummy_mask, dummy_cookie, length = IN_EVENT.unpack_from(
+                    data, offset
+                )
+                offset += IN_EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                path = os.path.join(self.dirs.get(wd, ""), os.fsdecode(name))
+                filename = self.watched.get(path)
+                if filename is not None and filename not in changed:
+                    changed.append(filename)
+        return changed
+
+    def wait(self, timeout=None):
+        """Wait until there are events, or the timeout in seconds."""
+        select.select([self.fd], [], [], timeout)
+
+    def close(self):
+        """Release the inotify file descriptor."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def get_backend(filenames, interval=2.0):
+    """Get the best available backend for watching the files."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyBackend(filenames)
+        except OSError:
+            pass
+    return PollBackend(filenames, interval)
+
+
+class FileWatcher(object):
+    """
+    Watch files reporting those whose contents have changed.
+
+    poll() is non-blocking, for use from a GUI timer, & wait() blocks until
+    there are changes. Changes are only reported once the file has been
+    quiet for debounce seconds.
+    """
+
+    def __init__(self, filenames, debounce=0.5, interval=2.0):
+        """Initialise with the files to watch."""
+        self.filenames = list(dict.fromkeys(filenames))
+        self.debounce = debounce
+        self.hashes = {name: content_hash(name) for name in self.filenames}
+        self.pending = {}
+        self.backend = get_backend(self.filenames, interval)
+
+    def poll(self):
+        """Get the files whose contents have changed, without waiting."""
+        now = time.monotonic()
+        for name in self.backend.changed():
+            self.pending[name] = now
+        changed = []
+        for name in self.filenames:
+            if name in self.pending and now - self.pending[name] >= self.debounce:
+                del self.pending[name]
+                new_hash = content_hash(name)
+                if new_hash is not None and new_hash != self.hashes.get(name):
+                    self.hashes[name] = new_hash
+                    changed.append(name)
+        return changed
+
+    def wait(self):
+        """Wait until the contents of one or more files have changed."""
+        while True:
+            changed = self.poll()
+            if changed:
+                return changed
+            self.backend.wait(self.debounce if self.pending else None)
+
+    def close(self):
+        """Stop watching."""
+        self.backend.close()
+
+
+if __name__ == "__main__":
+    WATCHER = FileWatcher(sys.argv[1:])
+    print("Watching with", type(WATCHER.backend).__name__)
+    try:
+        while True:
+            print("Changed:", ", ".join(WATCHER.wait()))
+    except KeyboardInterrupt:
+        WATCHER.close()
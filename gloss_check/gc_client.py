@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Thin client for the checker daemon in gc_server.
+  Created: 18/10/2026
+
+This is imported on every command line run, so only imports urllib once a
+daemon has been found to be listening.
+"""
+from __future__ import (
+    print_function,
+)
+
+import os
+import json
+import socket
+
+try:
+    import gloss_utils
+    import doc_source
+    from version_info import __version__ as VERSION
+except ImportError:
+    from gloss_check import gloss_utils
+    from gloss_check import doc_source
+    from gloss_check.version_info import __version__ as VERSION
+
+# Options that are only meaningful to the command line client.
+CLIENT_ONLY = [
+    "DOCS",
+    "glossary",
+    "serve",
+    "port",
+    "no_daemon",
+    "jobs",
+    "clear_cache",
+    "reset_config",
+    "save_config",
+    "version",
+    "list_langs",
+    "watch",
+    "profile",
+    "profile_cprofile",
+    "format",
+    "recursive",
+    "include_files",
+    "exclude_files",
+    "kwic",
+]
+
+
+def daemon_url(options, path):
+    """Get the URL for a path on the daemon."""
+    return "http://127.0.0.1:%d%s" % (options.port, path)
+
+
+def daemon_running(options, timeout=0.5):
+    """Check for a daemon running the same version on the port."""
+    try:  # Quick check before importing urllib
+        socket.create_connection(("127.0.0.1", options.port), timeout).close()
+    except OSError:
+        return False
+    import urllib.request
+
+    try:
+        with urllib.request.urlopen(
+            daemon_url(options, "/status"), timeout=timeout
+        ) as reply:
+            status = json.load(reply)
+    except (OSError, ValueError):
+        return False
+    return status.get("version") == VERSION
+
+
+def check_remote(options, paths):
+    """Send a check request for paths to the daemon, returns the results."""
+    req_options = {
+        name: value for name, value in vars(options).items() if name not in CLIENT_ONLY
+    }
+    req_options["glossary"] = [
+        os.path.abspath(item if isinstance(item, str) else item.name)
+        for item in options.glossary or []
+    ]
+    import urllib.request
+
+    request = {
+        "paths": [os.path.abspath(path) for path in paths],
+        "options": req_options,
+    }
+    req = urllib.request.Request(
+        daemon_url(options, "/check"),
+        data=json.dumps(request).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(req) as reply:
+        results = json.load(reply)["results"]
+    return {path: results[os.path.abspath(path)] for path in paths}
+
+
+def process_docs_remote(options):
+    """
+    Process the documents using a running daemon.
+
+    Returns False, without processing anything, if no daemon is available.
+    """
+    if (
+        options.no_daemon
+        or options.clear_cache
+        or options.watch
+        or options.profile
+        or options.kwic
+    ):
+        return False  # These need to be done locally
+    if doc_source.STDIN_NAME in options.DOCS:
+        return False  # The daemon can't read our stdin
+    if not daemon_running(options):
+        return False
+    expanded = [
+        (arg, list(filelist)) for arg, filelist in gloss_utils.expand_docs(options)
+    ]
+    paths = sorted({name for dummy_arg, filelist in expanded for name in filelist})
+    try:
+        results = check_remote(options, paths)
+    except (OSError, ValueError, KeyError) as err:
+        print("Daemon request failed, processing locally:", err)
+        return False
+    errors = gloss_utils.report_docs(options, expanded, lambda name: results[name])
+    gloss_utils.finish_docs(options, errors)
+    return True
+
+
+if __name__ == "__main__":
+    pass
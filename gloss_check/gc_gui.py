@@ -10,20 +10,22 @@ from __future__ import (
 )
 
 import sys
-import os
 from collections import namedtuple
 import textwrap
 import time
+import threading
 
 try:
     import text_utls
     import args
     import gloss_utils
+    import file_watcher
     from version_info import __version__ as VERSION
 except ImportError:
     from gloss_check import text_utls
     from gloss_check import args
     from gloss_check import gloss_utils
+    from gloss_check import file_watcher
     from gloss_check.version_info import __version__ as VERSION
 
 
@@ -70,49 +72,63 @@ if GUI_OK:
                 "lang": None,
             }
             self.dropped_files = []
-            self.timestamps = {}
+            self.watcher = None
+            self.changed_files = []
             self.busy = False
+            # Processing is done on a worker thread, each run has an id so
+            # that results from a cancelled run can be ignored.
+            self.run_id = 0
+            self.cancel_event = threading.Event()
+            self.process_lock = threading.Lock()
 
         ##
         def OnDropFiles(self, dummy_x, dummy_y, filenames):
             """
             Action files being dropped
             """
-            self.busy = True
             self.window.clear_text()
             self.window.Refresh()
             self.window.set_insertion_point_end()
             self.window.write_text("\n%d file(s) dropped\n" % (len(filenames)))
             self.dropped_files = filenames
-            self.get_tstamps(filenames)  # Snapshot the time/dates
+            self.watch_files(filenames)
             self.process_files(filenames)
-            self.busy = False
             return 0
 
-        def get_tstamps(self, filenames=None):
+        def watch_files(self, filenames):
+            """Start watching the dropped files for changes."""
+            self.stop_watching()
+            self.watcher = file_watcher.FileWatcher(filenames)
+            self.changed_files = []
+
+        def stop_watching(self):
+            """Stop watching any files."""
+            if self.watcher is not None:
+                self.watcher.close()
+                self.watcher = None
+
+        def check_changes(self):
             """
-            Return the date/time information for the filenames
+            Check for files whose contents have changed, with auto update only
+            those files are re-processed once any run in progress finishes.
             """
-            has_changes = False
-            if filenames:
-                self.timestamps = {}
-                reset = False
-            else:
-                filenames = self.dropped_files
-                reset = True
-            if reset or self.options["autoupdate"]:
-                for name in filenames:
-                    tstamp = os.path.getmtime(name)
-                    has_changes = self.timestamps.get(name, -1) != tstamp
-                    self.timestamps[name] = tstamp
-            return has_changes
+            if self.watcher is None:
+                return
+            for name in self.watcher.poll():
+                if self.options["autoupdate"] and name not in self.changed_files:
+                    self.changed_files.append(name)
+            if self.changed_files and not self.busy:
+                changed = self.changed_files
+                self.changed_files = []
+                self.window.set_insertion_point_end()
+                self.window.write_text("\n\n%d file(s) changed\n" % len(changed))
+                self.process_files(changed)
 
         def reprocess(self):
             """
             Optionally reprocess on a change.
             """
-            if not self.busy and self.options["autoupdate"] and len(self.dropped_files):
-                self.busy = True
+            if self.options["autoupdate"] and len(self.dropped_files):
                 self.window.clear_text()
                 self.window.Refresh()
                 self.window.set_insertion_point_end()
@@ -120,15 +136,62 @@ if GUI_OK:
                     "\nReprocessing %d file(s)\n" % (len(self.dropped_files))
                 )
                 self.process_files(self.dropped_files)
-                self.busy = False
 
         def process_files(self, filenames):
             """
-            Process a list of filenames.
+            Process a list of filenames on a worker thread, cancelling any
+            run in progress, the results are shown as each file finishes.
             """
             t_ops = namedtuple("options", self.options.keys())
             options = t_ops(**self.options)
-            glossary = text_utls.get_glossary(options)
+            self.cancel_event.set()
+            self.cancel_event = threading.Event()
+            self.run_id += 1
+            self.busy = True
+            self.window.start_progress(len(filenames))
+            worker = threading.Thread(
+                target=self.process_worker,
+                args=(self.run_id, filenames, options, self.cancel_event),
+                daemon=True,
+            )
+            worker.start()
+
+        def process_worker(self, run_id, filenames, options, cancel):
+            """
+            Worker thread to process the files, only one run at a time is
+            allowed to use the spell checker & all updates use wx.CallAfter.
+            """
+            with self.process_lock:
+                if cancel.is_set():
+                    return
+                try:
+                    glossary = text_utls.get_glossary(options)
+                    wx.CallAfter(self.show_glossary, run_id, options, glossary)
+                    for index, name in enumerate(filenames):
+                        if cancel.is_set():
+                            break
+                        wx.CallAfter(self.show_start, run_id, name)
+                        try:
+                            result = gloss_utils.get_candidates(
+                                name, extern_gloss=glossary, options=options
+                            )
+                        except Exception as err:  # Report & carry on
+                            wx.CallAfter(self.show_error, run_id, index, err)
+                            continue
+                        wx.CallAfter(self.show_result, run_id, index, options, result)
+                except Exception as err:  # Such as an unreadable glossary
+                    wx.CallAfter(self.show_error, run_id, None, err)
+                finally:
+                    wx.CallAfter(self.finish_run, run_id, cancel.is_set())
+
+        def current_run(self, run_id):
+            """Check that a result is for the current run & the window is open."""
+            return run_id == self.run_id and bool(self.window)
+
+        def show_glossary(self, run_id, options, glossary):
+            """Show the glossary that was read."""
+            if not self.current_run(run_id):
+                return
             if options.glossary:
                 self.window.write_text(
                     "%d Glossary Entries Read from %s!\n"
@@ -137,28 +200,57 @@ if GUI_OK:
             else:
                 self.window.write_text("No External Glossary!\n")
 
-            for name in filenames:
+        def show_start(self, run_id, name):
+            """Show that a file is being processed."""
+            if self.current_run(run_id):
                 self.window.write_text("\nProcessing %s!" % name)
-                (success, candidates, unused, gloss_len,) = gloss_utils.get_candidates(
-                    name, extern_gloss=glossary, options=options
+
+        def show_result(self, run_id, index, options, result):
+            """Show the result for a single file."""
+            if not self.current_run(run_id):
+                return
+            (success, candidates, unused, gloss_len) = result
+            if not success:
+                self.window.write_text(
+                    " - ERROR: File is not supported or is corrupted/empty"
                 )
-                if not success:
-                    self.window.write_text(
-                        " - ERROR: File is not supported or is corrupted/empty"
-                    )
-                else:
+            else:
+                self.smart_write(
+                    options,
+                    " %d Candidate Entries:\n" % len(candidates),
+                    candidates,
+                )
+                if options.glossary_unused:
                     self.smart_write(
                         options,
-                        " %d Candidate Entries:\n" % len(candidates),
-                        candidates,
+                        "\n\n%d Unused Glossary Items of %d:\n"
+                        % (len(unused), gloss_len),
+                        unused,
                     )
-                    if options.glossary_unused:
-                        self.smart_write(
-                            options,
-                            "\n\n%d Unused Glossary Items of %d:\n"
-                            % (len(unused), gloss_len),
-                            unused,
-                        )
+            self.window.set_progress(index + 1)
+
+        def show_error(self, run_id, index, err):
+            """Show an error, for the file at index if not None."""
+            if not self.current_run(run_id):
+                return
+            self.window.write_text(" - ERROR: %s: %s" % (type(err).__name__, err))
+            if index is not None:
+                self.window.set_progress(index + 1)
+
+        def finish_run(self, run_id, cancelled):
+            """The worker has finished a run."""
+            if not self.current_run(run_id):
+                return
+            self.busy = False
+            self.window.stop_progress()
+            if cancelled:
+                self.window.write_text("\nCancelled!\n")
+
+        def cancel(self):
+            """Cancel the current run after the file in progress."""
+            if self.busy:
+                self.cancel_event.set()
+                self.window.write_text("\nCancelling after the current file...")
 
         def smart_write(self, options, title, items):
             """Write the items based on the options."""
@@ -187,6 +279,15 @@ if GUI_OK:
             self.text.SetDropTarget(self.droptgt)
             self.timer = wx.Timer(self)
             sizer.Add(self.text, 1, wx.EXPAND)
+            progress_sizer = wx.BoxSizer(wx.HORIZONTAL)
+            self.gauge = wx.Gauge(self, -1, 1, style=wx.GA_HORIZONTAL)
+            progress_sizer.Add(self.gauge, 1, wx.EXPAND | wx.ALL, 2)
+            self.cancel_btn = wx.Button(self, -1, "&Cancel")
+            self.cancel_btn.SetToolTip(wx.ToolTip("Stop after the current file."))
+            self.cancel_btn.Disable()
+            self.Bind(wx.EVT_BUTTON, self.on_cancel, self.cancel_btn)
+            progress_sizer.Add(self.cancel_btn, 0, wx.ALL, 2)
+            sizer.Add(progress_sizer, 0, wx.EXPAND)
             self.text.WriteText("\nDrag one or more DOC/DOCX files here:")
             self.SetSizer(sizer)
             sizer.Fit(self)
@@ -194,18 +295,17 @@ if GUI_OK:
             self.SetAutoLayout(True)
             self.Bind(wx.EVT_WINDOW_DESTROY, self.OnClose)
             self.Bind(wx.EVT_TIMER, self.OnTimer)
-            self.interval = 2000  # 2 Secs
-            self.timer.Start(self.interval)  # Check every 2 seconds
+            self.interval = 500  # 0.5 Secs
+            self.timer.Start(self.interval)  # Collect any file watcher changes
 
         def OnTimer(self, dummy_evt):
             """Timer expired."""
-            # print('Timer!')
-            if not self.droptgt.busy and self.droptgt.get_tstamps():
-                # print('File(s) Changed!')
-                self.droptgt.reprocess()
+            self.droptgt.check_changes()
 
         def OnClose(self, dummy_evt):
             """Remove any stdout windows."""
+            self.droptgt.cancel_event.set()
+            self.droptgt.stop_watching()
             wx.GetApp().RestoreStdio()
             if self.droptgt.options["save_config"]:
                 args.save_config(self.droptgt.options, gui=True)
@@ -333,6 +433,28 @@ if GUI_OK:
                 self.droptgt.reprocess()
                 # print(self.droptgt.options)
 
+        def on_cancel(self, dummy_evt):
+            """Action the Cancel Button."""
+            self.droptgt.cancel()
+
+        ##
+        def start_progress(self, total):
+            """Start showing the progress through total files."""
+            self.gauge.SetRange(max(total, 1))
+            self.gauge.SetValue(0)
+            self.cancel_btn.Enable()
+
+        ##
+        def set_progress(self, done):
+            """Show the number of files done."""
+            self.gauge.SetValue(done)
+
+        ##
+        def stop_progress(self):
+            """Finished processing."""
+            self.gauge.SetValue(self.gauge.GetRange())
+            self.cancel_btn.Disable()
+
         ##
         def write_text(self, text):
             """Wrapper for text.WriteText"""
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Long running checker daemon.
+  Created: 18/10/2026
+
+The daemon, (see gc_client for the client), started with `gloss_check --serve`, keeps the dictionaries and
+glossaries loaded and listens on localhost for JSON requests:
+
+    GET  /status - {"version": ..., "pid": ...}
+    POST /check  - {"paths": [...], "documents": [{"name": ..., "data": base64}],
+                    "options": {...}}
+
+The reply to /check is {"version": ..., "results": {name: [output, result,
+rule_stats]}} where result is [success, candidates, unused, gloss_len].
+
+Only JSON requests without an Origin header are accepted, so web pages in a
+local browser can't make requests, (a cross-origin form can't send JSON).
+"""
+from __future__ import (
+    print_function,
+)
+
+import os
+import io
+import json
+import base64
+import argparse
+import tempfile
+import contextlib
+import http.server
+
+try:
+    import text_utls
+    import gloss_utils
+    from gc_client import CLIENT_ONLY
+    from version_info import __version__ as VERSION
+except ImportError:
+    from gloss_check import text_utls
+    from gloss_check import gloss_utils
+    from gloss_check.gc_client import CLIENT_ONLY
+    from gloss_check.version_info import __version__ as VERSION
+
+# The most glossaries, for different options, kept loaded at once.
+GLOSSARIES_MAX = 8
+
+
+class GlossChecker(object):
+    """Checks documents for requests, keeping the glossaries loaded."""
+
+    def __init__(self, options):
+        """Initialise with the options the server was started with."""
+        self.options = options
+        self.glossaries = {}
+
+    def request_options(self, req_options):
+        """Get the options for a request, based on the servers options."""
+        options = argparse.Namespace(**vars(self.options))
+        for name, value in req_options.items():
+            if name not in CLIENT_ONLY and hasattr(options, name):
+                setattr(options, name, value)
+        options.glossary = [str(name) for name in req_options.get("glossary") or []]
+        return options
+
+    def get_glossary(self, options):
+        """Get the glossary for the options, reading it only if changed."""
+        key = json.dumps(
+            [
+                [(name, os.path.getmtime(name)) for name in options.glossary],
+                {
+                    name: value
+                    for name, value in vars(options).items()
+                    if name not in CLIENT_ONLY
+                },
+            ],
+            sort_keys=True,
+        )
+        glossary = self.glossaries.pop(key, None)
+        if glossary is None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                glossary = text_utls.get_glossary(options)
+            if len(self.glossaries) >= GLOSSARIES_MAX:  # Forget the oldest
+                del self.glossaries[next(iter(self.glossaries))]
+        self.glossaries[key] = glossary  # Now the most recently used
+        return glossary
+
+    def check(self, request):
+        """Check the documents in a request & return the reply."""
+        options = self.request_options(request.get("options", {}))
+        ext_gloss = self.get_glossary(options)
+        results = {}
+        for path in request.get("paths", []):
+            results[path] = gloss_utils.get_candidates_captured(
+                path, ext_gloss, options
+            )
+        documents = request.get("documents", [])
+        if documents:  # Uploaded documents need to be written to check them
+            with tempfile.TemporaryDirectory(prefix="gloss_check_") as tempdir:
+                for index, document in enumerate(documents):
+                    name = document["name"]
+                    temppath = os.path.join(
+                        tempdir, "%d_%s" % (index, os.path.basename(name))
+                    )
+                    with open(temppath, "wb") as outfile:
+                        outfile.write(base64.b64decode(document["data"]))
+                    results[name] = gloss_utils.get_candidates_captured(
+                        temppath, ext_gloss, options
+                    )
+        return {"version": VERSION, "results": results}
+
+
+class CheckHandler(http.server.BaseHTTPRequestHandler):
+    """Handle the requests to the daemon."""
+
+    def send_json(self, reply, code=200):
+        """Send a JSON reply."""
+        body = json.dumps(reply, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        """Status requests."""
+        if self.path == "/status":
+            self.send_json({"version": VERSION, "pid": os.getpid()})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        """Check requests."""
+        if self.path != "/check":
+            self.send_error(404)
+            return
+        if self.headers.get("Origin") is not None:
+            self.send_error(403, "Requests from web pages are not accepted")
+            return
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.split(";")[0].strip().lower() != "application/json":
+            self.send_error(415, "Requests must be application/json")
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length))
+            reply = self.server.checker.check(request)
+        except (ValueError, KeyError, TypeError, OSError) as err:
+            self.send_json({"version": VERSION, "error": str(err)}, 400)
+        else:
+            self.send_json(reply)
+
+
+def serve(options):
+    """Run the daemon until interrupted."""
+    # Load the default glossary & dictionaries before accepting requests.
+    checker = GlossChecker(options)
+    checker.get_glossary(checker.request_options({}))
+    server = http.server.HTTPServer(("127.0.0.1", options.port), CheckHandler)
+    server.checker = checker
+    print(
+        "Glossary Checker %s serving on http://127.0.0.1:%d" % (VERSION, options.port)
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    pass
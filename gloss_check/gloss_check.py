@@ -12,27 +12,34 @@
 from __future__ import print_function
 import sys
 import argparse
+import contextlib
 
 try:
     import text_utls
     import version_info
     import args
-    from gc_gui import GUI_OK, start_gui
     import gloss_utils
+    import gc_client
+    import profile_utils
+    import position_index
+    import output_formats
 except ImportError:
     from gloss_check import text_utls
     from gloss_check import version_info
     from gloss_check import args
-    from gloss_check.gc_gui import GUI_OK, start_gui
     from gloss_check import gloss_utils
+    from gloss_check import gc_client
+    from gloss_check import profile_utils
+    from gloss_check import position_index
+    from gloss_check import output_formats
 
 
 def parse_args():
     """Parse the arguments."""
     parser = args.get_cl_parser(__doc__)
     ops = parser.parse_args()
-    if len(args.LANGS) == 0:
-        ops.lang = None
+    if len(args.get_langs()) < 2:  # No dictionaries so no --lang option
+        ops.lang = "NONE"
     if ops.version:
         version_info.show_versions()
 
@@ -42,12 +49,47 @@ def parse_args():
 def cmdline_main():
     """Run the program."""
     ops = parse_args()
+    if ops.serve:
+        try:
+            import gc_server
+        except ImportError:
+            from gloss_check import gc_server
+        gc_server.serve(ops)
+        return
+    if ops.format != "text":  # Keep stdout for the records
+        output_formats.start(ops.format, sys.stdout)
+        with contextlib.redirect_stdout(sys.stderr):
+            check_docs(ops)
+    else:
+        check_docs(ops)
+
+
+def check_docs(ops):
+    """Check the documents, remotely if there is a daemon running."""
+    if gc_client.process_docs_remote(ops):
+        return
+    if ops.profile:
+        profile_utils.enable(ops.profile_cprofile)
+    if ops.kwic:
+        position_index.enable()
     ingloss = text_utls.get_glossary(ops)
     gloss_utils.process_docs(ops, ingloss)
 
 
-if __name__ == "__main__":
-    if GUI_OK and len(sys.argv) < 2:
+def gui_main():
+    """Start the GUI, only importing wx when it is needed."""
+    try:
+        from gc_gui import GUI_OK, start_gui
+    except ImportError:
+        from gloss_check.gc_gui import GUI_OK, start_gui
+    if GUI_OK:
         start_gui()
     else:
         cmdline_main()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        gui_main()
+    else:
+        cmdline_main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Hashed index of glossary entries.
+  Created: 18/10/2026
+"""
+from __future__ import (
+    print_function,
+)
+
+
+def make_key(word):
+    """Get the lookup key for a word, ignoring padding and case."""
+    return word.strip().casefold()
+
+
+def word_keys(words):
+    """Get the keys of the entries that the words match, with & without an s."""
+    found = set()
+    for word in words:
+        key = make_key(word)
+        found.add(key)
+        if key.endswith("s"):
+            found.add(key[:-1])
+    return found
+
+
+class GlossaryIndex(object):
+    """
+    Index of glossary entries with hashed membership tests.
+
+    Entries are matched ignoring case and surrounding whitespace and a word
+    ending in s matches the entry without it, (as accepted by --upper_only).
+    Iterating gives the, de-duplicated, entries in the order they were added.
+    The definitions of entries, if known, are kept by key.
+    """
+
+    def __init__(self, entries=(), definitions=None):
+        """Initialise from an iterable of entries & a dictionary of definitions."""
+        self.entries = []
+        self.keys = set()
+        self.definitions = {}
+        self.update(entries)
+        for entry, definition in (definitions or {}).items():
+            if definition and make_key(entry) in self.keys:
+                self.definitions.setdefault(make_key(entry), definition)
+
+    def add(self, entry, definition=None):
+        """Add a single entry, with its definition if known."""
+        key = make_key(entry)
+        if key and key not in self.keys:
+            self.keys.add(key)
+            self.entries.append(entry.strip())
+        if key and definition:
+            self.definitions.setdefault(key, definition)
+
+    def definition(self, word):
+        """Get the definition of the entry matching a word, None if unknown."""
+        key = make_key(word)
+        if key not in self.definitions and key.endswith("s"):
+            key = key[:-1]
+        return self.definitions.get(key)
+
+    def update(self, entries):
+        """Add all of the entries from an iterable."""
+        for entry in entries:
+            self.add(entry)
+
+    def has_key(self, key):
+        """Check for an entry with a key, (from make_key)."""
+        return key in self.keys
+
+    def __contains__(self, word):
+        key = make_key(word)
+        return self.has_key(key) or (key.endswith("s") and self.has_key(key[:-1]))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __repr__(self):
+        return "GlossaryIndex(%d entries)" % len(self.entries)
+
+    def used_unused(self, words):
+        """Split the entries into those used and unused by the words."""
+        found = word_keys(words)
+        used = []
+        unused = []
+        for entry in self:
+            if make_key(entry) in found:
+                used.append(entry)
+            else:
+                unused.append(entry)
+        return used, unused
+
+
+def as_index(entries):
+    """Get a GlossaryIndex for entries, which may already be one."""
+    if isinstance(entries, GlossaryIndex):
+        return entries
+    return GlossaryIndex(entries or [])
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Read the entries & definitions from glossary files by format.
+  Created: 18/10/2026
+
+The loader is chosen by the file extension:
+
+    .json        - an object of {"TERM": "Definition", ...}, a list of
+                   terms or a list of objects with a term & definition
+    .txt, .tsv   - a term, a tab then the definition on each line
+    .csv         - the term in the first column, the definition in the next
+    .docx        - the first column of each table, the next is the definition
+
+Any other file, or line without a tab, is read as terms only. Only the
+words of the terms become glossary entries, each with the definition of
+its term.
+
+Reading & tokenizing a large glossary is slow so the (entry, definition)
+pairs of each file are stored in a pickle in the cache, keyed by its path,
+modification time & size, and read from there while the file is unchanged.
+"""
+from __future__ import (
+    print_function,
+)
+
+import os
+import csv
+import json
+
+try:
+    import cache_utils
+    import lazy_utils
+    import token_utils
+except ImportError:
+    from gloss_check import cache_utils
+    from gloss_check import lazy_utils
+    from gloss_check import token_utils
+
+# First cells that show a row is a heading rather than an entry.
+HEADINGS = ["abbreviation", "abbrev", "acronym", "term", "entry"]
+
+
+def read_text(path):
+    """Read a text file, which may start with a byte order mark."""
+    with open(path, "rt", encoding="utf-8-sig", errors="replace") as infile:
+        return infile.read()
+
+
+def is_heading(cell):
+    """Check if the first cell of a row is a heading."""
+    words = cell.lower().split()
+    return bool(words) and words[0].strip(".:") in HEADINGS
+
+
+def rows_to_terms(rows):
+    """Get the (term, definition) pairs from rows of cells, skipping headings."""
+    terms = []
+    for row in rows:
+        cells = [cell.strip() for cell in row]
+        if not cells or not cells[0] or is_heading(cells[0]):
+            continue
+        definition = " ".join([cell for cell in cells[1:] if cell]) or None
+        terms.append((cells[0], definition))
+    return terms
+
+
+def load_json(path):
+    """Get the terms from a JSON glossary."""
+    data = json.loads(read_text(path))
+    if isinstance(data, dict):
+        return [
+            (str(term), None if dfn is None else str(dfn)) for term, dfn in data.items()
+        ]
+    terms = []
+    for item in data if isinstance(data, list) else []:
+        if isinstance(item, dict):
+            values = {str(key).lower(): value for key, value in item.items()}
+            term = next((values[key] for key in HEADINGS if key in values), None)
+            if term is not None:
+                definition = values.get("definition", values.get("meaning"))
+                terms.append((str(term), definition))
+        elif item is not None:
+            terms.append((str(item), None))
+    return terms
+
+
+def load_tsv(path):
+    """Get the terms from a tab separated glossary."""
+    return rows_to_terms(line.split("\t") for line in read_text(path).splitlines())
+
+
+def load_csv(path):
+    """Get the terms from a comma separated glossary."""
+    with open(path, "rt", encoding="utf-8-sig", errors="replace", newline="") as infile:
+        return rows_to_terms(csv.reader(infile))
+
+
+def load_docx(path):
+    """Get the terms from the tables in a .docx glossary."""
+    if lazy_utils.get_docx() is None:
+        print("Unable to read %s, try `pip install python-docx`" % path)
+        return []
+    try:
+        from docx2utils import get_docx_model
+    except ImportError:
+        from gloss_check.docx2utils import get_docx_model
+    rows = []
+    for table in get_docx_model(path).tables:
+        if table:  # Columns to rows
+            rows.extend(zip(*table))
+    return rows_to_terms(rows)
+
+
+def load_text(path):
+    """Get the terms from a file of any other format, all words are terms."""
+    return [(read_text(path), None)]
+
+
+LOADERS = {
+    ".json": load_json,
+    ".txt": load_tsv,
+    ".tsv": load_tsv,
+    ".csv": load_csv,
+    ".docx": load_docx,
+}
+
+
+def loader_set():
+    """Get the extensions & loaders used, compiled glossaries depend on them."""
+    return sorted([(ext, loader.__name__) for ext, loader in LOADERS.items()])
+
+
+def loader_usable(loader):
+    """Check if the optional package that a loader needs is installed."""
+    return loader is not load_docx or lazy_utils.get_docx() is not None
+
+
+def get_entries(terms, lang=None):
+    """Get the (entry, definition) pairs for the words of the terms."""
+    entries = []
+    for term, definition in terms:
+        for word in token_utils.get_words(term, lang):
+            entries.append((word, definition))
+    return entries
+
+
+def load_glossary(path, options):
+    """Get the (entry, definition) pairs from a glossary file, cached."""
+    lang = token_utils.tokenizer_lang(options)
+    loader = LOADERS.get(os.path.splitext(path)[-1].lower(), load_text)
+    use_cache = cache_utils.cache_enabled(options)
+    cache_path = None
+    if use_cache:
+        cache_path = cache_utils.glossary_cache_path(
+            path, (lang, loader_set(), loader_usable(loader))
+        )
+    if cache_path is not None:
+        entries = cache_utils.load_glossary(cache_path)
+        if entries is not None:
+            return entries
+    try:
+        entries = get_entries(loader(path), lang)
+    except (ValueError, csv.Error) as err:
+        print(
+            "Unable to read %s as %s, reading all words: %s"
+            % (path, loader.__name__, err)
+        )
+        entries = get_entries(load_text(path), lang)
+    if cache_path is not None:
+        cache_utils.store_glossary(cache_path, entries)
+    return entries
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    for ENTRY, DEFINITION in load_glossary(sys.argv[1], argparse.Namespace()):
+        print(ENTRY, "-", DEFINITION)
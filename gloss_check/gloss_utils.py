@@ -10,28 +10,44 @@ from __future__ import (
 )
 import sys
 import os
-import glob
-import tempfile
-
-try:
-    import docx
-except ImportError:
-    docx = None
-try:
-    import textract
-except ImportError:
-    textract = None
+import io
+import collections
+import argparse
+import contextlib
+import concurrent.futures
 
 try:
     import text_utls
     import docx2utils
+    import doc97utils
+    import converters
     import xmltree_utils
-    import doc2docx
+    import cache_utils
+    import gloss_index
+    import lazy_utils
+    import file_watcher
+    import profile_utils
+    import doc_walker
+    import doc_source
+    import position_index
+    import output_formats
+    import shared_gloss
 except ImportError:
     from gloss_check import text_utls
     from gloss_check import docx2utils
+    from gloss_check import doc97utils
+    from gloss_check import converters
     from gloss_check import xmltree_utils
-    from gloss_check import doc2docx
+    from gloss_check import cache_utils
+    from gloss_check import gloss_index
+    from gloss_check import lazy_utils
+    from gloss_check import file_watcher
+    from gloss_check import profile_utils
+    from gloss_check import doc_walker
+    from gloss_check import doc_source
+    from gloss_check import position_index
+    from gloss_check import output_formats
+    from gloss_check import shared_gloss
 
 
 def get_textract_wordlist(path, minacc=1):
@@ -39,6 +55,7 @@ def get_textract_wordlist(path, minacc=1):
     Take the path of a file as an argument, return the list of words.
     """
     result = (False, [])
+    textract = lazy_utils.get_textract()
     if textract:
         try:
             wordlist = textract.process(path, "utf-8").split()
@@ -51,25 +68,26 @@ def get_textract_wordlist(path, minacc=1):
 def get_doc_wordlist(path, options):  # , extract_glossary=False):
     """
     Take the path of a doc file as argument, return the list of words.
+
+    Word 97 and later files are read directly, others are converted to .docx
+    in memory by the converter selected by the options.
     """
-    docgloss = []
-    print("Need to convert .doc to temporary .docx")
-    tempdir = tempfile.gettempdir()
-    temppath = os.path.join(tempdir, "gloss_check_temp.docx")
-    if os.path.exists(temppath):
-        os.remove(temppath)
-    doc2docx.doc2docx(path, temppath)
-    # Create a temprory copy of the doc as docx
-    if docx is not None:
-        success, cwordlist, docgloss = docx2utils.get_docx2_wordlist(temppath, options)
-    else:
-        success, cwordlist, docgloss = xmltree_utils.get_docx_tree_wordlist(
-            temppath, options
+    try:
+        return doc97utils.get_doc97_wordlist(path, options)
+    except doc97utils.DocFormatError as err:
+        print("Unable to read %s directly: %s" % (path, err))
+    try:
+        with doc_source.local_copy(path) as local_path:
+            docx_data = io.BytesIO(converters.convert_to_docx(local_path, options))
+    except converters.ConversionError as err:
+        print("Unable to convert %s to .docx: %s" % (path, err))
+        return False, [], []
+    if lazy_utils.get_docx() is not None:
+        return docx2utils.get_model_wordlist(
+            docx2utils.get_docx_model(docx_data, xmltree_utils.enabled_parts(options)),
+            options,
         )
-    if os.path.exists(temppath):
-        os.remove(temppath)
-        print("Removed", temppath)
-    return success, cwordlist, docgloss
+    return xmltree_utils.get_docx_source_wordlist(docx_data, options)
 
 
 def get_candidates(path, extern_gloss=None, options=None):
@@ -85,83 +103,360 @@ def get_candidates(path, extern_gloss=None, options=None):
         extern_gloss: An existing glossary to ignore.
         lang: Language code to spell check against.
     """
-    success = False
-    words = []
-    doc_gloss = []
-    method_dict = {  # Dictionary of methods to use for specific file extensions
-        ".docx": xmltree_utils.get_docx_tree_wordlist,
-        ".doc": get_doc_wordlist,
-    }
-    if docx is not None:  # docx library available so override method
-        method_dict[".docx"] = docx2utils.get_docx2_wordlist
-    method = method_dict.get(os.path.splitext(path)[-1].lower())
-    candiates = []
-    unused = []
-    if method is not None:
-        success, words, doc_gloss = method(path, options)
-    elif textract is not None:
-        success, words = get_textract_wordlist(path, options.min_acc)
-    if success:
-        candiates = text_utls.get_candidates_from_list(
-            words, extern_gloss, doc_gloss, options
+    with profile_utils.document(path):
+        success = False
+        words = []
+        doc_gloss = []
+        method_dict = {  # Dictionary of methods to use for specific file extensions
+            ".docx": xmltree_utils.get_docx_tree_wordlist,
+            ".doc": get_doc_wordlist,
+        }
+        if lazy_utils.get_docx() is not None:  # docx library available so override
+            method_dict[".docx"] = docx2utils.get_docx2_wordlist
+        method = method_dict.get(doc_source.doc_extension(path))
+        candiates = []
+        unused = []
+        position_index.start_document()
+        if method is not None:
+            with profile_utils.stage("extract"):
+                success, words, doc_gloss = cache_utils.cached_extract(
+                    method, path, options
+                )
+        elif lazy_utils.get_textract() is not None:
+            with doc_source.local_copy(path) as local_path:
+                success, words = get_textract_wordlist(local_path, options.min_acc)
+        if success:
+            candiates = text_utls.get_candidates_from_list(
+                words, extern_gloss, doc_gloss, options
+            )
+            if options.glossary_unused:
+                with profile_utils.stage("unused"):
+                    if options.table_gloss:
+                        dummy_used, unused = gloss_index.as_index(
+                            doc_gloss
+                        ).used_unused(words)
+                    else:
+                        dummy_used, unused = gloss_index.as_index(
+                            extern_gloss
+                        ).used_unused(words)
+        position_index.finish_document(path, candiates)
+        text_utls.flush_spell_memo(options)
+        return (
+            success,
+            candiates,
+            unused,
+            len(doc_gloss),
         )
-        if options.glossary_unused:
-            if options.table_gloss:
-                unused = [item for item in doc_gloss if not item in words]
-            else:
-                unused = [item for item in extern_gloss if not item in words]
-    return (
-        success,
-        candiates,
-        unused,
-        len(doc_gloss),
-    )
 
 
-def process_docs(options, ext_gloss):
-    """Process the documents."""
-    errors = []
+def expand_docs(options):
+    """
+    Expand the document arguments into a list of (argument, filenames).
+
+    With --recursive the filenames are generators that walk any directories
+    as they are iterated, otherwise lists. Each file is only included once
+    for an argument, files matched by more than one argument are reported
+    as already processed by report_docs.
+    """
+    recursive = getattr(options, "recursive", False)
+    expanded = []
     for arg in options.DOCS:
-        print("Document/Wildcard:", arg)
-        if os.path.isfile(arg):
-            filelist = [
-                arg,
-            ]
-        else:
-            filelist = glob.glob(arg)
-        if len(filelist) == 0:
-            print("ERROR: No files match", arg)
-        for filename in filelist:
-            print("Processing", filename)
-            success, candidates, unused, gloss_len = get_candidates(
-                filename, ext_gloss, options=options
-            )
-            if not success:
-                errors.append(
-                    f"ERROR: File {filename} is not a supported format or is corrupted/empty"
-                )
-            else:
+        filenames = doc_walker.iter_arg_docs(
+            arg,
+            recursive,
+            getattr(options, "include_files", None),
+            getattr(options, "exclude_files", None),
+        )
+        expanded.append((arg, filenames if recursive else list(filenames)))
+    return expanded
+
+
+def prefetch_conversions(options, expanded):
+    """
+    Queue the .doc files that can't be read directly, and aren't cached, for
+    conversion together, so that the converter gets them as batches. Files
+    found by walking directories are converted as they are reached.
+    """
+    paths = [
+        name
+        for dummy_arg, filelist in expanded
+        if isinstance(filelist, list)
+        for name in filelist
+        if doc_source.doc_extension(name) == ".doc"
+        and not doc_source.is_virtual(name)
+        and not cache_utils.is_cached(get_doc_wordlist, name, options)
+        and not doc97utils.is_readable(name)
+    ]
+    converters.prefetch(paths, options)
+
+
+def report_result(filename, result, options):
+    """Print the result for a single document and return any errors."""
+    errors = []
+    success, candidates, unused, dummy_gloss_len = result
+    if not success:
+        errors.append(
+            f"ERROR: File {filename} is not a supported format or is corrupted/empty"
+        )
+    else:
+        if not output_formats.active():  # Records are written by report_docs
+            with profile_utils.stage("print"):
                 print("%d Candidates:" % len(candidates))
                 text_utls.smart_print(options, candidates)
                 if options.glossary_unused:
                     print("Possible Unused Glossary Enties:")
                     text_utls.smart_print(options, unused)
-                if (
-                    options.fail_missing_count
-                    and len(candidates) >= options.fail_missing_count
-                ):
-                    errors.append(
-                        f"{len(candidates)} Undefined items > permitted in {filename}"
+        if options.fail_missing_count and len(candidates) >= options.fail_missing_count:
+            errors.append(
+                f"{len(candidates)} Undefined items > permitted in {filename}"
+            )
+        if options.fail_unused_count and len(unused) >= options.fail_unused_count:
+            errors.append(
+                f"{len(unused)} Unused items > {options.fail_unused_count} permitted in {filename}"
+            )
+    return errors
+
+
+def get_candidates_captured(filename, ext_gloss, options):
+    """
+    Get the candidates capturing the output, for later display, and the
+    rule statistics for the document.
+
+    Returns (output, result, rule_stats).
+    """
+    output = io.StringIO()
+    text_utls.RULE_STATS.clear()
+    with contextlib.redirect_stdout(output):
+        result = get_candidates(filename, ext_gloss, options=options)
+    return output.getvalue(), result, dict(text_utls.RULE_STATS)
+
+
+def report_docs(options, expanded, get_result, file_errors=None):
+    """
+    Report the results for the expanded documents in order and return any
+    errors, get_result(filename) gives (output, result, rule_stats).
+    The errors for each file are also stored in file_errors if given.
+    Files matched by an earlier argument are only processed once.
+    """
+    errors = []
+    processed = set()
+    for arg, filelist in expanded:
+        print("Document/Wildcard:", arg)
+        found = 0
+        for filename in filelist:
+            found += 1
+            if filename in processed:
+                print("Already processed", filename)
+                continue
+            processed.add(filename)
+            print("Processing", filename)
+            output, result, rule_stats = get_result(filename)
+            print(output, end="")
+            text_utls.RULE_STATS.update(rule_stats)
+            with profile_utils.document(filename):
+                doc_errors = report_result(filename, result, options)
+                output_formats.write_result(arg, filename, result, doc_errors)
+            if file_errors is not None:
+                file_errors[filename] = doc_errors
+            errors.extend(doc_errors)
+        if not found:
+            print("ERROR: No files match", arg)
+    return errors
+
+
+def finish_docs(options, errors):
+    """Finish processing the documents, exiting with a failure on any errors."""
+    if getattr(options, "rule_stats", False):
+        text_utls.show_rule_stats()
+    if profile_utils.enabled():
+        profile_utils.finish(options.profile)
+    if position_index.enabled():
+        position_index.finish(options.kwic)
+    output_formats.finish()
+    if cache_utils.cache_enabled(options):
+        cache_utils.prune_cache()
+    if errors:
+        sys.exit("FAIL!\n" + "\n".join(errors))
+
+
+# Per process state for the worker pool, set once by _init_worker.
+_WORKER_STATE = {}
+
+
+def _init_worker(ext_gloss, options, stdin_data=None):
+    """Initialise a worker process with the glossary, options & any stdin."""
+    _WORKER_STATE["ext_gloss"] = ext_gloss
+    _WORKER_STATE["options"] = options
+    if stdin_data is not None:
+        doc_source.set_stdin(stdin_data)
+    if getattr(options, "profile", None):
+        profile_utils.enable()
+    if getattr(options, "kwic", None):
+        position_index.enable()
+
+
+def _worker_get_candidates(filename):
+    """
+    Get the candidates in a worker, capturing the output for later display,
+    with the profile records & position index for the document if wanted.
+    """
+    return get_candidates_captured(
+        filename, _WORKER_STATE["ext_gloss"], _WORKER_STATE["options"]
+    ) + (profile_utils.take_records(), position_index.take_document(filename))
+
+
+def _file_size(filename):
+    """Size of a file for scheduling, 0 if it can't be read."""
+    try:
+        return os.path.getsize(filename)
+    except OSError:
+        return 0
+
+
+def _prefetch(filenames, submit, ahead):
+    """Yield the filenames, each one having been submitted ahead files before."""
+    pending = collections.deque()
+    for name in filenames:
+        submit(name)
+        pending.append(name)
+        if len(pending) > ahead:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+def process_docs_parallel(options, ext_gloss, expanded, file_errors=None):
+    """
+    Process the expanded documents using a pool of worker processes.
+
+    The largest files are submitted first so that a single large document
+    does not hold up the end of the run but the results are displayed in the
+    same order as a serial run. When walking directories the files are
+    submitted as they are found, a few ahead of those being reported.
+    The glossary is shared with the workers as a memory mapped table.
+    """
+    shared = shared_gloss.share(ext_gloss)
+    try:
+        return _run_pool(options, shared, expanded, file_errors)
+    finally:
+        shared_gloss.unshare(shared)
+
+
+def _run_pool(options, ext_gloss, expanded, file_errors):
+    """Process the expanded documents in the pool of worker processes."""
+    jobs = options.jobs or os.cpu_count()
+    pool_ops = argparse.Namespace(**vars(options))
+    pool_ops.glossary = None  # Already read & open files can not be pickled
+    stdin_data = None
+    if doc_source.STDIN_NAME in options.DOCS:  # Workers can't read our stdin
+        stdin_data = doc_source.get_stdin()
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(ext_gloss, pool_ops, stdin_data),
+    ) as pool:
+        futures = {}
+        same_content = {}
+
+        def submit(name):
+            """Submit a document, identical copies only need processing once."""
+            if name in futures:
+                return
+            if cache_utils.cache_enabled(options):
+                try:
+                    original = same_content.setdefault(
+                        cache_utils.file_hash(name), name
                     )
-                if (
-                    options.fail_unused_count
-                    and len(unused) >= options.fail_unused_count
-                ):
-                    errors.append(
-                        f"{len(unused)} Unused items > {options.fail_unused_count} permitted in {filename}"
+                except OSError:
+                    original = name
+                if original in futures:
+                    futures[name] = futures[original]
+                    return
+            futures[name] = pool.submit(_worker_get_candidates, name)
+
+        if getattr(options, "recursive", False):
+            expanded = [
+                (arg, _prefetch(filelist, submit, 2 * jobs))
+                for arg, filelist in expanded
+            ]
+        else:
+            for name in sorted(
+                {name for dummy_arg, filelist in expanded for name in filelist},
+                key=_file_size,
+                reverse=True,
+            ):
+                submit(name)
+        merged = set()
+
+        def get_result(name):
+            """Get the result for a document, merging any profile once."""
+            output, result, rule_stats, records, index = futures[name].result()
+            position_index.add_document(name, index)
+            if futures[name] not in merged:
+                merged.add(futures[name])
+                profile_utils.merge_records(records)
+            return output, result, rule_stats
+
+        return report_docs(options, expanded, get_result, file_errors)
+
+
+def watch_docs(options, ext_gloss, file_errors):
+    """
+    Re-check the documents each time that their contents change until
+    interrupted, returns the errors from the latest check of each file.
+    """
+    # Watch the files that hold the documents, an archive for its members.
+    holders = collections.defaultdict(list)
+    for name in file_errors:
+        path = doc_source.real_path(name)
+        if path is None:
+            print("Unable to watch %s, only files can be watched" % name)
+        else:
+            holders[path].append(name)
+    if not holders:
+        print("Nothing to watch")
+        return [error for doc_errors in file_errors.values() for error in doc_errors]
+    watcher = file_watcher.FileWatcher(list(holders))
+    print(
+        "Watching %d file(s) for changes with %s, Ctrl-C to stop."
+        % (len(watcher.filenames), type(watcher.backend).__name__)
+    )
+    try:
+        while True:
+            for path in watcher.wait():
+                print("Changed", path)
+                for filename in holders[path]:
+                    result = get_candidates(filename, ext_gloss, options=options)
+                    file_errors[filename] = report_result(filename, result, options)
+                    output_formats.write_result(
+                        filename, filename, result, file_errors[filename]
                     )
-        if errors:
-            sys.exit("FAIL!\n" + "\n".join(errors))
+    except KeyboardInterrupt:
+        print("Stopped watching")
+    finally:
+        watcher.close()
+    return [error for doc_errors in file_errors.values() for error in doc_errors]
+
+
+def process_docs(options, ext_gloss):
+    """Process the documents."""
+    if getattr(options, "clear_cache", False):
+        cache_utils.clear_cache()
+    expanded = expand_docs(options)
+    file_errors = {}
+    if getattr(options, "jobs", 1) != 1:
+        errors = process_docs_parallel(options, ext_gloss, expanded, file_errors)
+    else:
+        prefetch_conversions(options, expanded)
+        errors = report_docs(
+            options,
+            expanded,
+            lambda name: ("", get_candidates(name, ext_gloss, options=options), {}),
+            file_errors,
+        )
+    if getattr(options, "watch", False):
+        errors = watch_docs(options, ext_gloss, file_errors)
+    finish_docs(options, errors)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Find abbreviations that are defined in the text of a document.
+  Created: 18/10/2026
+
+Two forms of inline definition are found:
+
+    Subsea Control Module (SCM)     - Long Form (ABBR)
+    SCM (Subsea Control Module)     - ABBR (Long Form)
+
+The words of each text, as tokenized by the extractor, are read once, left
+to right, keeping the last few words for the long form of a following
+(ABBR). An abbreviation is accepted
+if its letters are the initials of the long form, reading backwards, where
+a word may give several letters from its internal capitals or hyphenated
+parts and short linking words such as "of", "and" or "&" may be skipped.
+"""
+from __future__ import (
+    print_function,
+)
+
+import itertools
+import collections
+
+try:
+    import token_utils
+except ImportError:
+    from gloss_check import token_utils
+
+MAX_ABBREV = 10
+# The most words in a long form & in the parenthesis of ABBR (Long Form).
+MAX_LONG_WORDS = 10
+LINK_WORDS = {"a", "an", "and", "as", "at", "by", "for", "in", "of", "on", "or"}
+LINK_WORDS.update({"the", "to", "with", "&", "-", "/"})
+
+
+def is_abbreviation(word):
+    """Check if a word looks like an abbreviation, 2+ capitals & short."""
+    if not 2 <= len(word) <= MAX_ABBREV or not word[0].isalnum():
+        return False
+    return sum(1 for char in word if char.isupper()) >= 2
+
+
+def abbrev_letters(abbrev):
+    """Get the lower case letters & digits of an abbreviation, without plural s."""
+    if abbrev.endswith("s") and abbrev[:-1].isupper():
+        abbrev = abbrev[:-1]
+    return [char.lower() for char in abbrev if char.isalnum()]
+
+
+def word_initials(word):
+    """
+    Get the initials a word can give, the first letter then those of any
+    internal capitals or parts after a hyphen or slash.
+    """
+    initials = []
+    start = True
+    for char in word:
+        if char in "-/":
+            start = True
+        elif char.isalnum():
+            if start or char.isupper():
+                initials.append(char.lower())
+            start = False
+    return initials
+
+
+def match_long_form(letters, words):
+    """
+    Match the letters of an abbreviation to the initials of the end of the
+    words, returns the number of words in the long form or 0 if no match.
+
+    Reading backwards each word gives some of its initials, at least the
+    first, to the end of the letters still to match. A linking word may
+    instead be skipped, both are tried so a linking word whose initial fits
+    doesn't stop a match that skips it, but can't start the long form.
+    """
+
+    def match(remaining, used):
+        """The words used to match letters[:remaining] from word -used-1."""
+        if used >= len(words):
+            return 0
+        word = words[-used - 1]
+        is_link = word.lower() in LINK_WORDS
+        initials = word_initials(word)
+        take = min(len(initials), remaining)
+        while take:
+            if initials[:take] == letters[remaining - take : remaining]:
+                if take < remaining:
+                    found = match(remaining - take, used + 1)
+                    if found:
+                        return found
+                elif not is_link:  # A long form can't start with one
+                    return used + 1
+            take -= 1
+        if is_link:
+            return match(remaining, used + 1)
+        return 0
+
+    if not letters:
+        return 0
+    return match(len(letters), 0)
+
+
+def find_definitions(text, tokens=None):
+    """
+    Get the (abbreviation, long form) pairs defined in a text.
+
+    Single pass over the (word, offset) tokens already found in the text,
+    tokenized here if not given, keeping the last MAX_LONG_WORDS words &
+    the words of any open parenthesis. The parentheses are found in the
+    gaps between the words & a new line, as between the texts joined for
+    tokenizing, starts afresh.
+    """
+    if tokens is None:
+        tokens = token_utils.iter_tokens(text)
+    found = []
+    previous = collections.deque(maxlen=MAX_LONG_WORDS)
+    paren = None  # Words inside an open parenthesis
+    before = None  # The word before the open parenthesis
+    end = 0
+    for word, offset in itertools.chain(tokens, [(None, len(text))]):
+        gap = text[end:offset]
+        if paren is not None and ")" in gap:
+            found.extend(check_parenthesis(paren, before, list(previous)))
+            paren = None
+            previous.clear()  # A long form can't span a definition
+        if "\n" in gap:
+            paren = None
+            previous.clear()
+        if word is None:
+            break
+        if paren is None and "(" in gap:
+            paren = []
+            before = previous[-1] if previous else None
+        end = offset + len(word)
+        if paren is not None:
+            paren.append(word)
+            if len(paren) > MAX_LONG_WORDS:
+                paren = None
+        else:
+            previous.append(word)
+    return found
+
+
+def check_parenthesis(paren, before, previous):
+    """Get any definition made by the words in a parenthesis."""
+    if len(paren) == 1 and is_abbreviation(paren[0]):
+        letters = abbrev_letters(paren[0])
+        used = match_long_form(letters, previous)
+        if used:
+            return [(paren[0], " ".join(previous[-used:]))]
+    elif len(paren) > 1 and before is not None and is_abbreviation(before):
+        if match_long_form(abbrev_letters(before), paren) == len(paren):
+            return [(before, " ".join(paren))]
+    return []
+
+
+def add_definitions(definitions, text, tokens=None):
+    """Add the definitions in a text, & its tokens, to those found so far."""
+    for abbrev, long_form in find_definitions(text, tokens):
+        definitions.setdefault(abbrev, long_form)
+
+
+def get_definitions(texts):
+    """Get the definitions from each of the texts, in order, without repeats."""
+    definitions = collections.OrderedDict()
+    for text in texts:
+        add_definitions(definitions, text)
+    return definitions
+
+
+def show_definitions(definitions):
+    """Print the definitions found."""
+    if definitions:
+        print(
+            "Adding inline definitions to assumed glossary:",
+            ", ".join(
+                "%s (%s)" % (abbrev, long_form)
+                for abbrev, long_form in definitions.items()
+            ),
+        )
+
+
+if __name__ == "__main__":
+    import sys
+
+    for ABBREV, LONG_FORM in find_definitions(" ".join(sys.argv[1:])):
+        print(ABBREV, "=", LONG_FORM)
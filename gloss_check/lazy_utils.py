@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Import optional packages only when they are first needed.
+  Created: 18/10/2026
+
+N.B. Modules imported here by name are not seen by PyInstaller or cx_Freeze
+so must be listed in gloss_check.spec hiddenimports & setup_cx.py packages.
+"""
+from __future__ import (
+    print_function,
+)
+
+import importlib
+
+# Modules that have been imported, or None if they are not available.
+_MODULES = {}
+
+
+def optional_import(name):
+    """
+    Import an optional module the first time it is needed.
+
+    Returns the module or None if it, or something it depends on, is missing.
+    Failed imports are remembered so are only attempted once.
+    """
+    if name not in _MODULES:
+        try:
+            _MODULES[name] = importlib.import_module(name)
+        except ImportError:
+            _MODULES[name] = None
+    return _MODULES[name]
+
+
+def get_enchant():
+    """Get the enchant spell checker module, if available."""
+    return optional_import("enchant")
+
+
+def get_etock():
+    """Get the enchant tokenizer module, if available."""
+    if get_enchant() is None:
+        return None
+    return optional_import("enchant.tokenize")
+
+
+def get_docx():
+    """Get the python-docx module, if available."""
+    return optional_import("docx")
+
+
+def get_textract():
+    """Get the textract module, if available."""
+    return optional_import("textract")
+
+
+if __name__ == "__main__":
+    pass
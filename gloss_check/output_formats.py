@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Machine readable results for --format.
+  Created: 18/10/2026
+
+Each document gives a record of:
+
+    {"document": ..., "argument": ..., "success": bool, "passed": bool,
+     "candidates": [...], "unused": [...], "glossary_size": int,
+     "errors": [...]}
+
+ndjson, json & csv records are written, and flushed, as each document
+finishes. JUnit needs the totals at the start so is written at the end.
+"""
+from __future__ import (
+    print_function,
+)
+
+import csv
+import json
+from html import escape
+
+# Whitespace that would be normalised in an XML attribute value.
+ATTR_WHITESPACE = {ord("\n"): "&#10;", ord("\r"): "&#13;", ord("\t"): "&#9;"}
+
+FORMATS = ["text", "ndjson", "json", "csv", "junit"]
+CSV_FIELDS = [
+    "document",
+    "argument",
+    "success",
+    "passed",
+    "candidate_count",
+    "unused_count",
+    "glossary_size",
+    "candidates",
+    "unused",
+    "errors",
+]
+# The active writer or None for human readable text.
+_WRITER = None
+
+
+class RecordWriter(object):
+    """Base for the writers, writes nothing."""
+
+    def __init__(self, stream):
+        """Initialise with the stream to write to."""
+        self.stream = stream
+
+    def write(self, record):
+        """Write the record for a document."""
+
+    def finish(self):
+        """Write anything needed after the last record."""
+        self.stream.flush()
+
+
+class NdjsonWriter(RecordWriter):
+    """One JSON object per line."""
+
+    def write(self, record):
+        """Write the record for a document."""
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+
+class JsonWriter(RecordWriter):
+    """A JSON array of the records, written as they arrive."""
+
+    def __init__(self, stream):
+        """Initialise with the stream to write to."""
+        super(JsonWriter, self).__init__(stream)
+        self.count = 0
+
+    def write(self, record):
+        """Write the record for a document."""
+        self.stream.write(
+            ("[\n" if self.count == 0 else ",\n")
+            + json.dumps(record, ensure_ascii=False)
+        )
+        self.stream.flush()
+        self.count += 1
+
+    def finish(self):
+        """Close the array."""
+        self.stream.write("[]\n" if self.count == 0 else "\n]\n")
+        self.stream.flush()
+
+
+class CsvWriter(RecordWriter):
+    """A row per document, lists are joined with semicolons."""
+
+    def __init__(self, stream):
+        """Initialise with the stream to write to & write the header."""
+        super(CsvWriter, self).__init__(stream)
+        self.writer = csv.DictWriter(stream, CSV_FIELDS, lineterminator="\n")
+        self.writer.writeheader()
+
+    def write(self, record):
+        """Write the record for a document."""
+        row = dict(record)
+        row["candidate_count"] = len(record["candidates"])
+        row["unused_count"] = len(record["unused"])
+        for name in ("candidates", "unused", "errors"):
+            row[name] = ";".join(record[name])
+        self.writer.writerow(row)
+        self.stream.flush()
+
+
+def quote_attr(text):
+    """Escape & quote text for use as an XML attribute value."""
+    return '"%s"' % escape(text, quote=True).translate(ATTR_WHITESPACE)
+
+
+class JunitWriter(RecordWriter):
+    """A JUnit test case per document, written at the end."""
+
+    def __init__(self, stream):
+        """Initialise with the stream to write to."""
+        super(JunitWriter, self).__init__(stream)
+        self.records = []
+
+    def write(self, record):
+        """Remember the record for a document."""
+        self.records.append(record)
+
+    def finish(self):
+        """Write the test suite."""
+        failures = len([r for r in self.records if r["success"] and not r["passed"]])
+        errors = len([r for r in self.records if not r["success"]])
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<testsuites><testsuite name="gloss_check" tests="%d" failures="%d" '
+            'errors="%d">' % (len(self.records), failures, errors),
+        ]
+        for record in self.records:
+            lines.append(
+                "<testcase classname=%s name=%s>"
+                % (quote_attr(record["argument"]), quote_attr(record["document"]))
+            )
+            message = quote_attr("; ".join(record["errors"]))
+            if not record["success"]:
+                lines.append("<error message=%s/>" % message)
+            elif not record["passed"]:
+                lines.append("<failure message=%s/>" % message)
+            lines.append(
+                "<system-out>%s</system-out>"
+                % escape(
+                    "%d Candidates: %s\nUnused: %s"
+                    % (
+                        len(record["candidates"]),
+                        ", ".join(record["candidates"]),
+                        ", ".join(record["unused"]),
+                    )
+                )
+            )
+            lines.append("</testcase>")
+        lines.append("</testsuite></testsuites>")
+        self.stream.write("\n".join(lines) + "\n")
+        self.stream.flush()
+
+
+WRITERS = {
+    "ndjson": NdjsonWriter,
+    "json": JsonWriter,
+    "csv": CsvWriter,
+    "junit": JunitWriter,
+}
+
+
+def start(output_format, stream):
+    """Start writing records in a format, other than text, to stream."""
+    global _WRITER
+    _WRITER = WRITERS[output_format](stream)
+
+
+def active():
+    """Check if records are being written instead of human readable text."""
+    return _WRITER is not None
+
+
+def make_record(argument, filename, result, errors):
+    """Make the record for a document from its result & errors."""
+    success, candidates, unused, gloss_len = result
+    return {
+        "document": filename,
+        "argument": argument,
+        "success": bool(success),
+        "passed": not errors,
+        "candidates": list(candidates),
+        "unused": list(unused),
+        "glossary_size": gloss_len,
+        "errors": list(errors),
+    }
+
+
+def write_result(argument, filename, result, errors):
+    """Write the record for a document, if writing records."""
+    if _WRITER is not None:
+        _WRITER.write(make_record(argument, filename, result, errors))
+
+
+def finish():
+    """Finish writing records."""
+    global _WRITER
+    if _WRITER is not None:
+        _WRITER.finish()
+        _WRITER = None
+
+
+if __name__ == "__main__":
+    pass
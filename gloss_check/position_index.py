@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Positional index of where each candidate is used, for --kwic.
+  Created: 18/10/2026
+
+While a document is extracted the extractors add each block of text, a
+paragraph or table cell, with the words found in it & their offsets to the
+current() index. Once the candidates are known the index is restricted to
+them, keeping only the blocks that they are used in, and kept for the
+keyword in context report written by finish().
+
+Blocks are located by the part of the document, (body, headers, etc.),
+and a label, the paragraph number in the part or table:row:column for the
+table cells read by python-docx. Occurrences are in the order that they
+were extracted, which for python-docx is the body paragraphs, then the
+tables then the other parts.
+
+Until enable() is called current() is None & the extractors skip indexing.
+"""
+from __future__ import (
+    print_function,
+)
+
+import json
+import array
+import bisect
+import itertools
+import collections
+from html import escape
+
+CONTEXT_WIDTH = 40
+MAX_HTML_CONTEXTS = 20
+# Whether indexing is enabled, the index of the document being extracted &
+# the restricted indexes of the documents so far.
+_ENABLED = False
+_CURRENT = None
+_INDEXES = {}
+
+
+class PositionIndex(object):
+    """
+    Where each word is used in a document.
+
+    The blocks are (part, label, text) & each word has a flat array of
+    block number, offset pairs to keep the index compact.
+    """
+
+    def __init__(self):
+        """Initialise empty."""
+        self.blocks = []
+        self.postings = {}
+        self.part_blocks = collections.Counter()
+
+    def add(self, part, label, text, tokens):
+        """Add a block of text and the (word, offset) tokens in it."""
+        self.add_texts(part, [text], tokens, [label])
+
+    def add_texts(self, part, texts, tokens, labels=None):
+        """
+        Add blocks of text and the (word, offset) tokens found in the texts
+        joined by newlines, labels default to the block numbers in the part.
+        """
+        first_block = len(self.blocks)
+        if labels is None:
+            labels = itertools.count(self.part_blocks[part])
+        self.part_blocks[part] += len(texts)
+        starts = []
+        start = 0
+        for label, text in zip(labels, texts):
+            starts.append(start)
+            start += len(text) + 1
+            self.blocks.append((part, str(label), text))
+        for word, offset in tokens:
+            number = bisect.bisect_right(starts, offset) - 1
+            postings = self.postings.get(word)
+            if postings is None:
+                postings = self.postings[word] = array.array("L")
+            postings.append(first_block + number)
+            postings.append(offset - starts[number])
+
+    def restrict(self, words):
+        """Get an index of only the words, and the blocks they are used in."""
+        kept = PositionIndex()
+        renumber = {}
+        for word in words:
+            postings = self.postings.get(word)
+            if postings is None:
+                continue
+            new_postings = kept.postings[word] = array.array("L")
+            for pos in range(0, len(postings), 2):
+                block = postings[pos]
+                if block not in renumber:
+                    renumber[block] = len(kept.blocks)
+                    kept.blocks.append(self.blocks[block])
+                new_postings.append(renumber[block])
+                new_postings.append(postings[pos + 1])
+        return kept
+
+    def count(self, word):
+        """Get the number of times a word is used."""
+        return len(self.postings.get(word, ())) // 2
+
+    def occurrences(self, word):
+        """Yield (part, label, offset) for each use of a word."""
+        postings = self.postings.get(word, ())
+        for pos in range(0, len(postings), 2):
+            part, label, dummy_text = self.blocks[postings[pos]]
+            yield part, label, postings[pos + 1]
+
+    def first(self, word):
+        """Get (part, label, offset) for the first use of a word, or None."""
+        return next(self.occurrences(word), None)
+
+    def contexts(self, word, width=CONTEXT_WIDTH):
+        """Yield (part, label, left, right) the text around each use of a word."""
+        postings = self.postings.get(word, ())
+        for pos in range(0, len(postings), 2):
+            part, label, text = self.blocks[postings[pos]]
+            offset = postings[pos + 1]
+            yield (
+                part,
+                label,
+                text[max(offset - width, 0) : offset],
+                text[offset + len(word) : offset + len(word) + width],
+            )
+
+    def to_dict(self):
+        """Get the index as a JSON serializable dictionary."""
+        return {
+            "blocks": [list(block) for block in self.blocks],
+            "postings": {word: list(pos) for word, pos in self.postings.items()},
+        }
+
+    def load(self, data):
+        """Replace the contents with those from to_dict()."""
+        self.blocks = [tuple(block) for block in data["blocks"]]
+        self.postings = {
+            word: array.array("L", pos) for word, pos in data["postings"].items()
+        }
+        return self
+
+
+def enable():
+    """Start indexing the documents."""
+    global _ENABLED
+    _ENABLED = True
+
+
+def enabled():
+    """Check if indexing is enabled."""
+    return _ENABLED
+
+
+def current():
+    """Get the index for the document being extracted, None if not indexing."""
+    return _CURRENT
+
+
+def start_document():
+    """Start a new index for the document about to be extracted."""
+    global _CURRENT
+    _CURRENT = PositionIndex() if _ENABLED else None
+
+
+def finish_document(name, candidates):
+    """Keep the index of the candidates for a document."""
+    global _CURRENT
+    if _CURRENT is not None:
+        _INDEXES[name] = _CURRENT.restrict(candidates)
+        _CURRENT = None
+
+
+def take_document(name):
+    """Get the index of a document as a dictionary & forget it, for workers."""
+    index = _INDEXES.pop(name, None)
+    return None if index is None else index.to_dict()
+
+
+def add_document(name, data):
+    """Add the index of a document from take_document in a worker."""
+    if _ENABLED and data is not None:
+        _INDEXES[name] = PositionIndex().load(data)
+
+
+def get_report():
+    """Get the report of where each candidate is used in each document."""
+    report = {}
+    for name, index in _INDEXES.items():
+        report[name] = {
+            word: {
+                "count": index.count(word),
+                "first": dict(zip(("part", "label", "offset"), index.first(word))),
+                "contexts": [
+                    dict(zip(("part", "label", "left", "right"), context))
+                    for context in index.contexts(word)
+                ],
+            }
+            for word in sorted(index.postings, key=lambda s: s.lower())
+        }
+    return report
+
+
+def write_html(path, report):
+    """Write the report as an HTML page with a table for each document."""
+    lines = [
+        "<!DOCTYPE html>",
+        '<html><head><meta charset="utf-8"><title>Glossary Candidates in Context'
+        "</title><style>td{vertical-align:top;padding:2px 8px}"
+        "th{text-align:left}.ctx{font-family:monospace;white-space:pre}"
+        "</style></head><body>",
+    ]
+    for name, words in report.items():
+        lines.append("<h2>%s</h2>" % escape(name))
+        lines.append(
+            "<table><tr><th>Candidate</th><th>Uses</th><th>First</th>"
+            "<th>In Context</th></tr>"
+        )
+        for word, entry in words.items():
+            first = entry["first"]
+            contexts = [
+                '<div class="ctx">%s<b>%s</b>%s</div>'
+                % (
+                    escape(context["left"].rjust(CONTEXT_WIDTH)),
+                    escape(word),
+                    escape(context["right"]),
+                )
+                for context in entry["contexts"][:MAX_HTML_CONTEXTS]
+            ]
+            if entry["count"] > MAX_HTML_CONTEXTS:
+                contexts.append(
+                    "<div>... %d more</div>" % (entry["count"] - MAX_HTML_CONTEXTS)
+                )
+            lines.append(
+                "<tr><td><b>%s</b></td><td>%d</td><td>%s %s</td><td>%s</td></tr>"
+                % (
+                    escape(word),
+                    entry["count"],
+                    escape(first["part"]),
+                    escape(first["label"]),
+                    "".join(contexts),
+                )
+            )
+        lines.append("</table>")
+    lines.append("</body></html>")
+    with open(path, "wt", encoding="utf-8") as outfile:
+        outfile.write("\n".join(lines) + "\n")
+
+
+def finish(report_path):
+    """Write the report, as JSON if path ends with .json otherwise HTML."""
+    global _ENABLED
+    if not _ENABLED:
+        return
+    report = get_report()
+    if report_path.lower().endswith(".json"):
+        with open(report_path, "wt", encoding="utf-8") as outfile:
+            json.dump(report, outfile, indent=2, ensure_ascii=False)
+    else:
+        write_html(report_path, report)
+    print("Keyword in context report written to", report_path)
+    _ENABLED = False
+    _INDEXES.clear()
+
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Per stage timers & counters for --profile.
+  Created: 18/10/2026
+
+The pipeline wraps each stage in `with profile_utils.stage(name):` and
+counts things with `profile_utils.count(name, n)`. Until enable() is called
+these return a shared do nothing context or return at once so cost a
+single function call.
+
+Times & counts are recorded against the current document, (see
+document()), or against RUN_RECORD for work not done for any document such
+as reading the glossary.
+"""
+from __future__ import (
+    print_function,
+)
+
+import csv
+import json
+import time
+import contextlib
+
+RUN_RECORD = "(run)"
+_NULL_CONTEXT = contextlib.nullcontext()
+# The active Profile or None when profiling is disabled.
+_PROFILE = None
+
+
+class Profile(object):
+    """Timers & counters for each document."""
+
+    def __init__(self, cprofile_path=None):
+        """Initialise, starting cProfile if a path to dump it to is given."""
+        self.records = {}
+        self.current = self.record(RUN_RECORD)
+        self.cprofile_path = cprofile_path
+        self.cprofiler = None
+        if cprofile_path:
+            import cProfile  # Only needed for the dump
+
+            self.cprofiler = cProfile.Profile()
+            self.cprofiler.enable()
+
+    def record(self, name):
+        """Get the record for a document, creating it if needed."""
+        if name not in self.records:
+            self.records[name] = {"timers": {}, "counters": {}}
+        return self.records[name]
+
+    def add_time(self, name, seconds):
+        """Add time to a stage of the current document."""
+        timers = self.current["timers"]
+        timers[name] = timers.get(name, 0.0) + seconds
+
+    def add_count(self, name, number):
+        """Add to a counter of the current document."""
+        counters = self.current["counters"]
+        counters[name] = counters.get(name, 0) + number
+
+    def merge(self, records):
+        """Add records from another Profile, (from a worker process)."""
+        for name, other in records.items():
+            record = self.record(name)
+            for key in ("timers", "counters"):
+                for stage_name, value in other[key].items():
+                    record[key][stage_name] = record[key].get(stage_name, 0) + value
+
+    def aggregate(self):
+        """The totals over all of the records."""
+        total = {"timers": {}, "counters": {}}
+        for record in self.records.values():
+            for key in ("timers", "counters"):
+                for name, value in record[key].items():
+                    total[key][name] = total[key].get(name, 0) + value
+        return total
+
+
+class Stage(object):
+    """Context that adds the time it is entered for to a stage."""
+
+    __slots__ = ("profile", "name", "start")
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.add_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+def enable(cprofile_path=None):
+    """Start profiling, optionally with cProfile."""
+    global _PROFILE
+    if _PROFILE is None:
+        _PROFILE = Profile(cprofile_path)
+    return _PROFILE
+
+
+def enabled():
+    """Check if profiling is enabled."""
+    return _PROFILE is not None
+
+
+def stage(name):
+    """Context manager to time a stage, does nothing unless enabled."""
+    if _PROFILE is None:
+        return _NULL_CONTEXT
+    return Stage(_PROFILE, name)
+
+
+def count(name, number=1):
+    """Add to a counter, does nothing unless enabled."""
+    if _PROFILE is not None:
+        _PROFILE.add_count(name, number)
+
+
+@contextlib.contextmanager
+def document(name):
+    """Record the stages in the body against a document, timing the total."""
+    if _PROFILE is None:
+        yield
+        return
+    previous = _PROFILE.current
+    _PROFILE.current = _PROFILE.record(name)
+    try:
+        with Stage(_PROFILE, "total"):
+            yield
+    finally:
+        _PROFILE.current = previous
+
+
+def take_records():
+    """Get the document records so far & forget them, for worker processes."""
+    if _PROFILE is None:
+        return None
+    records = {
+        name: record
+        for name, record in _PROFILE.records.items()
+        if record is not _PROFILE.current
+    }
+    for name in records:
+        del _PROFILE.records[name]
+    return records
+
+
+def merge_records(records):
+    """Add the records from take_records in a worker process."""
+    if _PROFILE is not None and records:
+        _PROFILE.merge(records)
+
+
+def write_report(path):
+    """
+    Write the report as CSV, if path ends with .csv, or JSON with the
+    per document records & the aggregate.
+    """
+    aggregate = _PROFILE.aggregate()
+    if path.lower().endswith(".csv"):
+        timers = sorted(aggregate["timers"])
+        counters = sorted(aggregate["counters"])
+        with open(path, "wt", newline="") as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(
+                ["document"] + ["%s (s)" % name for name in timers] + counters
+            )
+            for name, record in list(_PROFILE.records.items()) + [
+                ("(aggregate)", aggregate)
+            ]:
+                writer.writerow(
+                    [name]
+                    + ["%.6f" % record["timers"].get(timer, 0.0) for timer in timers]
+                    + [record["counters"].get(counter, 0) for counter in counters]
+                )
+    else:
+        with open(path, "wt") as outfile:
+            json.dump(
+                {"documents": _PROFILE.records, "aggregate": aggregate},
+                outfile,
+                indent=2,
+                sort_keys=True,
+            )
+
+
+def show_summary():
+    """Print the aggregate times & counters."""
+    aggregate = _PROFILE.aggregate()
+    print("Time in each stage:")
+    for name, seconds in sorted(
+        aggregate["timers"].items(), key=lambda item: item[1], reverse=True
+    ):
+        print("  %10.3f s %s" % (seconds, name))
+    if aggregate["counters"]:
+        print("Counters:")
+        for name, number in sorted(aggregate["counters"].items()):
+            print("  %10d %s" % (number, name))
+
+
+def finish(report_path):
+    """Stop profiling, print the summary & write the report(s)."""
+    global _PROFILE
+    if _PROFILE is None:
+        return
+    show_summary()
+    write_report(report_path)
+    print("Profile written to", report_path)
+    if _PROFILE.cprofiler is not None:
+        _PROFILE.cprofiler.disable()
+        _PROFILE.cprofiler.dump_stats(_PROFILE.cprofile_path)
+        print("cProfile stats written to", _PROFILE.cprofile_path)
+    _PROFILE = None
+
+
+if __name__ == "__main__":
+    pass
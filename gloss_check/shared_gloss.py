@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Glossary index in a memory mapped file shared by worker processes.
+  Created: 18/10/2026
+
+Rather than each worker process holding its own copy of the glossary, the
+parent writes the index once to a file that the workers map read only, so
+the pages are shared. Pickling a SharedGlossary only sends the path.
+
+The file is a header then arrays of native unsigned 32 bit integers and
+the UTF-8 strings that they point to:
+
+    magic, version, key count, entry count, hash table size
+    key offsets     - the start of each sorted key, & the end of the last
+    entry offsets   - the start of each entry, in the order added
+    hash table      - key number + 1 for the slots in use, otherwise 0
+    keys, entries   - the strings
+
+Keys are looked up in the hash table, zlib.crc32 is used as it is the same
+in every process, or by a binary search of the sorted keys. The hashed
+lookups compare the keys through a memoryview of the map, without copying.
+"""
+from __future__ import (
+    print_function,
+)
+
+import os
+import mmap
+import zlib
+import array
+import struct
+import tempfile
+
+try:
+    import gloss_index
+except ImportError:
+    from gloss_check import gloss_index
+
+MAGIC = b"GLSH"
+VERSION = 1
+HEADER = struct.Struct("=4sIIII")
+
+
+def table_size(count):
+    """Get the size of hash table, a power of 2 at least twice count."""
+    size = 8
+    while size < 2 * count:
+        size *= 2
+    return size
+
+
+def write_table(path, index):
+    """Write a GlossaryIndex to path as a shared table."""
+    keys = sorted({gloss_index.make_key(entry).encode("utf-8") for entry in index})
+    entries = [entry.encode("utf-8") for entry in index]
+    size = table_size(len(keys))
+    key_offsets = array.array("I")
+    entry_offsets = array.array("I")
+    hash_table = array.array("I", bytes(4 * size))
+    position = HEADER.size + 4 * (len(keys) + len(entries) + 2 + size)
+    for number, key in enumerate(keys):
+        key_offsets.append(position)
+        position += len(key)
+        slot = zlib.crc32(key) & (size - 1)
+        while hash_table[slot]:
+            slot = (slot + 1) & (size - 1)
+        hash_table[slot] = number + 1
+    key_offsets.append(position)
+    for entry in entries:
+        entry_offsets.append(position)
+        position += len(entry)
+    entry_offsets.append(position)
+    with open(path, "wb") as outfile:
+        outfile.write(HEADER.pack(MAGIC, VERSION, len(keys), len(entries), size))
+        for table in (key_offsets, entry_offsets, hash_table):
+            outfile.write(table.tobytes())
+        outfile.write(b"".join(keys))
+        outfile.write(b"".join(entries))
+
+
+class SharedGlossary(gloss_index.GlossaryIndex):
+    """
+    Read only GlossaryIndex, matching in the same way, backed by a memory
+    mapped shared table.
+    """
+
+    def __init__(self, path):
+        """Map the table in path, the entries & keys are only in the table."""
+        super(SharedGlossary, self).__init__()
+        self.path = path
+        with open(path, "rb") as infile:
+            self.map = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            self.key_count,
+            self.entry_count,
+            self.size,
+        ) = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError("%s is not a shared glossary table" % path)
+        int_count = self.key_count + self.entry_count + 2 + self.size
+        self.view = memoryview(self.map)
+        ints = self.view[HEADER.size : HEADER.size + 4 * int_count].cast("I")
+        self.key_offsets = ints[: self.key_count + 1]
+        start = self.key_count + 1
+        self.entry_offsets = ints[start : start + self.entry_count + 1]
+        start += self.entry_count + 1
+        self.hash_table = ints[start : start + self.size]
+
+    def close(self):
+        """Unmap the table."""
+        self.key_offsets.release()
+        self.entry_offsets.release()
+        self.hash_table.release()
+        self.view.release()
+        self.map.close()
+
+    def __reduce__(self):
+        """Pickle as the path so that workers map the same table."""
+        return (SharedGlossary, (self.path,))
+
+    def key(self, number):
+        """Get a key, as a memoryview of the map, by its sorted position."""
+        return self.view[self.key_offsets[number] : self.key_offsets[number + 1]]
+
+    def key_is(self, number, key):
+        """Check if the key at a sorted position is key, as bytes."""
+        start = self.key_offsets[number]
+        end = self.key_offsets[number + 1]
+        return end - start == len(key) and self.view[start:end] == key
+
+    def entry(self, number):
+        """Get an entry by its position."""
+        return str(
+            self.view[self.entry_offsets[number] : self.entry_offsets[number + 1]],
+            "utf-8",
+        )
+
+    def has_key(self, key):
+        """Hashed lookup of a key, (from make_key)."""
+        key = key.encode("utf-8")
+        slot = zlib.crc32(key) & (self.size - 1)
+        while self.hash_table[slot]:
+            if self.key_is(self.hash_table[slot] - 1, key):
+                return True
+            slot = (slot + 1) & (self.size - 1)
+        return False
+
+    def bisect(self, key):
+        """Binary search for the position of the first key >= key."""
+        key = key.encode("utf-8")
+        low, high = 0, self.key_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.key(middle).tobytes() < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find(self, key):
+        """Binary search lookup of a key, (from make_key)."""
+        number = self.bisect(key)
+        return number < self.key_count and self.key_is(number, key.encode("utf-8"))
+
+    def prefixed(self, prefix):
+        """Yield the keys starting with prefix, in order, by binary search."""
+        encoded = prefix.encode("utf-8")
+        for number in range(self.bisect(prefix), self.key_count):
+            key = self.key(number)
+            if key[: len(encoded)] != encoded:
+                break
+            yield str(key, "utf-8")
+
+    def add(self, entry, definition=None):
+        """The table is read only."""
+        raise TypeError("SharedGlossary is read only")
+
+    def __len__(self):
+        return self.entry_count
+
+    def __iter__(self):
+        return (self.entry(number) for number in range(self.entry_count))
+
+    def __repr__(self):
+        return "SharedGlossary(%d entries in %s)" % (self.entry_count, self.path)
+
+
+def share(index):
+    """Write a GlossaryIndex to a temporary shared table & map it."""
+    handle, path = tempfile.mkstemp(prefix="gloss_check_", suffix=".glsh")
+    os.close(handle)
+    try:
+        write_table(path, gloss_index.as_index(index))
+        return SharedGlossary(path)
+    except Exception:
+        os.remove(path)
+        raise
+
+
+def unshare(shared):
+    """Unmap & remove a shared table made by share()."""
+    shared.close()
+    try:
+        os.remove(shared.path)
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    pass
@@ -6,37 +6,48 @@
   Created: 11/04/2017
 """
 
+import os
 import sys
+import re
 import textwrap
 import codecs
 import time
+import collections
 
 try:
-    import win_unicode_console as wuc
+    import cache_utils
+    import gloss_index
+    import lazy_utils
+    import profile_utils
+    import token_utils
+    import gloss_loaders
 except ImportError:
-    wuc = None
+    from gloss_check import cache_utils
+    from gloss_check import gloss_index
+    from gloss_check import lazy_utils
+    from gloss_check import profile_utils
+    from gloss_check import token_utils
+    from gloss_check import gloss_loaders
 
-try:
-    import enchant
-except ImportError:
-    enchant = None
-
-try:
-    from enchant import tokenize as etock
-
-    # import enchant.tokenize as etock
-except ImportError:
-    etock = None
+# Pool of enchant dictionaries by language for the life of the process.
+_SPELL_DICTS = {}
+# Remembered spelling verdicts by language & those not yet persisted.
+_SPELL_MEMOS = {}
+_SPELL_PENDING = {}
+SPELL_MEMO_MAX = 500000
+# Number of words rejected by each candidate rule.
+RULE_STATS = collections.Counter()
 
 
 def clean_wordlist(wordlist, minacc=1):
     """Clean up a word list."""
     validwords = set()
-    for word in wordlist:
-        # cleanword = word.decode('utf-8', 'ignore').strip(u'“”,\'"‘ ’()./:;')
-        cleanword = word.strip("“”,'\"‘ ’./:;()[]{}")
-        if len(cleanword) >= minacc:
-            validwords.add(cleanword)
+    with profile_utils.stage("clean"):
+        for word in wordlist:
+            # cleanword = word.decode('utf-8', 'ignore').strip(u'“”,\'"‘ ’()./:;')
+            cleanword = word.strip("“”,'\"‘ ’./:;()[]{}")
+            if len(cleanword) >= minacc:
+                validwords.add(cleanword)
     return list(validwords)
 
 
@@ -46,6 +57,7 @@ def smart_print(options, entries):
         outtext = ["\n".join(entries)]
     else:
         outtext = textwrap.wrap(", ".join(entries), 78)
+    wuc = lazy_utils.optional_import("win_unicode_console")
     if wuc:  # Use win_unicode_console if have have it?
         wuc.enable()
         print("\n".join(outtext))
@@ -60,15 +72,18 @@ def smart_print(options, entries):
 
 
 def get_glossary(ops):
-    """Get predefined glossaries."""
+    """Get predefined glossaries, with the definitions of their entries."""
     ingloss = []
+    definitions = {}
     if hasattr(ops, "list_langs") and ops.list_langs:
+        enchant = lazy_utils.get_enchant()
         if enchant is None:
             print("No spell checker - try `pip install pyenchant`")
         else:
             print(enchant.list_languages())
         sys.exit()
     if ops.glossary:
+        profile_utils.count("glossary files", len(ops.glossary))
         print("Reading Glossary:")
         for item in ops.glossary:
             if (
@@ -76,17 +91,201 @@ def get_glossary(ops):
                 or sys.version_info[0] == 2
                 and isinstance(item, unicode)
             ):
-                infile = open(item)
-            else:
-                infile = item
-            print("   ", infile.name)
-            ingloss.extend(tokenize(infile.read(), ops))
-            infile.close()
+                path = item
+            else:  # An open file from the command line, read by path
+                path = item.name
+                if os.path.isfile(path):
+                    item.close()
+            print("   ", path)
+            if os.path.isfile(path):
+                entries = gloss_loaders.load_glossary(path, ops)
+            else:  # Such as stdin
+                entries = [(word, None) for word in tokenize(item.read(), ops)]
+                item.close()
+            for entry, definition in entries:
+                ingloss.append(entry)
+                if definition:
+                    definitions.setdefault(entry, definition)
     else:
         print("No External Glossary Specified")
     ingloss = clean_wordlist(ingloss)
     ingloss = get_candidates_from_list(ingloss, extern_gloss=[], options=ops)
-    return ingloss
+    flush_spell_memo(ops)
+    return gloss_index.GlossaryIndex(ingloss, definitions)
+
+
+def get_spell_dict(lang):
+    """Get the pooled enchant dictionary for a language."""
+    chker = _SPELL_DICTS.get(lang)
+    if chker is None:
+        chker = lazy_utils.get_enchant().Dict(lang)
+        _SPELL_DICTS[lang] = chker
+    return chker
+
+
+def spell_dict_version(lang):
+    """Get the version of enchant & the provider of the dictionary for lang."""
+    chker = get_spell_dict(lang)
+    return f"{lazy_utils.get_enchant().__version__}-{chker.provider.name}"
+
+
+def dictionary_version(options):
+    """
+    Get the version of the dictionary that options would spell check with,
+    None if there is no spell checking.
+    """
+    enchant = lazy_utils.get_enchant()
+    lang = getattr(options, "lang", None)
+    if enchant is None or lang is None or lang.upper() == "NONE":
+        return None
+    try:
+        return f"{lang}-{spell_dict_version(lang)}"
+    except enchant.errors.DictNotFoundError:
+        return None
+
+
+def spell_memo_path(lang):
+    """Get the path to persist the verdicts for the current dictionary version."""
+    return cache_utils.spell_cache_path(lang, spell_dict_version(lang))
+
+
+def get_spell_memo(lang, persist=False):
+    """Get the remembered verdicts for a language, optionally from disk."""
+    memo = _SPELL_MEMOS.get(lang)
+    if memo is None:
+        memo = {}
+        if persist:
+            memo.update(
+                cache_utils.load_verdicts(spell_memo_path(lang), SPELL_MEMO_MAX)
+            )
+        _SPELL_MEMOS[lang] = memo
+    return memo
+
+
+def get_spell_checker(options):
+    """
+    Get a function that returns True if a word is in the dictionary for
+    options.lang, using the pooled dictionary and remembered verdicts.
+    """
+    lang = options.lang
+    chker = get_spell_dict(lang)
+    memo = get_spell_memo(lang, cache_utils.cache_enabled(options))
+    pending = _SPELL_PENDING.setdefault(lang, {})
+
+    def is_spelt_ok(word):
+        """Check the spelling of a single word."""
+        verdict = memo.get(word)
+        if verdict is None:
+            profile_utils.count("spell checks")
+            with profile_utils.stage("spell check"):
+                verdict = chker.check(word)
+            if len(memo) >= SPELL_MEMO_MAX:  # Forget the oldest
+                del memo[next(iter(memo))]
+            memo[word] = verdict
+            pending[word] = verdict
+        return verdict
+
+    return is_spelt_ok
+
+
+def flush_spell_memo(options):
+    """Persist any new spelling verdicts, if the cache is enabled."""
+    for lang, pending in _SPELL_PENDING.items():
+        if pending and cache_utils.cache_enabled(options):
+            cache_utils.append_verdicts(spell_memo_path(lang), pending)
+        pending.clear()
+
+
+def is_chars_only(word):
+    """Only alphabetic characters or dots."""
+    letters = word.replace(".", "")
+    return not letters or letters.isalpha()
+
+
+def is_upper_only(word):
+    """All upper case, may end with s."""
+    return (
+        len(word) > 0
+        and (word[-1].isupper() or word[-1] == "s")
+        and all(c.isupper() for c in word[:-1] if c.isalpha())
+    )
+
+
+def is_camel(word):
+    """Any upper case after the first letter."""
+    return len(word) > 1 and any(c.isupper() for c in word[1:])
+
+
+class CandidateClassifier(object):
+    """
+    Single pass candidate filter compiled from the options.
+
+    The rules are (name, keep) pairs, tried in order with the cheapest first,
+    the first rule that does not keep a word rejects it & is counted.
+    """
+
+    def __init__(self, rules):
+        """Initialise with a list of (name, keep) rules."""
+        self.rules = rules
+        self.rejected = collections.Counter()
+
+    def __call__(self, word):
+        for name, keep in self.rules:
+            if not keep(word):
+                self.rejected[name] += 1
+                return False
+        return True
+
+    def filter(self, words):
+        """Get the words that pass all of the rules."""
+        kept = [word for word in words if self(word)]
+        RULE_STATS.update(self.rejected)
+        self.rejected.clear()
+        return kept
+
+
+def compile_classifier(options, extern_gloss=None, doc_gloss=None):
+    """Compile the options, glossaries & patterns into a CandidateClassifier."""
+    rules = []
+    if options.chars_only:  # Only alpha based
+        rules.append(("chars only", is_chars_only))
+    if options.upper_only:  # All upper only
+        rules.append(("upper only", is_upper_only))
+    if options.inc_camel:  # Camel Case
+        rules.append(("camel case", is_camel))
+    if extern_gloss:  # We have an external glossary
+        extern_gloss = gloss_index.as_index(extern_gloss)
+        rules.append(("external glossary", lambda w: w not in extern_gloss))
+    if doc_gloss:  # We have a document glossary
+        doc_gloss = gloss_index.as_index(doc_gloss)
+        rules.append(("document glossary", lambda w: w not in doc_gloss))
+    for pattern in getattr(options, "exclude_pattern", None) or []:
+        regex = re.compile(pattern)
+        rules.append(
+            ("exclude %s" % pattern, lambda w, regex=regex: not regex.fullmatch(w))
+        )
+    include = getattr(options, "include_pattern", None) or []
+    if include:
+        regex = re.compile("|".join(["(?:%s)" % pattern for pattern in include]))
+        rules.append(("include patterns", lambda w: regex.fullmatch(w) is not None))
+    enchant = lazy_utils.get_enchant()
+    if enchant is not None and options.lang.upper() != "NONE":
+        try:  # Spelling is the most expensive so goes last
+            is_spelt_ok = get_spell_checker(options)
+            rules.append(("dictionary", lambda w: bool(w) and not is_spelt_ok(w)))
+        except enchant.errors.DictNotFoundError:
+            print(options.lang, "Dictionary Not Found, use -ll for list of options.")
+            time.sleep(1.5)
+    return CandidateClassifier(rules)
+
+
+def show_rule_stats(stats=None):
+    """Print the number of words rejected by each rule."""
+    if stats is None:
+        stats = RULE_STATS
+    print("Words rejected by each rule:")
+    for name, count in stats.most_common():
+        print("  %8d %s" % (count, name))
 
 
 def get_candidates_from_list(words, extern_gloss=None, doc_gloss=None, options=None):
@@ -95,51 +294,37 @@ def get_candidates_from_list(words, extern_gloss=None, doc_gloss=None, options=N
 
     Params:
         words: The word list.
-        existing_gloss: An existing glossary to ignore.
+        extern_gloss: An existing glossary, (list or GlossaryIndex), to ignore.
+        doc_gloss: The document glossary, (list or GlossaryIndex), to ignore.
         Options is a namespace with options of:
         upper_only: Only consider all upper case strings as candidates.
         inc_cammel: Include any word with upper case after the first.
         chars_only: Exclude words with embedded numbers or symbols.
         lang: Language code to spell check against.
+        exclude_pattern: Regular expressions for words to exclude.
+        include_pattern: Regular expressions that candidates must match.
     """
-    if enchant is not None and options.lang.upper() != "NONE":
-        try:
-            chker = enchant.Dict(options.lang)
-            words = [
-                w for w in words if len(w) and not chker.check(w)
-            ]  # Not in dictionary
-        except enchant.errors.DictNotFoundError:
-            print(options.lang, "Dictionary Not Found, use -ll for list of options.")
-            time.sleep(1.5)
-    if options.chars_only:  # Only alpha based
-        words = [w for w in words if all([c.isalpha() or c == "." for c in w])]
-    if options.upper_only:  # All upper only
-        words = [
-            w
-            for w in words
-            if all([c.isupper() for c in w[:-1] if c.isalpha()])
-            and (w[-1].isupper() or w[-1] == "s")
-        ]
-    if options.inc_camel:  # Camel Case
-        words = [w for w in words if len(w) > 1 and any([c.isupper() for c in w[1:]])]
-    if extern_gloss:  # We have an external glossary
-        words = [w for w in words if w not in extern_gloss]
-    if doc_gloss:  # We have a document glossary
-        words = [w for w in words if w not in doc_gloss]
+    with profile_utils.stage("filter"):
+        classifier = compile_classifier(options, extern_gloss, doc_gloss)
+        words = classifier.filter(words)
+    profile_utils.count("candidates", len(words))
 
     return sorted(words, key=lambda s: s.lower())
 
 
 def tokenize(text, options):
     """Split the text into words."""
-    tokzr = None
-    if etock is not None and options.etok:
-        try:
-            tokzr = etock.get_tokenizer(options.lang)
-        except enchant.errors.TokenizerNotFoundError:
-            tokzr = None
-
-    if tokzr is None:
-        return text.split()
-    else:
-        return [word for (word, dummy) in tokzr(text)]
+    with profile_utils.stage("tokenize"):
+        words = token_utils.get_words(text, token_utils.tokenizer_lang(options))
+    profile_utils.count("words", len(words))
+    return words
+
+
+def tokenize_offsets(text, options):
+    """Split the text into (word, offset) pairs."""
+    with profile_utils.stage("tokenize"):
+        tokens = list(
+            token_utils.iter_tokens(text, token_utils.tokenizer_lang(options))
+        )
+    profile_utils.count("words", len(tokens))
+    return tokens
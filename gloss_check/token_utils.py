@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Tokenizer engine, splits text into words with their offsets.
+  Created: 18/10/2026
+
+The text is first normalized in a single pass, typographic quotes, hyphens
+& spaces are replaced by their plain equivalents. Each replacement is a
+single character so the offsets in the normalized text are the offsets in
+the original. A regular expression substitution is used for the pass as
+str.translate looks up every character of non-ASCII text in the table,
+making it several times slower.
+
+Words are then found by the enchant tokenizer for the language, fetched
+once per language & reused, or by splitting on white space & trimming the
+same punctuation as clean_wordlist. When the offsets are wanted a
+precompiled regular expression gives the same words as the split, which is
+faster when only the words are needed.
+"""
+from __future__ import (
+    print_function,
+)
+
+import re
+
+try:
+    import lazy_utils
+except ImportError:
+    from gloss_check import lazy_utils
+
+NORMALIZE = {
+    "\u2018": "'",  # Single quotes & prime
+    "\u2019": "'",
+    "\u201a": "'",
+    "\u201b": "'",
+    "\u2032": "'",
+    "\u201c": '"',  # Double quotes
+    "\u201d": '"',
+    "\u201e": '"',
+    "\u201f": '"',
+    "\u2010": "-",  # Hyphen & non-breaking hyphen, (not dashes)
+    "\u2011": "-",
+    "\u00a0": " ",  # Non-breaking & fixed width spaces
+    "\u2002": " ",
+    "\u2003": " ",
+    "\u2004": " ",
+    "\u2005": " ",
+    "\u2006": " ",
+    "\u2007": " ",
+    "\u2008": " ",
+    "\u2009": " ",
+    "\u200a": " ",
+    "\u202f": " ",
+}
+NORMALIZE_RE = re.compile("[%s]" % "".join(NORMALIZE))
+# Punctuation trimmed from the ends of words, as by clean_wordlist once the
+# text has been normalized.
+TRIM = ",'\"./:;()[]{}"
+_TRIM_SET = re.escape(TRIM)
+# A run of non-space characters without leading or trailing punctuation.
+WORD_RE = re.compile(r"[^\s{0}]+(?:[{0}]+[^\s{0}]+)*".format(_TRIM_SET))
+
+# Enchant tokenizers by language, None if there isn't one, for the life of
+# the process.
+_TOKENIZERS = {}
+
+
+def normalize(text):
+    """Replace the typographic characters, keeping the offsets unchanged."""
+    if text.isascii():
+        return text
+    return NORMALIZE_RE.sub(_replace, text)
+
+
+def _replace(match):
+    """Get the replacement for a typographic character."""
+    return NORMALIZE[match.group()]
+
+
+def tokenizer_lang(options):
+    """Get the language to tokenize with enchant for, None for the fast path."""
+    if not getattr(options, "etok", False):
+        return None
+    return getattr(options, "lang", None)
+
+
+def get_tokenizer(lang):
+    """Get the cached enchant tokenizer for a language, None if there isn't one."""
+    if lang is None:
+        return None
+    if lang not in _TOKENIZERS:
+        tokzr = None
+        etock = lazy_utils.get_etock()
+        if etock is not None:
+            try:
+                tokzr = etock.get_tokenizer(lang)
+            except lazy_utils.get_enchant().errors.TokenizerNotFoundError:
+                tokzr = None
+        _TOKENIZERS[lang] = tokzr
+    return _TOKENIZERS[lang]
+
+
+def iter_tokens(text, lang=None):
+    """Yield (word, offset) for the words in the text."""
+    text = normalize(text)
+    tokzr = get_tokenizer(lang)
+    if tokzr is None:
+        for match in WORD_RE.finditer(text):
+            yield match.group(), match.start()
+    else:
+        for word, offset in tokzr(text):
+            yield word, offset
+
+
+def get_words(text, lang=None):
+    """Get the list of words in the text, without their offsets."""
+    tokzr = get_tokenizer(lang)
+    if tokzr is None:
+        return [
+            word for word in [w.strip(TRIM) for w in normalize(text).split()] if word
+        ]
+    return [word for word, dummy in tokzr(normalize(text))]
+
+
+if __name__ == "__main__":
+    import sys
+
+    for WORD, OFFSET in iter_tokens(" ".join(sys.argv[1:])):
+        print(OFFSET, WORD)
@@ -11,24 +11,10 @@ from __future__ import (
 
 import sys
 
-
-try:
-    import wx
-except ImportError:
-    wx = None
-try:
-    import enchant
-except ImportError:
-    enchant = None
-try:
-    import docx
-except ImportError:
-    docx = None
-
 try:
-    import textract
+    import lazy_utils
 except ImportError:
-    textract = None
+    from gloss_check import lazy_utils
 
 try:
     from _version import __version__
@@ -39,7 +25,8 @@ except ImportError:
         print(
             "Can't get version information\nUse: \n"
             "python -c\"import setuptools_scm;setuptools_scm.get_version('.', write_to='gloss_check/_version.py')\""
-            "\nto fix!"
+            "\nto fix!",
+            file=sys.stderr,
         )
         # __version__ = version("gloss_check")
         __version__ = "0.0.0.NoVersion"
@@ -51,6 +38,10 @@ except ImportError:
 
 def get_version_info():
     """Get the version information."""
+    wx = lazy_utils.optional_import("wx")
+    enchant = lazy_utils.get_enchant()
+    docx = lazy_utils.get_docx()
+    textract = lazy_utils.get_textract()
     version_info = ["Glossary Checker %s" % __version__]
     if hasattr(sys, "frozen"):
         version_info.append("Running Executable built from Python %s" % sys.version)
@@ -4,59 +4,200 @@
   Author:  Steve Barnes --<Steven.Barnes@bhge.com>
   Purpose: XML Tree based document processing.
   Created: 17/04/2017
+
+As well as the body, word/document.xml, the text of a document is in the
+headers, footers, footnotes, endnotes & comments parts of the package and
+in text boxes, which are nested in the paragraphs of any part. Each of
+these can be excluded with the exclude_parts option.
+
+Tables are read into a grid of columns, each a list of the cell texts, with
+merged cells resolved: the text of a cell spanning several grid columns,
+(gridSpan), or continued down the rows, (vMerge), is in its first grid
+position & the positions it covers are empty so its words are only counted
+once but the other cells stay in their columns.
 """
 from __future__ import (
     print_function,
 )
 
-import os
+import re
 import zipfile
+import collections
 
 try:
-    from xml.etree.cElementTree import XML
+    from xml.etree.cElementTree import XML, iterparse
 except ImportError:
-    from xml.etree.ElementTree import XML
+    from xml.etree.ElementTree import XML, iterparse
 
 try:
     import text_utls
+    import profile_utils
+    import doc_source
+    import token_utils
+    import position_index
+    import inline_defs
 except ImportError:
     from gloss_check import text_utls
+    from gloss_check import profile_utils
+    from gloss_check import doc_source
+    from gloss_check import token_utils
+    from gloss_check import position_index
+    from gloss_check import inline_defs
 
 # Constants used to decode MS Word Open Document Format
 WRD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
 TABLE = WRD_NS + "tbl"
 PARA = WRD_NS + "p"
 TEXT = WRD_NS + "t"
+TXBX = WRD_NS + "txbxContent"
+ROW = WRD_NS + "tr"
+CELL = WRD_NS + "tc"
+SDT = WRD_NS + "sdt"
+SDT_CONTENT = WRD_NS + "sdtContent"
+ROW_PROPS = WRD_NS + "trPr"
+CELL_PROPS = WRD_NS + "tcPr"
+GRID_BEFORE = WRD_NS + "gridBefore"
+GRID_SPAN = WRD_NS + "gridSpan"
+V_MERGE = WRD_NS + "vMerge"
+VAL = WRD_NS + "val"
+# Text boxes are given twice, as DrawingML & as a VML fallback.
+FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+BODY = "body"
+TEXTBOXES = "textboxes"
+BODY_PART = "word/document.xml"
+# The optional parts of a document & the package members that hold them.
+PARTS = collections.OrderedDict(
+    [
+        ("headers", re.compile(r"^word/header\d*\.xml$")),
+        ("footers", re.compile(r"^word/footer\d*\.xml$")),
+        ("footnotes", re.compile(r"^word/footnotes\.xml$")),
+        ("endnotes", re.compile(r"^word/endnotes\.xml$")),
+        ("comments", re.compile(r"^word/comments\.xml$")),
+    ]
+)
+PART_NAMES = list(PARTS) + [TEXTBOXES]
+
+
+def para_text(paragraph):
+    """Get the text of a paragraph element, the runs are joined without spaces."""
+    return "".join([node.text for node in paragraph.iter(TEXT) if node.text])
+
 
+def iter_children(elem, tag):
+    """Yield the children of an element with tag, including any in content controls."""
+    for child in elem:
+        if child.tag == tag:
+            yield child
+        elif child.tag == SDT:
+            for content in child.iter(SDT_CONTENT):
+                for grandchild in content:
+                    if grandchild.tag == tag:
+                        yield grandchild
 
-def get_tree_table_wordlist(tree, minacc=1, tabno=None):
+
+def get_prop(elem, props, name, default=None):
+    """Get the w:val of a property of an element, default if not set."""
+    prop = elem.find(props + "/" + name)
+    if prop is None:
+        return default
+    return prop.get(VAL, "")
+
+
+def get_table_grid(table):
     """
-    Get the wordlist from an XML tree.
-    If tabno is None then all tables, if it is a simple number then that one and
-    if it is a list those.
+    Get the cell texts of a w:tbl element as a list of columns, with merged
+    cells resolved, the paragraphs of a cell are joined by newlines, (as
+    python-docx nested tables are not included).
     """
-    tables = []
-    indexes = []
-    texts = []
-    for index, tab in enumerate(tree.getiterator(TABLE)):
-        tables.append([node.text for node in tab.getiterator(TEXT)])
-        indexes.append(index)
-    if tabno is None:
-        req_tabs = indexes
-    elif isinstance(tabno, int):
-        req_tabs = [tabno]
-    elif isinstance(tabno, list) and all([isinstance(mem, int) for mem in tabno]):
-        req_tabs = tabno
-    else:
-        raise ValueError("tabno must be one of None, int, list of ints")
-    for index in req_tabs:
-        texts.extend(tables[index])
-    wordlist = set()
-    if texts:
-        text = "".join(texts)
-        wordlist.update(text.split())
-    cwordlist = text_utls.clean_wordlist(wordlist, minacc)
-    return cwordlist
+    columns = []
+    for row_no, row in enumerate(iter_children(table, ROW)):
+        col_no = int(get_prop(row, ROW_PROPS, GRID_BEFORE, 0) or 0)
+        cells = []
+        for cell in iter_children(row, CELL):
+            span = int(get_prop(cell, CELL_PROPS, GRID_SPAN, 1) or 1)
+            if get_prop(cell, CELL_PROPS, V_MERGE, "restart") == "restart":
+                cells.append(
+                    (
+                        col_no,
+                        "\n".join(
+                            para_text(para) for para in iter_children(cell, PARA)
+                        ),
+                    )
+                )
+            col_no += span
+        while len(columns) < col_no:  # Ragged tables may gain columns
+            columns.append([""] * row_no)
+        for column in columns:
+            column.append("")
+        for col_no, text in cells:
+            columns[col_no][row_no] = text
+    return columns
+
+
+def enabled_parts(options):
+    """Get the optional parts of a document that are not excluded by options."""
+    exclude = getattr(options, "exclude_parts", None) or []
+    return [part for part in PART_NAMES if part not in exclude]
+
+
+def find_parts(names, parts):
+    """Get (part, member) for the members of a package in the wanted parts."""
+    found = []
+    for part, pattern in PARTS.items():
+        if part in parts:
+            found.extend(
+                [(part, name) for name in sorted(names) if pattern.match(name)]
+            )
+    return found
+
+
+def count_part_words(part_words):
+    """Add the number of words from each part of a document to the profile."""
+    for part, number in part_words.items():
+        profile_utils.count("words: %s" % part, number)
+
+
+def iter_docx_paragraphs(source):
+    """
+    Stream the paragraphs from a word/document.xml, or other part, file or
+    file like object.
+
+    Yields (text, in_table, in_textbox) for each paragraph as it is completed
+    so only a single pass is needed, each paragraph or table is discarded
+    once it has been processed to keep the memory use constant regardless of
+    the size of the document. The VML fallback copies of text boxes are
+    skipped.
+    """
+    stack = []
+    table_depth = 0
+    textbox_depth = 0
+    fallback_depth = 0
+    for event, elem in iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            if elem.tag == TABLE:
+                table_depth += 1
+            elif elem.tag == TXBX:
+                textbox_depth += 1
+            elif elem.tag == FALLBACK:
+                fallback_depth += 1
+            continue
+        stack.pop()
+        if elem.tag == PARA:
+            if not fallback_depth:
+                yield para_text(elem), table_depth > 0, textbox_depth > 0
+        elif elem.tag == TABLE:
+            table_depth -= 1
+        elif elem.tag == TXBX:
+            textbox_depth -= 1
+        elif elem.tag == FALLBACK:
+            fallback_depth -= 1
+        else:
+            continue
+        elem.clear()
+        if stack:  # Free the processed element from its parent
+            stack[-1].remove(elem)
 
 
 def get_docx_tree_wordlist(path, options):  # , extract_glossary=False):
@@ -64,28 +205,60 @@ def get_docx_tree_wordlist(path, options):  # , extract_glossary=False):
     Take the path of a docx file as argument, return the list of words.
     Note that this doesn't work as well as get_docx2_wordlist
     """
-    if not os.path.splitext(path)[-1].lower() == ".docx":
-        return False, []
-    document = zipfile.ZipFile(path)
-    xml_content = document.read("word/document.xml")
-    document.close()
-    tree = XML(xml_content)
+    if not doc_source.doc_extension(path) == ".docx":
+        return False, [], []
+    return get_docx_source_wordlist(doc_source.open_source(path), options)
+
+
+def get_docx_source_wordlist(source, options):
+    """
+    Get the list of words from a docx supplied as a path or file object.
 
+    The package is opened once & each wanted part streamed in turn.
+    """
     wordlist = set()
-    for paragraph in tree.getiterator(PARA):
-        texts = [node.text for node in paragraph.getiterator(TEXT) if node.text]
-        if texts:
-            text = "".join(texts)
-            wordlist.update(text.split())
+    tabwords = set()
+    parts = enabled_parts(options)
+    part_words = collections.Counter()
+    index = position_index.current()
+    find_defs = getattr(options, "inline_defs", False)
+    definitions = collections.OrderedDict()
+    with profile_utils.stage("parse"):
+        with zipfile.ZipFile(source) as document:
+            members = [(BODY, BODY_PART)] + find_parts(document.namelist(), parts)
+            for part, name in members:
+                with document.open(name) as xml_content:
+                    for text, in_table, in_textbox in iter_docx_paragraphs(xml_content):
+                        if in_textbox and TEXTBOXES not in parts:
+                            continue
+                        where = TEXTBOXES if in_textbox else part
+                        if index is None and not find_defs:
+                            words = token_utils.get_words(text)
+                        else:
+                            tokens = list(token_utils.iter_tokens(text))
+                            if index is not None:
+                                index.add_texts(where, [text], tokens)
+                            if find_defs:
+                                inline_defs.add_definitions(definitions, text, tokens)
+                            words = [word for word, dummy in tokens]
+                        wordlist.update(words)
+                        part_words[where] += len(words)
+                        if in_table and part == BODY and not in_textbox:
+                            tabwords.update(words)
+    count_part_words(part_words)
 
     cwordlist = text_utls.clean_wordlist(wordlist, options.min_acc)
-    tabwords = get_tree_table_wordlist(tree, minacc=options.min_acc)
-    print(len(tabwords), "words from tables.")
-    for word in tabwords:
-        if word not in cwordlist:
-            cwordlist.append(word)
+    print(
+        len(text_utls.clean_wordlist(tabwords, options.min_acc)),
+        "words from tables.",
+    )
+    inline_defs.show_definitions(definitions)
 
-    return len(cwordlist) > 0, sorted(cwordlist, key=lambda s: s.lower()), []
+    return (
+        len(cwordlist) > 0,
+        sorted(cwordlist, key=lambda s: s.lower()),
+        sorted(definitions, key=lambda s: s.lower()),
+    )
 
 
 if __name__ == "__main__":
@@ -22,7 +22,8 @@ setuptools_scm.get_version(".", write_to="gloss_check/_version.py")
 # Dependencies are automatically detected, but it might need fine tuning.
 # "packages": ["os"] is used as example only
 build_exe_options = {
-    "packages": ["gloss_check", "os", "enchant"],
+    # Optional packages are imported lazily by name so must be listed.
+    "packages": ["gloss_check", "os", "enchant", "docx", "win_unicode_console"],
     "excludes": ["tkinter"],
 }
 
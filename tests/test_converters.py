@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Tests of the converter pool using the fake converter.
+  Created: 18/10/2026
+"""
+import os
+import sys
+import argparse
+
+import pytest
+
+from gloss_check import converters
+from gloss_check import gloss_utils
+from gloss_check.converters import ConverterPool, FakeConverter
+
+
+@pytest.fixture(name="fake")
+def fixture_fake():
+    """Reset the fake converter counts."""
+    FakeConverter.started = 0
+    FakeConverter.batches = 0
+    FakeConverter.conversions = 0
+    return FakeConverter
+
+
+@pytest.fixture(name="docs")
+def fixture_docs(tmp_path):
+    """Some documents with distinct contents."""
+    paths = []
+    for number in range(5):
+        path = tmp_path / ("doc%d.doc" % number)
+        path.write_bytes(b"document %d" % number)
+        paths.append(str(path))
+    return paths
+
+
+def test_converter_started_once(fake, docs):
+    """One converter does all of the conversions of a pool."""
+    pool = ConverterPool(fake)
+    try:
+        for path in docs:
+            with open(path, "rb") as infile:
+                assert pool.convert(path) == infile.read()
+    finally:
+        pool.close()
+    assert fake.started == 1
+    assert fake.conversions == len(docs)
+
+
+def test_queued_documents_are_batched(fake, docs):
+    """Documents queued together are given to the converter as one batch."""
+    pool = ConverterPool(fake)
+    try:
+        futures = pool.submit_many(docs)
+        results = [future.result() for future in futures]
+    finally:
+        pool.close()
+    assert results == [b"document %d" % number for number in range(len(docs))]
+    assert fake.started == 1
+    assert fake.batches == 1
+
+
+def test_batch_errors_are_per_document(fake, docs):
+    """A document that can't be converted doesn't stop the rest of a batch."""
+    pool = ConverterPool(fake)
+    try:
+        futures = pool.submit_many(docs[:2] + ["missing.doc"] + docs[2:])
+        with pytest.raises(converters.ConversionError):
+            futures[2].result()
+        assert [future.result() for future in futures[:2]] == [
+            b"document 0",
+            b"document 1",
+        ]
+    finally:
+        pool.close()
+
+
+def test_failed_start_is_reported(docs):
+    """A converter that can't start fails each conversion with ConversionError."""
+
+    def broken():
+        """A converter factory that fails."""
+        raise converters.ConversionError("not installed")
+
+    pool = ConverterPool(broken)
+    try:
+        with pytest.raises(converters.ConversionError, match="not installed"):
+            pool.convert(docs[0])
+    finally:
+        pool.close()
+
+
+def test_convert_to_docx_pools_by_name(fake, docs):
+    """The converter selected by the options is started once for the run."""
+    options = argparse.Namespace(converter="fake")
+    try:
+        for path in docs:
+            converters.convert_to_docx(path, options)
+    finally:
+        converters.close_pools()
+    assert fake.started == 1
+    assert fake.conversions == len(docs)
+
+
+FAKE_SOFFICE = """#!/bin/sh
+echo "$@" >> "%s"
+while [ "$1" != "--outdir" ]; do shift; done
+outdir="$2"
+shift 2
+for path in "$@"; do
+    name=$(basename "$path")
+    cp "$path" "$outdir/${name%%.*}.docx"
+done
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Uses a shell script")
+def test_soffice_one_call_per_batch(tmp_path, monkeypatch, docs):
+    """Without uno a batch is converted by one soffice call per distinct name."""
+    log = tmp_path / "calls.log"
+    script = tmp_path / "bin" / "soffice"
+    script.parent.mkdir()
+    script.write_text(FAKE_SOFFICE % log)
+    script.chmod(0o755)
+    monkeypatch.setenv("PATH", str(script.parent), prepend=os.pathsep)
+    monkeypatch.setattr(converters.lazy_utils, "optional_import", lambda name: None)
+    other = tmp_path / "other"
+    other.mkdir()
+    same_name = other / "doc0.doc"
+    same_name.write_bytes(b"other document 0")
+    converter = converters.SOfficeConverter()
+    try:
+        results = converter.convert_batch(docs + [str(same_name), "missing.doc"])
+    finally:
+        converter.close()
+    assert results[: len(docs)] == [b"document %d" % n for n in range(len(docs))]
+    assert results[len(docs)] == b"other document 0"
+    assert isinstance(results[-1], converters.ConversionError)
+    assert len(log.read_text().splitlines()) == 2
+
+
+def test_converter_is_abstract():
+    """A converter must implement convert."""
+    with pytest.raises(TypeError):
+        converters.Converter()
+
+
+def test_prefetched_documents_are_batched(fake, docs):
+    """The .doc files of a run that need converting are converted as one batch."""
+    options = argparse.Namespace(converter="fake", no_cache=True)
+    try:
+        gloss_utils.prefetch_conversions(options, [("*.doc", docs)])
+        results = [converters.convert_to_docx(path, options) for path in docs]
+    finally:
+        converters.close_pools()
+    assert results == [b"document %d" % number for number in range(len(docs))]
+    assert fake.started == 1
+    assert fake.batches == 1
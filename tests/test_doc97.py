@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Tests of reading the tables of Word 97-2003 .doc files.
+  Created: 18/10/2026
+"""
+import struct
+
+import pytest
+
+from gloss_check import doc97utils
+
+SECTOR = 512
+END_OF_CHAIN = 0xFFFFFFFE
+FREE_SECT = 0xFFFFFFFF
+FAT_SECT = 0xFFFFFFFD
+TEXT_FC = 1024  # After the FIB
+IN_TABLE = struct.pack("<HB", doc97utils.SPRM_PF_IN_TABLE, 1) + struct.pack(
+    "<Hi", doc97utils.SPRM_P_ITAP, 1
+)
+ROW_END = IN_TABLE + struct.pack("<HB", doc97utils.SPRM_PF_TTP, 1)
+
+
+def compound_file(streams):
+    """Make an OLE2 compound file of the named streams in the root storage."""
+    sectors = []
+    fat = []
+
+    def allocate(data):
+        """Add data as a chain of sectors & get its first sector."""
+        data += b"\0" * (-len(data) % SECTOR)
+        first = len(sectors)
+        count = len(data) // SECTOR
+        for number in range(count):
+            sectors.append(data[number * SECTOR : (number + 1) * SECTOR])
+            fat.append(first + number + 1 if number < count - 1 else END_OF_CHAIN)
+        return first
+
+    entries = [("Root Entry", 5, END_OF_CHAIN, 0, 1)]
+    for name, data in streams.items():
+        entries.append((name, 2, allocate(data), len(data), FREE_SECT))
+    directory = b""
+    for number, (name, obj_type, start, size, child) in enumerate(entries):
+        encoded = (name + "\0").encode("utf-16-le")
+        right = number + 1 if 0 < number < len(entries) - 1 else FREE_SECT
+        directory += (
+            encoded.ljust(64, b"\0")
+            + struct.pack("<HBB", len(encoded), obj_type, 1)
+            + struct.pack("<III", FREE_SECT, right, child)
+            + b"\0" * 36
+            + struct.pack("<IQ", start, size)
+        )
+    first_dir = allocate(directory)
+    fat_sector = len(sectors)
+    fat.append(FAT_SECT)
+    sectors.append(struct.pack("<128I", *(fat + [FREE_SECT] * (128 - len(fat)))))
+    header = doc97utils.OLE_MAGIC + b"\0" * 16
+    header += struct.pack("<HHHHH", 0x3E, 3, 0xFFFE, 9, 6) + b"\0" * 6
+    header += struct.pack(
+        "<9I", 0, 1, first_dir, 0, 0, END_OF_CHAIN, 0, END_OF_CHAIN, 0
+    )
+    header += struct.pack("<109I", fat_sector, *([FREE_SECT] * 108))
+    return header.ljust(SECTOR, b"\0") + b"".join(sectors)
+
+
+def papx_fkp(runs):
+    """Make a PapxFkp page from the (fc_start, fc_end, grpprl) of paragraphs."""
+    page = bytearray(doc97utils.FKP_SIZE)
+    page[-1] = len(runs)
+    struct.pack_into(
+        "<%dI" % (len(runs) + 1), page, 0, *([run[0] for run in runs] + [runs[-1][1]])
+    )
+    end = doc97utils.FKP_SIZE - 1
+    for index, (dummy_start, dummy_end, grpprl) in enumerate(runs):
+        papx = b"\0\0" + grpprl  # The style, istd, then the sprms
+        if len(papx) % 2:
+            papx = bytes([(len(papx) + 1) // 2]) + papx
+        else:
+            papx = bytes([0, len(papx) // 2]) + papx
+        end = (end - len(papx)) & ~1  # On a 2 byte boundary
+        page[end : end + len(papx)] = papx
+        page[(len(runs) + 1) * 4 + index * doc97utils.BX_PAP_SIZE] = end // 2
+    return bytes(page)
+
+
+def make_doc(paragraphs):
+    """
+    Make a .doc file from its (text, grpprl) paragraphs, each text ending
+    with its paragraph or cell mark.
+    """
+    text = "".join([paragraph for paragraph, dummy in paragraphs])
+    runs = []
+    fc_value = TEXT_FC
+    for paragraph, grpprl in paragraphs:
+        runs.append((fc_value, fc_value + len(paragraph), grpprl))
+        fc_value += len(paragraph)
+    page_number = (fc_value + doc97utils.FKP_SIZE - 1) // doc97utils.FKP_SIZE
+    fib = bytearray(TEXT_FC)
+    struct.pack_into("<HH", fib, 0, doc97utils.WORD_IDENT, doc97utils.MIN_NFIB + 1)
+    struct.pack_into("<H", fib, 0x0A, doc97utils.F_WHICH_TBL_STM)
+    struct.pack_into("<H", fib, 32, 14)
+    struct.pack_into("<H", fib, 62, 22)
+    struct.pack_into("<i", fib, 64 + doc97utils.CCP_TEXT_INDEX * 4, len(text))
+    struct.pack_into("<H", fib, 152, 93)
+    # One piece of 8 bit text
+    plc = struct.pack("<II", 0, len(text))
+    plc += struct.pack("<HIH", 0, (TEXT_FC * 2) | doc97utils.F_COMPRESSED, 0)
+    clx = b"\x02" + struct.pack("<I", len(plc)) + plc
+    bte = struct.pack("<III", TEXT_FC, fc_value, page_number)
+    struct.pack_into(
+        "<II", fib, 154 + doc97utils.FC_PLCF_BTE_PAPX_INDEX * 8, 0, len(bte)
+    )
+    struct.pack_into("<II", fib, 154 + doc97utils.FC_CLX_INDEX * 8, len(bte), len(clx))
+    word = bytes(fib) + text.encode("cp1252")
+    word = word.ljust(page_number * doc97utils.FKP_SIZE, b"\0") + papx_fkp(runs)
+    return compound_file({"WordDocument": word, "1Table": bte + clx})
+
+
+def table(rows):
+    """Get the paragraphs of a table, a cell's paragraphs are split on \\r."""
+    paragraphs = []
+    for row in rows:
+        for cell in row:
+            *cell_paragraphs, last = cell.split("\r")
+            paragraphs.extend([(text + "\r", IN_TABLE) for text in cell_paragraphs])
+            paragraphs.append((last + "\x07", IN_TABLE))
+        paragraphs.append(("\x07", ROW_END))
+    return paragraphs
+
+
+def test_table_read():
+    """The paragraphs & table of a document are read."""
+    doc = make_doc(
+        [("Intro text\r", b"")]
+        + table([["Term", "Meaning"], ["SCM", "Subsea Control Module"]])
+        + [("After\r", b"")]
+    )
+    model = doc97utils.get_doc97_model(doc)
+    assert model.paragraphs == ["Intro text", "After", ""]
+    assert model.tables == [[["Term", "SCM"], ["Meaning", "Subsea Control Module"]]]
+
+
+@pytest.mark.parametrize(
+    "rows",
+    [
+        [["SCM", "", "ROV"], ["HPU", "MCS", "XYZ"]],
+        [["SCM", "ROV", ""], ["", "MCS", "XYZ"]],
+        [["", "", ""], ["HPU", "MCS", "XYZ"]],
+    ],
+)
+def test_empty_cells(rows):
+    """Empty cells, anywhere in a row, keep the cells in their columns."""
+    doc = make_doc([("Intro\r", b"")] + table(rows) + [("After\r", b"")])
+    model = doc97utils.get_doc97_model(doc)
+    assert model.tables == [[list(column) for column in zip(*rows)]]
+
+
+def test_multi_paragraph_cell():
+    """The paragraphs of a cell are joined in its text & don't end the table."""
+    doc = make_doc(
+        table(
+            [["Term", "Meaning"], ["SCM", "Subsea\rControl Module"], ["HPU", "Power"]]
+        )
+        + [("After\r", b"")]
+    )
+    model = doc97utils.get_doc97_model(doc)
+    assert model.paragraphs == ["After", ""]
+    assert model.tables == [
+        [["Term", "SCM", "HPU"], ["Meaning", "Subsea\nControl Module", "Power"]]
+    ]
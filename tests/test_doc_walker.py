@@ -0,0 +1,26 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Tests of finding the documents for the command line arguments.
+  Created: 18/10/2026
+"""
+import zipfile
+
+from gloss_check import doc_walker
+
+
+def test_archive_member_argument(tmp_path, monkeypatch):
+    """A bundle.zip!member argument gives the member if it is in the archive."""
+    monkeypatch.chdir(tmp_path)
+    with zipfile.ZipFile("bundle.zip", "w") as archive:
+        archive.writestr("sub/report.docx", b"report")
+        archive.writestr("notes.txt", b"notes")
+    assert list(doc_walker.iter_arg_docs("bundle.zip!sub/report.docx")) == [
+        "bundle.zip!sub/report.docx"
+    ]
+    assert list(doc_walker.iter_arg_docs("bundle.zip!missing.docx")) == []
+    assert list(doc_walker.iter_arg_docs("other.zip!sub/report.docx")) == []
+    assert list(doc_walker.iter_arg_docs("bundle.zip")) == [
+        "bundle.zip!sub/report.docx"
+    ]
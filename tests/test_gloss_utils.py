@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Tests of expanding & reporting the document arguments.
+  Created: 18/10/2026
+"""
+import argparse
+
+from gloss_check import gloss_utils
+
+
+def make_options(docs):
+    """Options for checking docs without any failure counts."""
+    return argparse.Namespace(
+        DOCS=docs,
+        recursive=False,
+        oneper=False,
+        glossary_unused=False,
+        fail_missing_count=None,
+        fail_unused_count=None,
+    )
+
+
+def test_repeated_files_processed_once(tmp_path, monkeypatch, capsys):
+    """Files matched by more than one argument are processed once & matched."""
+    for name in ("a.docx", "b.docx"):
+        (tmp_path / name).write_bytes(b"")
+    monkeypatch.chdir(tmp_path)
+    options = make_options(["a.docx", "a.docx", "*.docx"])
+    checked = []
+
+    def get_result(name):
+        """Record the document as checked."""
+        checked.append(name)
+        return "", (True, [], [], 0), {}
+
+    expanded = gloss_utils.expand_docs(options)
+    errors = gloss_utils.report_docs(options, expanded, get_result)
+    output = capsys.readouterr().out
+    assert checked == ["a.docx", "b.docx"]
+    assert errors == []
+    assert "No files match" not in output
+    assert output.count("Already processed a.docx") == 2
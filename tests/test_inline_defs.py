@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Tests of finding the abbreviations defined inline in the text.
+  Created: 18/10/2026
+"""
+import pytest
+
+from gloss_check import inline_defs
+from gloss_check import token_utils
+
+
+@pytest.mark.parametrize(
+    "text, abbrev, long_form",
+    [
+        ("the Subsea Control Module (SCM)", "SCM", "Subsea Control Module"),
+        ("SCM (Subsea Control Module) is", "SCM", "Subsea Control Module"),
+        ("Remotely Operated Vehicles (ROVs).", "ROVs", "Remotely Operated Vehicles"),
+        ("Department of Defense (DoD)", "DoD", "Department of Defense"),
+        ("Research & Development (R&D)", "R&D", "Research & Development"),
+        (
+            "Approved Drawing & Parts List (AD&PL)",
+            "AD&PL",
+            "Approved Drawing & Parts List",
+        ),
+        (
+            "Chemical Injection Valve - Downhole (CIVD)",
+            "CIVD",
+            "Chemical Injection Valve - Downhole",
+        ),
+        (
+            "National Aeronautics and Space Administration (NASA)",
+            "NASA",
+            "National Aeronautics and Space Administration",
+        ),
+        (
+            "a HyperText Markup Language (HTML) page",
+            "HTML",
+            "HyperText Markup Language",
+        ),
+    ],
+)
+def test_definition_found(text, abbrev, long_form):
+    """Both forms of definition, with linking words skipped or used."""
+    assert inline_defs.find_definitions(text) == [(abbrev, long_form)]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "some other words (XYZ)",
+        "Subsea Control Module (SCMS)",
+        "the (BC)",
+        "and Development (AD)",
+        "as shown (see figure 2)",
+    ],
+)
+def test_no_definition(text):
+    """Parentheses that don't define an abbreviation are ignored."""
+    assert inline_defs.find_definitions(text) == []
+
+
+def test_first_definition_kept():
+    """Only the first definition of an abbreviation is kept."""
+    definitions = inline_defs.get_definitions(
+        ["Subsea Control Module (SCM)", "Some Control Module (SCM)"]
+    )
+    assert list(definitions.items()) == [("SCM", "Subsea Control Module")]
+
+
+def test_definitions_from_tokens():
+    """The tokens already found by an extractor are used, texts don't run on."""
+    text = "\n".join(
+        ["Remotely Operated", "Vehicle (ROV) and the", "HPU (Hydraulic Power Unit)"]
+    )
+    tokens = list(token_utils.iter_tokens(text))
+    assert inline_defs.find_definitions(text, tokens) == [
+        ("HPU", "Hydraulic Power Unit")
+    ]
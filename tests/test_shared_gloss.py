@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# encoding:utf-8
+"""
+  Author:  Steve Barnes --<Steven.Barnes@bhge.com>
+  Purpose: Tests that the shared glossary table matches the GlossaryIndex.
+  Created: 18/10/2026
+"""
+import os
+import glob
+import pickle
+import tempfile
+
+import pytest
+
+from gloss_check import gloss_index
+from gloss_check import shared_gloss
+
+ENTRIES = ["ABC", "SCM", "ROVs", "Tree", "ñandú", "Ærø", "BOP", "bop", "A", "xyz12"]
+WORDS = ["abc", "ABCs", "scms", "rov", "ROVS", "trees", "ÑANDÚ", "ÆRØS", "b", "BOPs"]
+
+
+@pytest.fixture(name="shared", params=[ENTRIES, ["ABC"], ["ab"], ["a"], []])
+def fixture_shared(request):
+    """A GlossaryIndex & the shared table made from it, of any length."""
+    index = gloss_index.GlossaryIndex(request.param)
+    table = shared_gloss.share(index)
+    yield index, table
+    shared_gloss.unshare(table)
+    assert not os.path.exists(table.path)
+
+
+def test_odd_lengths_share(shared):
+    """Tables whose strings are not a multiple of 4 bytes can be mapped."""
+    index, table = shared
+    assert len(table) == len(index)
+    assert list(table) == list(index)
+
+
+def test_contains_matches(shared):
+    """Hashed & binary search lookups match the GlossaryIndex."""
+    index, table = shared
+    for word in ENTRIES + WORDS + ["", "zzz", "s"]:
+        assert (word in table) == (word in index), word
+        key = gloss_index.make_key(word)
+        assert table.find(key) == table.has_key(key) == (key in index.keys), word
+
+
+def test_prefixed_matches(shared):
+    """The keys with a prefix are found in order by binary search."""
+    index, table = shared
+    for prefix in ["", "a", "b", "bo", "ñ", "x", "zz"]:
+        assert list(table.prefixed(prefix)) == sorted(
+            (key for key in index.keys if key.startswith(prefix)),
+            key=lambda key: key.encode("utf-8"),
+        )
+
+
+def test_used_unused_matches(shared):
+    """The entries are split into used & unused as by the GlossaryIndex."""
+    index, table = shared
+    assert table.used_unused(WORDS) == index.used_unused(WORDS)
+
+
+def test_pickle_maps_same_table(shared):
+    """Pickling only sends the path, the copy maps the same table."""
+    dummy, table = shared
+    copy = pickle.loads(pickle.dumps(table))
+    try:
+        assert copy.path == table.path
+        assert list(copy) == list(table)
+    finally:
+        copy.close()
+
+
+def test_failed_share_removes_table(monkeypatch):
+    """The table file is removed if it can't be mapped."""
+    pattern = os.path.join(tempfile.gettempdir(), "gloss_check_*.glsh")
+    before = set(glob.glob(pattern))
+
+    def broken(path, index):
+        """Write something that isn't a table."""
+        with open(path, "wb") as outfile:
+            outfile.write(b"not a table, just some bytes")
+
+    monkeypatch.setattr(shared_gloss, "write_table", broken)
+    with pytest.raises(ValueError):
+        shared_gloss.share(gloss_index.GlossaryIndex(ENTRIES))
+    assert set(glob.glob(pattern)) == before